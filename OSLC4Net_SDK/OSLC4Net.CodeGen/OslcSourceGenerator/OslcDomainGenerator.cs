@@ -46,6 +46,7 @@ public sealed class OslcDomainGenerator : IIncrementalGenerator
         IncrementalValueProvider<ImmutableArray<AdditionalText>> rdfFiles = context
             .AdditionalTextsProvider.Where(static text =>
                 text.Path.EndsWith(".nt", StringComparison.OrdinalIgnoreCase)
+                || text.Path.EndsWith(ShapeIrReader.Extension, StringComparison.OrdinalIgnoreCase)
             )
             .Collect();
 
@@ -1293,6 +1294,14 @@ public sealed class OslcDomainGenerator : IIncrementalGenerator
                     continue;
                 }
 
+                if (
+                    file.Path.EndsWith(ShapeIrReader.Extension, StringComparison.OrdinalIgnoreCase)
+                )
+                {
+                    ShapeIrReader.Read(text.ToString(), graph);
+                    continue;
+                }
+
                 foreach (Triple triple in NTriplesParser.Parse(text.ToString()))
                 {
                     graph.Add(triple);
@@ -1302,6 +1311,24 @@ public sealed class OslcDomainGenerator : IIncrementalGenerator
             return graph;
         }
 
+        public void AddGroup(Node subject, Node predicate, List<Node> objects)
+        {
+            var key = (subject, predicate.Value);
+            if (_objects.TryGetValue(key, out List<Node> existing))
+            {
+                existing.AddRange(objects);
+            }
+            else
+            {
+                _objects.Add(key, objects);
+            }
+
+            foreach (Node @object in objects)
+            {
+                _triples.Add(new Triple(subject, predicate, @object));
+            }
+        }
+
         public IEnumerable<Node> Objects(string subjectUri, string predicateUri)
         {
             return Objects(Node.Uri(subjectUri), predicateUri);
@@ -1341,6 +1368,188 @@ public sealed class OslcDomainGenerator : IIncrementalGenerator
         }
     }
 
+    /// <summary>
+    /// Reads the compact shape IR written by <c>scripts/oslc_domain_seed_gen.py --ir</c>
+    /// (format described in <c>scripts/shape_ir.py</c>): a sorted string table followed by
+    /// one line per subject and predicate with all of its objects.
+    /// </summary>
+    private static class ShapeIrReader
+    {
+        public const string Extension = ".oslcir";
+        private const string Magic = "oslc4net-ir";
+        private const int Version = 1;
+
+        public static void Read(string content, Graph graph)
+        {
+            using var reader = new StringReader(content);
+            string[] header = (reader.ReadLine() ?? string.Empty).Split(' ');
+            if (
+                header.Length != 4
+                || !string.Equals(header[0], Magic, StringComparison.Ordinal)
+                || !int.TryParse(
+                    header[1],
+                    NumberStyles.None,
+                    CultureInfo.InvariantCulture,
+                    out int version
+                )
+            )
+            {
+                throw new InvalidDataException("Not an OSLC4Net shape IR file.");
+            }
+
+            if (version != Version)
+            {
+                throw new InvalidDataException(
+                    string.Format(
+                        CultureInfo.InvariantCulture,
+                        "Unsupported shape IR version {0}; regenerate it with "
+                            + "oslc_domain_seed_gen.py --ir.",
+                        version
+                    )
+                );
+            }
+
+            int stringCount = ReadCount(header[2]);
+            int groupCount = ReadCount(header[3]);
+            var strings = new string[stringCount];
+            for (int i = 0; i < stringCount; i++)
+            {
+                string line = reader.ReadLine() ?? throw Truncated();
+                strings[i] = line.IndexOf('\\') < 0 ? line : Unescape(line);
+            }
+
+            for (int i = 0; i < groupCount; i++)
+            {
+                string line = reader.ReadLine() ?? throw Truncated();
+                int index = 0;
+                Node subject = ReadNode(line, ref index, strings);
+                Node predicate = Node.Uri(ReadString(line, ref index, strings));
+                var objects = new List<Node>();
+                while (index < line.Length)
+                {
+                    objects.Add(ReadNode(line, ref index, strings));
+                }
+
+                graph.AddGroup(subject, predicate, objects);
+            }
+        }
+
+        private static Node ReadNode(string line, ref int index, string[] strings)
+        {
+            if (index >= line.Length)
+            {
+                throw Malformed(line);
+            }
+
+            switch (line[index])
+            {
+                case '_':
+                    index++;
+                    return Node.Blank(ReadString(line, ref index, strings));
+                case '"':
+                    index++;
+                    string value = ReadString(line, ref index, strings, '@');
+                    string? language = null;
+                    if (index <= line.Length && line[index - 1] == '@')
+                    {
+                        language = ReadString(line, ref index, strings);
+                    }
+
+                    return Node.Literal(value, language);
+                default:
+                    return Node.Uri(ReadString(line, ref index, strings));
+            }
+        }
+
+        /// <summary>
+        /// Reads a decimal string table index up to the next space (or <paramref name="separator"/>)
+        /// and returns the string it refers to.
+        /// </summary>
+        private static string ReadString(
+            string line,
+            ref int index,
+            string[] strings,
+            char separator = ' '
+        )
+        {
+            int start = index;
+            long value = 0;
+            while (index < line.Length && line[index] != ' ' && line[index] != separator)
+            {
+                char digit = line[index++];
+                if (digit < '0' || digit > '9')
+                {
+                    throw Malformed(line);
+                }
+
+                value = (value * 10) + (digit - '0');
+                if (value >= strings.Length)
+                {
+                    throw Malformed(line);
+                }
+            }
+
+            if (index == start)
+            {
+                throw Malformed(line);
+            }
+
+            index++;
+            return strings[value];
+        }
+
+        private static int ReadCount(string value)
+        {
+            if (
+                !int.TryParse(
+                    value,
+                    NumberStyles.None,
+                    CultureInfo.InvariantCulture,
+                    out int count
+                )
+            )
+            {
+                throw new InvalidDataException("Shape IR header has an invalid count.");
+            }
+
+            return count;
+        }
+
+        private static string Unescape(string value)
+        {
+            var builder = new StringBuilder(value.Length);
+            for (int i = 0; i < value.Length; i++)
+            {
+                char current = value[i];
+                if (current == '\\' && i + 1 < value.Length)
+                {
+                    current = value[++i] switch
+                    {
+                        'n' => '\n',
+                        'r' => '\r',
+                        _ => value[i],
+                    };
+                }
+
+                builder.Append(current);
+            }
+
+            return builder.ToString();
+        }
+
+        private static InvalidDataException Truncated()
+        {
+            return new InvalidDataException("Shape IR file is truncated.");
+        }
+
+        private static InvalidDataException Malformed(string line)
+        {
+            return new InvalidDataException(
+                string.Format(CultureInfo.InvariantCulture, "Malformed shape IR group '{0}'.", line)
+            );
+        }
+    }
+
     private static class NTriplesParser
     {
         public static IEnumerable<Triple> Parse(string content)
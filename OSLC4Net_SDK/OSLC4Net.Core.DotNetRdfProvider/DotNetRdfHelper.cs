@@ -249,7 +249,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
     {
         var newInstance = Activator.CreateInstance(beanType)!;
         var typePropertyDefinitionsToSetMethods =
-            new Dictionary<Type, IDictionary<string, MemberInfo>>();
+            new Dictionary<Type, IDictionary<string, BackingMember>>();
         // TODO: check that all .Add() calls were converted into [k] = v
         //IDictionary<string, object> visitedResources = new DictionaryWithReplacement<string, object>();
         var visitedResources = new Dictionary<string, object>(StringComparer.Ordinal);
@@ -294,7 +294,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                 var add = results.GetType().GetMethod("Add", types)!;
                 var
                     typePropertyDefinitionsToSetMethods =
-                        new Dictionary<Type, IDictionary<string, MemberInfo>>();
+                        new Dictionary<Type, IDictionary<string, BackingMember>>();
 
                 foreach (var triple in triples)
                 {
@@ -319,14 +319,14 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
     }
 
     private void FromDotNetRdfNode(
-        IDictionary<Type, IDictionary<string, MemberInfo>> typePropertyDefinitionsToSetMethods,
+        IDictionary<Type, IDictionary<string, BackingMember>> typePropertyDefinitionsToSetMethods,
         Type beanType,
         object bean,
         INode resource,
         IGraph graph,
         IDictionary<string, object> visitedResources)
     {
-        IDictionary<string, MemberInfo> setMethodMap;
+        IDictionary<string, BackingMember> setMethodMap;
 
         if (typePropertyDefinitionsToSetMethods.TryGetValue(beanType, out var beanTypeValue))
         {
@@ -368,7 +368,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
             new Dictionary<string, List<object>>(StringComparer.Ordinal);
 
         // Ensure a single-value property is not set more than once
-        HashSet<MemberInfo> singleValueMethodsUsed = [];
+        HashSet<BackingMember> singleValueMethodsUsed = [];
 
         IEnumerable<Triple> triples = graph.GetTriplesWithSubject(resource);
 
@@ -482,7 +482,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
             else
             {
                 var (setMethodComponentParameterType, multiple) =
-                    GetBackingMemberPrimitiveType(backingMember);
+                    ExtractTypeInformation(backingMember.Type);
 
                 var nil = new Uri(OslcConstants.RDF_NAMESPACE + RDF_NIL);
                 IList<INode> objects;
@@ -797,10 +797,10 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                             if (singleValueMethodsUsed.Contains(backingMember))
                             {
                                 throw new OslcCoreMisusedOccursException(beanType,
-                                    backingMember);
+                                    backingMember.Member);
                             }
 
-                            SetValue(bean, backingMember, parameter);
+                            backingMember.SetValue(bean, parameter);
 
                             singleValueMethodsUsed.Add(backingMember);
                         }
@@ -814,7 +814,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
         {
             var values = propertyDefinitionsToArrayValues[uri];
             var settableMember = setMethodMap[uri];
-            var parameterType = GetBackingMemberType(settableMember);
+            var parameterType = settableMember.Type;
 
             if (parameterType.IsArray)
             {
@@ -833,7 +833,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                         index++);
                 }
 
-                SetValue(bean, settableMember, array);
+                settableMember.SetValue(bean, array);
             }
             // Else - we are dealing with a collection or a subclass of collection
             else
@@ -850,7 +850,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                     }
                 }
 
-                SetValue(bean, settableMember, collection);
+                settableMember.SetValue(bean, collection);
             }
         }
     }
@@ -871,13 +871,6 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
         }
     }
 
-    /// <returns>T for non-collection type T and T for collection T[]</returns>
-    private static (Type, bool) GetBackingMemberPrimitiveType(MemberInfo backingMember)
-    {
-        var type = GetBackingMemberType(backingMember);
-        return ExtractTypeInformation(type);
-    }
-
     private static Type GetBackingMemberType(MemberInfo backingMember)
     {
         return backingMember switch
@@ -889,6 +882,57 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
         };
     }
 
+    /// <summary>
+    ///     A settable OSLC property of a resource type: either a set method or property found
+    ///     through reflection, or an entry of <see cref="OslcResourceMetadata" /> that is set
+    ///     through its compiled accessor
+    /// </summary>
+    private sealed class BackingMember
+    {
+        private readonly Type? _resourceType;
+        private readonly OslcPropertyMetadata? _metadata;
+        private MemberInfo? _member;
+
+        public BackingMember(MemberInfo member)
+        {
+            _member = member;
+            Name = member.Name;
+            Type = GetBackingMemberType(member);
+        }
+
+        public BackingMember(Type resourceType, OslcPropertyMetadata metadata)
+        {
+            _resourceType = resourceType;
+            _metadata = metadata;
+            Name = metadata.MemberName;
+            Type = metadata.PropertyType;
+        }
+
+        public string Name { get; }
+
+        /// <summary>
+        ///     Type of the value the member is set to
+        /// </summary>
+        public Type Type { get; }
+
+        /// <summary>
+        ///     The reflected member; for registered properties it is only looked up to report errors
+        /// </summary>
+        public MemberInfo Member => _member ??= _resourceType!.GetProperty(Name)!;
+
+        public void SetValue(object bean, object parameter)
+        {
+            if (_metadata != null)
+            {
+                _metadata.Setter(bean, parameter);
+            }
+            else
+            {
+                DotNetRdfHelper.SetValue(bean, _member!, parameter);
+            }
+        }
+    }
+
     private static (Type, bool) ExtractTypeInformation(Type setMethodComponentParameterType)
     {
         var multiple = setMethodComponentParameterType.IsArray;
@@ -1068,7 +1112,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
         {
             AbstractResource any = new AnyResource();
             var typePropertyDefinitionsToSetMethods =
-                new Dictionary<Type, IDictionary<string, MemberInfo>>();
+                new Dictionary<Type, IDictionary<string, BackingMember>>();
             FromDotNetRdfNode(typePropertyDefinitionsToSetMethods,
                 typeof(AnyResource),
                 any,
@@ -1095,12 +1139,32 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
         return nestedResourceUri!;
     }
 
-    private static IDictionary<string, MemberInfo> CreatePropertyDefinitionToSetMethods(
+    private static IDictionary<string, BackingMember> CreatePropertyDefinitionToSetMethods(
         Type beanType)
     {
-        var result = new Dictionary<string, MemberInfo>(StringComparer.Ordinal);
+        var result = new Dictionary<string, BackingMember>(StringComparer.Ordinal);
+
+        // Properties with precomputed metadata are set through their compiled accessors;
+        // reflection only looks at the members the registry does not cover
+        IEnumerable<MethodInfo> methods;
+        IEnumerable<PropertyInfo> properties;
+        if (OslcResourceMetadata.TryGetProperties(beanType, out var registeredProperties,
+                out var unregisteredMembers))
+        {
+            foreach (var property in registeredProperties)
+            {
+                AddBackingMember(result, beanType, null, property.PropertyDefinition,
+                    new BackingMember(beanType, property));
+            }
 
-        var methods = beanType.GetMethods();
+            methods = unregisteredMembers.OfType<MethodInfo>();
+            properties = unregisteredMembers.OfType<PropertyInfo>();
+        }
+        else
+        {
+            methods = beanType.GetMethods();
+            properties = beanType.GetProperties();
+        }
 
         foreach (var method in methods)
         {
@@ -1145,8 +1209,8 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
 
             if (setMethod != null)
             {
-                result.Add(oslcPropertyDefinitionAnnotation.value,
-                    setMethod);
+                AddBackingMember(result, beanType, method, oslcPropertyDefinitionAnnotation.value,
+                    new BackingMember(setMethod));
             }
             else
             {
@@ -1155,7 +1219,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
             }
         }
 
-        foreach (var propertyInfo in beanType.GetProperties())
+        foreach (var propertyInfo in properties)
         {
             var oslcPropertyDefinitionAnnotation = InheritedMethodAttributeHelper
                 .GetAttribute<OslcPropertyDefinition>(propertyInfo);
@@ -1165,12 +1229,31 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                 continue;
             }
 
-            result.Add(oslcPropertyDefinitionAnnotation.value, propertyInfo);
+            AddBackingMember(result, beanType, propertyInfo, oslcPropertyDefinitionAnnotation.value,
+                new BackingMember(propertyInfo));
         }
 
         return result;
     }
 
+    /// <summary>
+    ///     Adds a settable property, rejecting a second member with the same property definition
+    /// </summary>
+    /// <param name="member">Member that declares the property; null for registered properties</param>
+    private static void AddBackingMember(IDictionary<string, BackingMember> result,
+        Type beanType,
+        MemberInfo? member,
+        string propertyDefinition,
+        BackingMember backingMember)
+    {
+        if (!result.TryAdd(propertyDefinition, backingMember))
+        {
+            throw new OslcCoreInvalidPropertyDefinitionException(beanType,
+                member ?? backingMember.Member,
+                new OslcPropertyDefinition(propertyDefinition));
+        }
+    }
+
     private static void BuildResource(object obj,
         Type resourceType,
         IGraph graph,
@@ -1182,7 +1265,49 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
             return;
         }
 
-        foreach (var method in resourceType.GetMethods())
+        // Properties with precomputed metadata are read through their compiled accessors;
+        // reflection only looks at the members the registry does not cover
+        IEnumerable<MethodInfo> methods;
+        IEnumerable<PropertyInfo> properties;
+        if (OslcResourceMetadata.TryGetProperties(resourceType, out var registeredProperties,
+                out var unregisteredMembers))
+        {
+            foreach (var property in registeredProperties)
+            {
+                var value = property.Getter(obj);
+
+                if (value == null)
+                {
+                    continue;
+                }
+
+                if (!TryGetNestedProperties(oslcProperties,
+                        property.PropertyDefinition,
+                        out var nestedProperties,
+                        out var onlyNested))
+                {
+                    continue;
+                }
+
+                BuildAttributeResource(resourceType,
+                    property,
+                    graph,
+                    mainResource,
+                    value,
+                    nestedProperties,
+                    onlyNested);
+            }
+
+            methods = unregisteredMembers.OfType<MethodInfo>();
+            properties = unregisteredMembers.OfType<PropertyInfo>();
+        }
+        else
+        {
+            methods = resourceType.GetMethods();
+            properties = resourceType.GetProperties();
+        }
+
+        foreach (var method in methods)
         {
             if (method.GetParameters().Length != 0)
             {
@@ -1214,31 +1339,12 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                 continue;
             }
 
-            IDictionary<string, object>? nestedProperties = null;
-            var onlyNested = false;
-
-            if (oslcProperties != null)
+            if (!TryGetNestedProperties(oslcProperties,
+                    oslcPropertyDefinitionAnnotation.value,
+                    out var nestedProperties,
+                    out var onlyNested))
             {
-                if (oslcProperties.TryGetValue(oslcPropertyDefinitionAnnotation.value, out var mapObj) && mapObj is IDictionary<string, object> map)
-                {
-                    nestedProperties = map;
-                }
-                else if (oslcProperties is SingletonWildcardProperties &&
-                         !(oslcProperties is NestedWildcardProperties))
-                {
-                    nestedProperties =
-                        OSLC4NetConstants.OSLC4NET_PROPERTY_SINGLETON;
-                }
-                else if (oslcProperties is NestedWildcardProperties properties)
-                {
-                    nestedProperties = properties
-                        .CommonNestedProperties();
-                    onlyNested = properties is not SingletonWildcardProperties;
-                }
-                else
-                {
-                    continue;
-                }
+                continue;
             }
 
             BuildAttributeResource(resourceType,
@@ -1251,7 +1357,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                 onlyNested);
         }
 
-        foreach (var property in resourceType.GetProperties())
+        foreach (var property in properties)
         {
             var oslcPropertyDefinitionAnnotation = InheritedMethodAttributeHelper
                 .GetAttribute<OslcPropertyDefinition>(property);
@@ -1268,31 +1374,12 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
                 continue;
             }
 
-            IDictionary<string, object>? nestedProperties = null;
-            var onlyNested = false;
-
-            if (oslcProperties != null)
+            if (!TryGetNestedProperties(oslcProperties,
+                    oslcPropertyDefinitionAnnotation.value,
+                    out var nestedProperties,
+                    out var onlyNested))
             {
-                if (oslcProperties.TryGetValue(oslcPropertyDefinitionAnnotation.value, out var mapObj) && mapObj is IDictionary<string, object> map)
-                {
-                    nestedProperties = map;
-                }
-                else if (oslcProperties is SingletonWildcardProperties &&
-                         !(oslcProperties is NestedWildcardProperties))
-                {
-                    nestedProperties =
-                        OSLC4NetConstants.OSLC4NET_PROPERTY_SINGLETON;
-                }
-                else if (oslcProperties is NestedWildcardProperties properties)
-                {
-                    nestedProperties = properties
-                        .CommonNestedProperties();
-                    onlyNested = properties is not SingletonWildcardProperties;
-                }
-                else
-                {
-                    continue;
-                }
+                continue;
             }
 
             BuildAttributeResource(resourceType,
@@ -1316,6 +1403,47 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
         }
     }
 
+    /// <summary>
+    ///     Selects the nested properties to serialize for one property of a resource
+    /// </summary>
+    /// <returns>false if <paramref name="oslcProperties" /> does not select the property</returns>
+    private static bool TryGetNestedProperties(IDictionary<string, object>? oslcProperties,
+        string propertyDefinition,
+        out IDictionary<string, object>? nestedProperties,
+        out bool onlyNested)
+    {
+        nestedProperties = null;
+        onlyNested = false;
+
+        if (oslcProperties == null)
+        {
+            return true;
+        }
+
+        if (oslcProperties.TryGetValue(propertyDefinition, out var mapObj) && mapObj is IDictionary<string, object> map)
+        {
+            nestedProperties = map;
+        }
+        else if (oslcProperties is SingletonWildcardProperties &&
+                 !(oslcProperties is NestedWildcardProperties))
+        {
+            nestedProperties =
+                OSLC4NetConstants.OSLC4NET_PROPERTY_SINGLETON;
+        }
+        else if (oslcProperties is NestedWildcardProperties properties)
+        {
+            nestedProperties = properties
+                .CommonNestedProperties();
+            onlyNested = properties is not SingletonWildcardProperties;
+        }
+        else
+        {
+            return false;
+        }
+
+        return true;
+    }
+
     private static void HandleExtendedProperties(Type resourceType,
         IGraph graph,
         INode mainResource,
@@ -1459,6 +1587,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
             var xmlliteral = false;
             HandleLocalResource(objType,
                 null,
+                "<none>",
                 xmlliteral,
                 value,
                 graph,
@@ -1571,8 +1700,6 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
 
         var xmlLiteral = valueTypeAnnotation is { value: ValueType.XMLLiteral };
 
-        var attribute = graph.CreateUriNode(new Uri(propertyDefinition));
-
         var valueType = method switch
         {
             MethodInfo methodInfo => methodInfo.ReturnType,
@@ -1582,6 +1709,58 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
 
         var collectionType =
             InheritedMethodAttributeHelper.GetAttribute<OslcRdfCollectionType>(method);
+
+        BuildAttributeResource(resourceType,
+            method,
+            method.Name,
+            propertyDefinition,
+            xmlLiteral,
+            valueType,
+            collectionType,
+            graph,
+            resource,
+            value,
+            nestedProperties,
+            onlyNested);
+    }
+
+    private static void BuildAttributeResource(Type resourceType,
+        OslcPropertyMetadata property,
+        IGraph graph,
+        INode resource,
+        object value,
+        IDictionary<string, object>? nestedProperties,
+        bool onlyNested)
+    {
+        // The metadata has no RDF collection type: generated resources do not use RDF containers
+        BuildAttributeResource(resourceType,
+            null,
+            property.MemberName,
+            property.PropertyDefinition,
+            property.ValueType == ValueType.XMLLiteral,
+            property.PropertyType,
+            null,
+            graph,
+            resource,
+            value,
+            nestedProperties,
+            onlyNested);
+    }
+
+    private static void BuildAttributeResource(Type resourceType,
+        MemberInfo? method,
+        string memberName,
+        string propertyDefinition,
+        bool xmlLiteral,
+        Type valueType,
+        OslcRdfCollectionType? collectionType,
+        IGraph graph,
+        INode resource,
+        object value,
+        IDictionary<string, object>? nestedProperties,
+        bool onlyNested)
+    {
+        var attribute = graph.CreateUriNode(new Uri(propertyDefinition));
         List<INode>? rdfNodeContainer;
 
         if (collectionType != null &&
@@ -1619,6 +1798,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
 
                 HandleLocalResource(resourceType,
                     method,
+                    memberName,
                     xmlLiteral,
                     obj,
                     graph,
@@ -1646,6 +1826,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
             {
                 HandleLocalResource(resourceType,
                     method,
+                    memberName,
                     xmlLiteral,
                     obj,
                     graph,
@@ -1668,6 +1849,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
         {
             HandleLocalResource(resourceType,
                 method,
+                memberName,
                 xmlLiteral,
                 value,
                 graph,
@@ -1747,6 +1929,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
 
     private static void HandleLocalResource(Type resourceType,
         MemberInfo? method,
+        string memberName,
         bool xmlLiteral,
         object obj,
         IGraph graph,
@@ -1847,7 +2030,7 @@ public class DotNetRdfHelper(ILogger<DotNetRdfHelper> logger)
             if (!uri.IsAbsoluteUri)
             {
                 throw new OslcCoreRelativeURIException(resourceType,
-                    method == null ? "<none>" : method.Name,
+                    memberName,
                     uri);
             }
 
@@ -0,0 +1,90 @@
+/*******************************************************************************
+ * Copyright (c) 2026 Andrii Berezovskyi and OSLC4Net contributors.
+ *
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * which accompanies this distribution.
+ *
+ * The Eclipse Public License is available at http://www.eclipse.org/legal/epl-v10.html
+ *******************************************************************************/
+
+namespace OSLC4Net.Core.Model;
+
+/// <summary>
+///     Precomputed description of one OSLC property of a resource type, with compiled
+///     accessors. Generated resources register these in <see cref="OslcResourceMetadata" />
+///     so that the property can be read and written without reflection.
+/// </summary>
+public sealed class OslcPropertyMetadata
+{
+    public OslcPropertyMetadata(
+        string propertyDefinition,
+        string name,
+        string memberName,
+        Type propertyType,
+        Occurs occurs,
+        ValueType valueType,
+        Representation representation,
+        bool readOnly,
+        Func<object, object?> getter,
+        Action<object, object?> setter)
+    {
+        PropertyDefinition = propertyDefinition ?? throw new ArgumentNullException(nameof(propertyDefinition));
+        Name = name ?? throw new ArgumentNullException(nameof(name));
+        MemberName = memberName ?? throw new ArgumentNullException(nameof(memberName));
+        PropertyType = propertyType ?? throw new ArgumentNullException(nameof(propertyType));
+        Occurs = occurs;
+        ValueType = valueType;
+        Representation = representation;
+        ReadOnly = readOnly;
+        Getter = getter ?? throw new ArgumentNullException(nameof(getter));
+        Setter = setter ?? throw new ArgumentNullException(nameof(setter));
+    }
+
+    /// <summary>
+    ///     Property URI, as in <c>[OslcPropertyDefinition]</c>
+    /// </summary>
+    public string PropertyDefinition { get; }
+
+    /// <summary>
+    ///     Property name, as in <c>[OslcName]</c>
+    /// </summary>
+    public string Name { get; }
+
+    /// <summary>
+    ///     Name of the CLR property that holds the value
+    /// </summary>
+    public string MemberName { get; }
+
+    /// <summary>
+    ///     Type of the CLR property that holds the value
+    /// </summary>
+    public Type PropertyType { get; }
+
+    /// <summary>
+    ///     <see cref="Occurs.Unknown" /> when the shape does not declare it
+    /// </summary>
+    public Occurs Occurs { get; }
+
+    /// <summary>
+    ///     <see cref="Model.ValueType.Unknown" /> when the shape does not declare it
+    /// </summary>
+    public ValueType ValueType { get; }
+
+    /// <summary>
+    ///     <see cref="Representation.Unknown" /> when the shape does not declare it
+    /// </summary>
+    public Representation Representation { get; }
+
+    public bool ReadOnly { get; }
+
+    /// <summary>
+    ///     Returns the value of the property of the given resource
+    /// </summary>
+    public Func<object, object?> Getter { get; }
+
+    /// <summary>
+    ///     Sets the property of the given resource; the value must be of <see cref="PropertyType" />
+    /// </summary>
+    public Action<object, object?> Setter { get; }
+}
@@ -0,0 +1,153 @@
+/*******************************************************************************
+ * Copyright (c) 2026 Andrii Berezovskyi and OSLC4Net contributors.
+ *
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * which accompanies this distribution.
+ *
+ * The Eclipse Public License is available at http://www.eclipse.org/legal/epl-v10.html
+ *******************************************************************************/
+
+using System.Collections.Concurrent;
+using System.Diagnostics.CodeAnalysis;
+using System.Reflection;
+using OSLC4Net.Core.Attribute;
+using OSLC4Net.Core.Exceptions;
+
+namespace OSLC4Net.Core.Model;
+
+/// <summary>
+///     Registry of precomputed property metadata for resource types.
+/// </summary>
+/// <remarks>
+///     Classes generated by <c>scripts/oslc_shapes_gen.py --metadata</c> register their
+///     properties from a module initializer, so the table is available before the first
+///     resource is serialized. Each generated type registers all properties of its shape,
+///     including those it inherits from shared base records (<c>--share-properties</c>); the
+///     properties of hand-written base types such as <see cref="AbstractResource" /> are not
+///     included; the <c>TryGetProperties</c> overload with <c>unregisteredMembers</c> lists
+///     them, looking them up once per type.
+/// </remarks>
+public static class OslcResourceMetadata
+{
+    private static readonly ConcurrentDictionary<Type, Registration> RegistrationsByType = new();
+
+    /// <summary>
+    ///     Registers the properties declared by <paramref name="resourceType" />, replacing any
+    ///     earlier registration.
+    /// </summary>
+    /// <exception cref="OslcCoreInvalidPropertyDefinitionException">
+    ///     A property definition does not end with the property name, or is registered twice
+    /// </exception>
+    public static void Register(Type resourceType, IReadOnlyList<OslcPropertyMetadata> properties)
+    {
+        ArgumentNullException.ThrowIfNull(resourceType);
+        ArgumentNullException.ThrowIfNull(properties);
+
+        // The same checks the reflection path makes on [OslcPropertyDefinition] and [OslcName]
+        var propertyDefinitions = new HashSet<string>(StringComparer.Ordinal);
+        foreach (var property in properties)
+        {
+            if (!property.PropertyDefinition.EndsWith(property.Name, StringComparison.Ordinal) ||
+                !propertyDefinitions.Add(property.PropertyDefinition))
+            {
+                throw new OslcCoreInvalidPropertyDefinitionException(resourceType,
+                    resourceType.GetProperty(property.MemberName),
+                    new OslcPropertyDefinition(property.PropertyDefinition));
+            }
+        }
+
+        RegistrationsByType[resourceType] = new Registration(resourceType, properties);
+    }
+
+    /// <summary>
+    ///     Returns the properties registered for <paramref name="resourceType" />, if any.
+    /// </summary>
+    public static bool TryGetProperties(Type resourceType,
+        [NotNullWhen(true)] out IReadOnlyList<OslcPropertyMetadata>? properties)
+    {
+        ArgumentNullException.ThrowIfNull(resourceType);
+
+        if (RegistrationsByType.TryGetValue(resourceType, out var registration))
+        {
+            properties = registration.Properties;
+            return true;
+        }
+
+        properties = null;
+        return false;
+    }
+
+    /// <summary>
+    ///     Returns the properties registered for <paramref name="resourceType" />, if any, and
+    ///     the public members of the type with <c>[OslcPropertyDefinition]</c> that they do not
+    ///     cover, such as those of a hand-written base type.
+    /// </summary>
+    public static bool TryGetProperties(Type resourceType,
+        [NotNullWhen(true)] out IReadOnlyList<OslcPropertyMetadata>? properties,
+        [NotNullWhen(true)] out IReadOnlyList<MemberInfo>? unregisteredMembers)
+    {
+        ArgumentNullException.ThrowIfNull(resourceType);
+
+        if (RegistrationsByType.TryGetValue(resourceType, out var registration))
+        {
+            properties = registration.Properties;
+            unregisteredMembers = registration.UnregisteredMembers;
+            return true;
+        }
+
+        properties = null;
+        unregisteredMembers = null;
+        return false;
+    }
+
+    public static bool IsRegistered(Type resourceType)
+    {
+        return RegistrationsByType.ContainsKey(resourceType);
+    }
+
+    private sealed class Registration(Type resourceType, IReadOnlyList<OslcPropertyMetadata> properties)
+    {
+        private IReadOnlyList<MemberInfo>? _unregisteredMembers;
+
+        public IReadOnlyList<OslcPropertyMetadata> Properties { get; } = properties;
+
+        /// <summary>
+        ///     Looked up on first use rather than at registration, which runs for every
+        ///     generated type when its assembly is loaded
+        /// </summary>
+        public IReadOnlyList<MemberInfo> UnregisteredMembers =>
+            _unregisteredMembers ??= FindUnregisteredMembers(resourceType, Properties);
+    }
+
+    private static MemberInfo[] FindUnregisteredMembers(Type resourceType,
+        IReadOnlyList<OslcPropertyMetadata> properties)
+    {
+        var registeredMembers = new HashSet<string>(StringComparer.Ordinal);
+        foreach (var property in properties)
+        {
+            registeredMembers.Add(property.MemberName);
+        }
+
+        var members = new List<MemberInfo>();
+        foreach (var method in resourceType.GetMethods())
+        {
+            if (method.GetParameters().Length == 0 &&
+                InheritedMethodAttributeHelper.GetAttribute<OslcPropertyDefinition>(method) != null)
+            {
+                members.Add(method);
+            }
+        }
+
+        foreach (var property in resourceType.GetProperties())
+        {
+            if (!registeredMembers.Contains(property.Name) &&
+                InheritedMethodAttributeHelper.GetAttribute<OslcPropertyDefinition>(property) != null)
+            {
+                members.Add(property);
+            }
+        }
+
+        return members.ToArray();
+    }
+}
@@ -0,0 +1,121 @@
+/*
+ * Copyright (c) 2026 Andrii Berezovskyi and OSLC4Net contributors.
+ *
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * which accompanies this distribution.
+ *
+ * The Eclipse Public License is available at http://www.eclipse.org/legal/epl-v10.html
+ */
+
+using System.Collections.Immutable;
+using Microsoft.CodeAnalysis;
+using Microsoft.CodeAnalysis.CSharp;
+using Microsoft.CodeAnalysis.Text;
+using OSLC4Net.CodeGen.OslcSourceGenerator;
+using OSLC4Net.Core.Attribute;
+
+namespace OSLC4Net.CodeGen.Tests;
+
+/// <summary>
+/// Runs <see cref="OslcDomainGenerator"/> on the multiplicity probe shapes, once from the
+/// N-Triples files and once from the shape IR that <c>scripts/oslc_domain_seed_gen.py --ir</c>
+/// writes for them (<c>Resources/multiplicity.oslcir</c>).
+/// </summary>
+public sealed class ShapeIrGenerationTests
+{
+    private const string Source = $$"""
+        using OSLC4Net.Core.Attribute;
+
+        namespace OSLC4Net.CodeGen.Tests.Probe;
+
+        [OslcVocabulary("{{MultiplicityUris.Vocabulary}}")]
+        public static partial class MultiplicityVocabulary;
+
+        [OslcShape("{{MultiplicityUris.Shape}}")]
+        public partial record MultiplicityProbe;
+        """;
+
+    [Test]
+    public async Task ShapeIrGeneratesTheSameSourcesAsNTriples()
+    {
+        GeneratorRunResult fromNTriples = RunGenerator(
+            ResourceFile("multiplicity-shapes.nt"),
+            ResourceFile("multiplicity-vocab.nt")
+        );
+        GeneratorRunResult fromIr = RunGenerator(ResourceFile("multiplicity.oslcir"));
+
+        await Assert.That(fromNTriples.Exception).IsNull();
+        await Assert.That(fromIr.Exception).IsNull();
+        await Assert.That(fromIr.GeneratedSources.Length).IsEqualTo(2);
+        await Assert
+            .That(GeneratedSources(fromIr))
+            .IsEquivalentTo(GeneratedSources(fromNTriples));
+    }
+
+    [Test]
+    [Arguments("not-an-ir 1 0 0\n")]
+    [Arguments("oslc4net-ir 1 1\n")]
+    [Arguments("oslc4net-ir 1 x 0\n")]
+    [Arguments("oslc4net-ir 1 -1 0\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/s\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/p\nhttps://example.test/s\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/p\nhttps://example.test/s\n1 0 x\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/p\nhttps://example.test/s\n1 0 1a\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/p\nhttps://example.test/s\n1 0 2\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/p\nhttps://example.test/s\n1 0 \"0@\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/p\nhttps://example.test/s\n1 0 _\n")]
+    [Arguments("oslc4net-ir 1 2 1\nhttps://example.test/p\nhttps://example.test/s\n1  1\n")]
+    public async Task MalformedShapeIrIsRejected(string content)
+    {
+        GeneratorRunResult result = RunGenerator(
+            new InMemoryAdditionalText("malformed.oslcir", content)
+        );
+
+        await Assert.That(result.Exception).IsTypeOf<InvalidDataException>();
+    }
+
+    private static GeneratorRunResult RunGenerator(params AdditionalText[] additionalTexts)
+    {
+        CSharpCompilation compilation = CSharpCompilation.Create(
+            "ShapeIrProbe",
+            [CSharpSyntaxTree.ParseText(Source)],
+            [
+                MetadataReference.CreateFromFile(typeof(object).Assembly.Location),
+                MetadataReference.CreateFromFile(typeof(OslcShapeAttribute).Assembly.Location),
+            ],
+            new CSharpCompilationOptions(OutputKind.DynamicallyLinkedLibrary)
+        );
+        GeneratorDriver driver = CSharpGeneratorDriver.Create(
+            [new OslcDomainGenerator().AsSourceGenerator()],
+            additionalTexts
+        );
+
+        return driver.RunGenerators(compilation).GetRunResult().Results.Single();
+    }
+
+    private static Dictionary<string, string> GeneratedSources(GeneratorRunResult result)
+    {
+        return result.GeneratedSources.ToDictionary(
+            static source => source.HintName,
+            static source => source.SourceText.ToString(),
+            StringComparer.Ordinal
+        );
+    }
+
+    private static InMemoryAdditionalText ResourceFile(string name)
+    {
+        string path = Path.Combine(AppContext.BaseDirectory, "Resources", name);
+        return new InMemoryAdditionalText(path, File.ReadAllText(path));
+    }
+
+    private sealed class InMemoryAdditionalText(string path, string content) : AdditionalText
+    {
+        public override string Path => path;
+
+        public override SourceText GetText(CancellationToken cancellationToken = default)
+        {
+            return SourceText.From(content);
+        }
+    }
+}
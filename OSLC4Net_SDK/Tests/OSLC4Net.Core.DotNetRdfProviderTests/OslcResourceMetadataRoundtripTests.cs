@@ -0,0 +1,106 @@
+using OSLC4Net.Core.Attribute;
+using OSLC4Net.Core.DotNetRdfProvider;
+using OSLC4Net.Core.Model;
+using VDS.RDF;
+using ValueType = OSLC4Net.Core.Model.ValueType;
+
+namespace OSLC4Net.Core.DotNetRdfProviderTests;
+
+public class OslcResourceMetadataRoundtripTests
+{
+    private const string Namespace = "http://example.com/ns#";
+
+    [Test]
+    public async Task RegisteredProperties_RoundtripThroughCompiledAccessors()
+    {
+        var accessors = new AccessorCounts();
+        OslcResourceMetadata.Register(typeof(MetadataOnlyResource), MetadataOnlyResource.Properties(accessors));
+
+        var resource = new MetadataOnlyResource(new Uri("http://example.com/resources/1"))
+        {
+            Title = "Registered title",
+            Priority = 3,
+            Related = new Uri("http://example.com/resources/2"),
+            Tags = ["a", "b"]
+        };
+
+        var graph = DotNetRdfHelper.CreateDotNetRdfGraph([resource]);
+
+        var subject = graph.CreateUriNode(resource.About);
+        await Assert.That(((ILiteralNode)graph.GetTriplesWithSubjectPredicate(subject,
+                graph.CreateUriNode(new Uri(Namespace + "title"))).Single().Object).Value)
+            .IsEqualTo("Registered title");
+        await Assert.That(graph.GetTriplesWithSubjectPredicate(subject,
+                graph.CreateUriNode(new Uri(Namespace + "tag"))).Count())
+            .IsEqualTo(2);
+        await Assert.That(accessors.Gets).IsEqualTo(4);
+
+        var deserialized = ((List<MetadataOnlyResource>)new DotNetRdfHelper()
+                .FromDotNetRdfGraph(graph, typeof(MetadataOnlyResource)))
+            .Single();
+
+        await Assert.That(deserialized.About).IsEqualTo(resource.About);
+        await Assert.That(deserialized.Title).IsEqualTo(resource.Title);
+        await Assert.That(deserialized.Priority).IsEqualTo(resource.Priority);
+        await Assert.That(deserialized.Related).IsEqualTo(resource.Related);
+        await Assert.That(deserialized.Tags).IsEquivalentTo(resource.Tags);
+        await Assert.That(deserialized.Types).Contains(new Uri(Namespace + "MetadataOnlyResource"));
+        await Assert.That(accessors.Sets).IsEqualTo(4);
+    }
+
+    private sealed class AccessorCounts
+    {
+        public int Gets;
+        public int Sets;
+    }
+
+    /// <summary>
+    ///     Carries no property attributes, so its properties can only be found through
+    ///     <see cref="OslcResourceMetadata" />
+    /// </summary>
+    [OslcNamespace(Namespace)]
+    [OslcResourceShape(title = "Metadata only resource", describes = Namespace + "MetadataOnlyResource")]
+    private sealed record MetadataOnlyResource : AbstractResourceRecord
+    {
+        public MetadataOnlyResource(Uri about) : base(about) { }
+        public MetadataOnlyResource() : base() { }
+
+        public string? Title { get; set; }
+        public int Priority { get; set; }
+        public Uri? Related { get; set; }
+        public HashSet<string> Tags { get; set; } = [];
+
+        public static IReadOnlyList<OslcPropertyMetadata> Properties(AccessorCounts counts)
+        {
+            return
+            [
+                Property(counts, "title", nameof(Title), typeof(string), Occurs.ZeroOrOne,
+                    ValueType.String, r => r.Title, (r, v) => r.Title = (string?)v),
+                Property(counts, "priority", nameof(Priority), typeof(int), Occurs.ExactlyOne,
+                    ValueType.Integer, r => r.Priority, (r, v) => r.Priority = (int)v!),
+                Property(counts, "related", nameof(Related), typeof(Uri), Occurs.ZeroOrOne,
+                    ValueType.Resource, r => r.Related, (r, v) => r.Related = (Uri?)v),
+                Property(counts, "tag", nameof(Tags), typeof(HashSet<string>), Occurs.ZeroOrMany,
+                    ValueType.String, r => r.Tags, (r, v) => r.Tags = (HashSet<string>)v!)
+            ];
+        }
+
+        private static OslcPropertyMetadata Property(AccessorCounts counts, string name, string memberName,
+            Type propertyType, Occurs occurs, ValueType valueType,
+            Func<MetadataOnlyResource, object?> getter, Action<MetadataOnlyResource, object?> setter)
+        {
+            return new OslcPropertyMetadata(Namespace + name, name, memberName, propertyType, occurs,
+                valueType, Representation.Unknown, false,
+                resource =>
+                {
+                    counts.Gets++;
+                    return getter((MetadataOnlyResource)resource);
+                },
+                (resource, value) =>
+                {
+                    counts.Sets++;
+                    setter((MetadataOnlyResource)resource, value);
+                });
+        }
+    }
+}
@@ -0,0 +1,105 @@
+using OSLC4Net.Core.Attribute;
+using OSLC4Net.Core.Exceptions;
+using OSLC4Net.Core.Model;
+using ValueType = OSLC4Net.Core.Model.ValueType;
+
+namespace OSLC4Net.Core.Tests;
+
+public class OslcResourceMetadataTests
+{
+    [Test]
+    public async Task TestRegisteredPropertiesAreReadAndWrittenThroughAccessors()
+    {
+        OslcPropertyMetadata title = new("http://purl.org/dc/terms/title", "title",
+            nameof(RegisteredResource.Title), typeof(string), Occurs.ZeroOrOne, ValueType.String,
+            Representation.Unknown, false,
+            static resource => ((RegisteredResource)resource).Title,
+            static (resource, value) => ((RegisteredResource)resource).Title = (string?)value);
+        OslcResourceMetadata.Register(typeof(RegisteredResource), [title]);
+
+        await Assert.That(OslcResourceMetadata.TryGetProperties(typeof(RegisteredResource),
+            out var properties)).IsTrue();
+        var property = properties!.Single();
+
+        var resource = new RegisteredResource();
+        property.Setter(resource, "Registered title");
+
+        await Assert.That(resource.Title).IsEqualTo("Registered title");
+        await Assert.That(property.Getter(resource)).IsEqualTo("Registered title");
+    }
+
+    [Test]
+    public async Task TestUnregisteredTypeHasNoProperties()
+    {
+        await Assert.That(OslcResourceMetadata.TryGetProperties(typeof(UnregisteredResource),
+            out _)).IsFalse();
+        await Assert.That(OslcResourceMetadata.IsRegistered(typeof(UnregisteredResource))).IsFalse();
+    }
+
+    [Test]
+    public async Task TestRegistrationRejectsDefinitionNotEndingWithName()
+    {
+        await Assert.That(() => OslcResourceMetadata.Register(typeof(InvalidResource),
+                [Title("http://purl.org/dc/terms/title", "name")]))
+            .Throws<OslcCoreInvalidPropertyDefinitionException>();
+        await Assert.That(OslcResourceMetadata.IsRegistered(typeof(InvalidResource))).IsFalse();
+    }
+
+    [Test]
+    public async Task TestRegistrationRejectsDuplicateDefinitions()
+    {
+        await Assert.That(() => OslcResourceMetadata.Register(typeof(InvalidResource),
+                [Title("http://purl.org/dc/terms/title", "title"), Title("http://purl.org/dc/terms/title", "title")]))
+            .Throws<OslcCoreInvalidPropertyDefinitionException>();
+        await Assert.That(OslcResourceMetadata.IsRegistered(typeof(InvalidResource))).IsFalse();
+    }
+
+    [Test]
+    public async Task TestUnregisteredMembersAreThoseTheRegistryDoesNotCover()
+    {
+        OslcResourceMetadata.Register(typeof(PartlyRegisteredResource),
+        [
+            new OslcPropertyMetadata("http://purl.org/dc/terms/title", "title",
+                nameof(PartlyRegisteredResource.Title), typeof(string), Occurs.ZeroOrOne, ValueType.String,
+                Representation.Unknown, false,
+                static resource => ((PartlyRegisteredResource)resource).Title,
+                static (resource, value) => ((PartlyRegisteredResource)resource).Title = (string?)value)
+        ]);
+
+        await Assert.That(OslcResourceMetadata.TryGetProperties(typeof(PartlyRegisteredResource),
+            out _, out var unregisteredMembers)).IsTrue();
+
+        // Types is the rdf:type property inherited from AbstractResource
+        await Assert.That(unregisteredMembers!.Select(member => member.Name))
+            .IsEquivalentTo([nameof(PartlyRegisteredResource.Identifier), nameof(AbstractResource.Types)]);
+    }
+
+    private static OslcPropertyMetadata Title(string propertyDefinition, string name)
+    {
+        return new OslcPropertyMetadata(propertyDefinition, name, nameof(InvalidResource.Title), typeof(string),
+            Occurs.ZeroOrOne, ValueType.String, Representation.Unknown, false,
+            static resource => ((InvalidResource)resource).Title,
+            static (resource, value) => ((InvalidResource)resource).Title = (string?)value);
+    }
+
+    private sealed class RegisteredResource
+    {
+        public string? Title { get; set; }
+    }
+
+    private sealed class InvalidResource
+    {
+        public string? Title { get; set; }
+    }
+
+    private sealed class PartlyRegisteredResource : AbstractResource
+    {
+        [OslcPropertyDefinition("http://purl.org/dc/terms/title")]
+        public string? Title { get; set; }
+
+        [OslcPropertyDefinition("http://purl.org/dc/terms/identifier")]
+        public string? Identifier { get; set; }
+    }
+
+    private sealed class UnregisteredResource;
+}
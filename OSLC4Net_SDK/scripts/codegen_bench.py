@@ -0,0 +1,504 @@
+#!/usr/bin/env -S uv run --script
+
+# /// script
+# dependencies = ["rdflib==7.*", "jinja2", "beautifulsoup4"]
+# ///
+
+"""Benchmark the code generation scripts over the checked-in RDF corpora.
+
+Every case runs the phases of one generator (import, parse, extract, render,
+write) on one input file in a fresh interpreter, so import cost and peak memory
+are measured per case. The parse cache is not used. Results are written as JSON
+and can be compared against a stored baseline.
+
+Examples:
+    OSLC4Net_SDK/scripts/codegen_bench.py run --output bench.json
+    OSLC4Net_SDK/scripts/codegen_bench.py run --scale 10 --scale 100 --output bench.json
+    OSLC4Net_SDK/scripts/codegen_bench.py compare baseline.json bench.json
+    OSLC4Net_SDK/scripts/codegen_bench.py scale --factor 10 --output kerml-x10.nt
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import importlib
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from codegen_timings import Timings
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SDK_DIR = SCRIPT_DIR.parent
+RESULTS_VERSION = 1
+
+GENERATORS = ("seed", "shapes", "vocab")
+GENERATOR_MODULES = {
+    "seed": "oslc_domain_seed_gen",
+    "shapes": "oslc_shapes_gen",
+    "vocab": "vocab_gen",
+}
+PHASES = ("import", "parse", "extract", "render", "write")
+
+KERML_SHAPES = SDK_DIR / "OSLC4Net.Domains.KerML" / "Resources" / "shapes.nt"
+MULTIPLICITY_SHAPES = SDK_DIR / "Tests" / "OSLC4Net.CodeGen.Tests" / "Resources" / "multiplicity-shapes.nt"
+
+# IRIs under these prefixes keep their names when a corpus is scaled up
+SHARED_IRI_PREFIXES = (
+    "http://www.w3.org/",
+    "http://purl.org/dc/",
+    "http://open-services.net/ns/core#",
+)
+
+
+@dataclass(frozen=True)
+class Domain:
+    namespace: str
+    vocabulary_class: str
+    vocabulary_uri: str
+
+
+@dataclass(frozen=True)
+class Corpus:
+    name: str
+    path: Path
+    generators: tuple[str, ...]
+    domain: Domain
+
+
+DEFAULT_DOMAIN = Domain("OSLC4Net.Benchmark", "BenchmarkVocabulary", "http://example.com/ns#")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the OSLC4Net code generation scripts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark suite and write a JSON results file.")
+    run_parser.add_argument("--output", "-o", type=Path, default=Path("codegen-bench.json"), help="Results file.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Runs per case; medians are reported.")
+    run_parser.add_argument(
+        "--generator",
+        action="append",
+        choices=GENERATORS,
+        help="Only benchmark this generator (repeatable).",
+    )
+    run_parser.add_argument(
+        "--corpus",
+        action="append",
+        help="Only benchmark corpora whose name contains this text (--scale corpora are always included).",
+    )
+    run_parser.add_argument(
+        "--scale",
+        action="append",
+        type=int,
+        default=[],
+        metavar="FACTOR",
+        help="Also benchmark the KerML shapes replicated FACTOR times (repeatable, e.g. --scale 10 --scale 100).",
+    )
+    run_parser.add_argument("--work-dir", type=Path, help="Directory for scaled corpora and outputs. Defaults to a temporary one.")
+    run_parser.add_argument("--baseline", type=Path, help="Compare the results against this file afterwards.")
+    add_threshold_arguments(run_parser)
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions of a results file against a baseline.")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    add_threshold_arguments(compare_parser)
+
+    scale_parser = commands.add_parser("scale", help="Write a synthetic corpus that replicates an N-Triples file.")
+    scale_parser.add_argument("--input", type=Path, default=KERML_SHAPES, help="Source N-Triples file (default: KerML shapes).")
+    scale_parser.add_argument("--factor", type=int, required=True, help="Number of copies.")
+    scale_parser.add_argument("--output", "-o", type=Path, required=True)
+
+    case_parser = commands.add_parser("case", help="Run a single case and write its measurements (used by 'run').")
+    case_parser.add_argument("--generator", choices=GENERATORS, required=True)
+    case_parser.add_argument("--input", type=Path, required=True)
+    case_parser.add_argument("--namespace", default=DEFAULT_DOMAIN.namespace)
+    case_parser.add_argument("--vocabulary-class", default=DEFAULT_DOMAIN.vocabulary_class)
+    case_parser.add_argument("--vocabulary-uri", default=DEFAULT_DOMAIN.vocabulary_uri)
+    case_parser.add_argument("--work-dir", type=Path, required=True)
+    case_parser.add_argument("--result", type=Path, required=True)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        sys.exit(run_suite(args))
+    elif args.command == "compare":
+        sys.exit(compare_files(args.baseline, args.current, args.threshold, args.min_delta_ms))
+    elif args.command == "scale":
+        triples = scale_ntriples(args.input, args.output, args.factor)
+        print(f"Wrote {triples} triples to {args.output}")
+    else:
+        domain = Domain(args.namespace, args.vocabulary_class, args.vocabulary_uri)
+        measurement = run_case(args.generator, args.input, domain, args.work_dir)
+        args.result.write_text(json.dumps(measurement), encoding="utf-8")
+
+
+def add_threshold_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown or memory growth that counts as a regression (default: 0.10).",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=5.0,
+        help="Ignore time differences smaller than this, whatever their ratio (default: 5).",
+    )
+
+
+# --- Corpora ---
+
+
+def discover_corpora() -> list[Corpus]:
+    """All domain vocabularies and shapes, plus the CodeGen test shapes."""
+    corpora = []
+    for project in sorted(SDK_DIR.glob("OSLC4Net.Domains.*")):
+        domain = read_domain(project)
+        for path in sorted((project / "Resources").glob("*.nt")):
+            corpora.append(Corpus(corpus_name(path), path, generators_for(path), domain))
+
+    if MULTIPLICITY_SHAPES.exists():
+        corpora.append(
+            Corpus(corpus_name(MULTIPLICITY_SHAPES), MULTIPLICITY_SHAPES, generators_for(MULTIPLICITY_SHAPES), DEFAULT_DOMAIN)
+        )
+    return corpora
+
+
+def corpus_name(path: Path) -> str:
+    try:
+        return path.relative_to(SDK_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def generators_for(path: Path) -> tuple[str, ...]:
+    if "vocab" in path.name:
+        return ("vocab",)
+    if "shapes" in path.name:
+        return ("seed", "shapes")
+    return GENERATORS
+
+
+def read_domain(project: Path) -> Domain:
+    """Read the C# namespace and vocabulary of a domain from its checked-in seed file."""
+    for source in sorted(project.glob("*Domain.cs")):
+        text = source.read_text(encoding="utf-8")
+        namespace = re.search(r"^namespace\s+([\w.]+)\s*;", text, re.MULTILINE)
+        vocabulary = re.search(
+            r'\[OslcVocabulary\("([^"]+)"\)\]\s*public static partial class (\w+)',
+            text,
+        )
+        if namespace and vocabulary:
+            return Domain(namespace.group(1), vocabulary.group(2), vocabulary.group(1))
+
+    return Domain(project.name, DEFAULT_DOMAIN.vocabulary_class, DEFAULT_DOMAIN.vocabulary_uri)
+
+
+_NTRIPLES_LINE = re.compile(r"^(\S+)\s+(\S+)\s+(.*?)\s*\.\s*$")
+
+
+def scale_ntriples(source: Path, destination: Path, factor: int) -> int:
+    """Write ``factor`` copies of an N-Triples file, renaming IRIs and blank nodes per copy.
+
+    The first copy keeps the original names. In copy ``k``, every IRI outside
+    ``SHARED_IRI_PREFIXES`` and every blank node label gets a ``_x<k>`` suffix,
+    so the copies describe distinct shapes and properties. Literals are kept.
+    """
+    if factor < 1:
+        raise ValueError("factor must be at least 1")
+
+    lines = source.read_text(encoding="utf-8").splitlines()
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    triples = 0
+    with destination.open("w", encoding="utf-8", newline="\n") as out:
+        for copy in range(factor):
+            suffix = f"_x{copy}" if copy else ""
+            for line in lines:
+                match = _NTRIPLES_LINE.match(line)
+                if match is None:
+                    continue
+
+                subject, predicate, obj = match.groups()
+                if not obj.startswith('"'):
+                    obj = rename_term(obj, suffix)
+                out.write(f"{rename_term(subject, suffix)} {predicate} {obj} .\n")
+                triples += 1
+
+    return triples
+
+
+def rename_term(term: str, suffix: str) -> str:
+    if not suffix:
+        return term
+    if term.startswith("_:"):
+        return term + suffix
+    if term.startswith("<") and not term[1:].startswith(SHARED_IRI_PREFIXES):
+        return f"{term[:-1]}{suffix}>"
+    return term
+
+
+# --- Running cases ---
+
+
+def run_suite(args: argparse.Namespace) -> int:
+    with contextlib.ExitStack() as stack:
+        work_dir = args.work_dir or Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="codegen-bench-")))
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        corpora = [
+            corpus for corpus in discover_corpora() if not args.corpus or any(text in corpus.name for text in args.corpus)
+        ]
+        # Scaled corpora were asked for explicitly, so --corpus does not filter them out
+        for factor in args.scale:
+            path = work_dir / "corpora" / f"kerml-shapes-x{factor}.nt"
+            if not path.exists():
+                print(f"Scaling {corpus_name(KERML_SHAPES)} x{factor} ...", file=sys.stderr)
+                scale_ntriples(KERML_SHAPES, path, factor)
+            corpora.append(
+                Corpus(f"synthetic/kerml-shapes-x{factor}.nt", path, generators_for(KERML_SHAPES), read_domain(KERML_SHAPES.parent.parent))
+            )
+
+        cases = [
+            (generator, corpus)
+            for corpus in corpora
+            for generator in corpus.generators
+            if not args.generator or generator in args.generator
+        ]
+        if not cases:
+            print("No benchmark cases selected.", file=sys.stderr)
+            return 2
+
+        results = []
+        for number, (generator, corpus) in enumerate(cases, start=1):
+            print(f"[{number}/{len(cases)}] {generator} {corpus.name}", file=sys.stderr)
+            measurements = [
+                run_case_in_subprocess(generator, corpus, work_dir / f"case-{number}-{attempt}")
+                for attempt in range(args.repeat)
+            ]
+            results.append(summarize(generator, corpus, measurements))
+
+    document = {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "repeat": args.repeat,
+        "cases": results,
+    }
+    args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    print_table(results)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline is not None:
+        return compare_files(args.baseline, args.output, args.threshold, args.min_delta_ms)
+    return 0
+
+
+def run_case_in_subprocess(generator: str, corpus: Corpus, work_dir: Path) -> dict:
+    work_dir.mkdir(parents=True, exist_ok=True)
+    result_path = work_dir / "result.json"
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "case",
+        "--generator", generator,
+        "--input", str(corpus.path),
+        "--namespace", corpus.domain.namespace,
+        "--vocabulary-class", corpus.domain.vocabulary_class,
+        "--vocabulary-uri", corpus.domain.vocabulary_uri,
+        "--work-dir", str(work_dir),
+        "--result", str(result_path),
+    ]  # fmt: skip
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{generator} on {corpus.name} failed:\n{completed.stderr}")
+    return json.loads(result_path.read_text(encoding="utf-8"))
+
+
+def run_case(generator: str, path: Path, domain: Domain, work_dir: Path) -> dict:
+    """Run one generator's phases in this process and return the measurements."""
+    timer = Timings("codegen_bench")
+    with timer.phase("import"):
+        module = importlib.import_module(GENERATOR_MODULES[generator])
+
+    output_dir = work_dir / "output"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        counts = CASE_RUNNERS[generator](module, path, domain, output_dir, timer)
+
+    # Nested phases ("parent.child") are already included in their parent's time.
+    phases = {phase: totals for phase, totals in timer.phases.items() if "." not in phase}
+    return {
+        "wall_s": {phase: wall for phase, (wall, _cpu, _calls) in phases.items()},
+        "cpu_s": {phase: cpu for phase, (_wall, cpu, _calls) in phases.items()},
+        "counts": counts,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def run_seed_case(module, path: Path, domain: Domain, output_dir: Path, timer: Timings) -> dict:
+    with timer.phase("parse"):
+        graph = module.load_compact_index([path], predicates=module.SEED_PREDICATES)
+    with timer.phase("extract"):
+        declarations = module.build_declarations(graph, "record", module.domain_prefix(domain.namespace))
+    with timer.phase("render"):
+        source = module.render_source(
+            namespace=domain.namespace,
+            vocabulary_class=domain.vocabulary_class,
+            vocabulary_uri=domain.vocabulary_uri,
+            declarations=declarations,
+        )
+    with timer.phase("write"):
+        (output_dir / "Domain.cs").write_text(source, encoding="utf-8")
+
+    return {"triples": graph.triples_read, "indexed_triples": len(graph), "shapes": len(declarations)}
+
+
+def run_shapes_case(module, path: Path, domain: Domain, output_dir: Path, timer: Timings) -> dict:
+    args = module.build_parser().parse_args(
+        [str(path), "--output-dir", str(output_dir), "--csharp-namespace", domain.namespace, "--no-cache"]
+    )
+    module.generate(args, timer)
+    return dict(timer.counts)
+
+
+def run_vocab_case(module, path: Path, domain: Domain, output_dir: Path, timer: Timings) -> dict:
+    with timer.phase("parse"):
+        graph = module.load_compact_index([path], predicates=module.VOCAB_PREDICATES, default_format=None)
+    with timer.phase("extract"):
+        properties = module.find_properties(graph, domain.vocabulary_uri)
+    with timer.phase("render"):
+        text = module.render_properties(properties)
+    with timer.phase("write"):
+        (output_dir / "vocab.txt").write_text(text, encoding="utf-8")
+
+    return {"triples": graph.triples_read, "indexed_triples": len(graph), "properties": len(properties)}
+
+
+CASE_RUNNERS: dict[str, Callable[..., dict]] = {
+    "seed": run_seed_case,
+    "shapes": run_shapes_case,
+    "vocab": run_vocab_case,
+}
+
+
+def peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# --- Results ---
+
+
+def summarize(generator: str, corpus: Corpus, measurements: list[dict]) -> dict:
+    wall = median_phases(m["wall_s"] for m in measurements)
+    cpu = median_phases(m["cpu_s"] for m in measurements)
+    counts = measurements[0]["counts"]
+    peaks = [m["peak_rss_bytes"] for m in measurements if m["peak_rss_bytes"] is not None]
+    triples = counts.get("triples", 0)
+    return {
+        "generator": generator,
+        "corpus": corpus.name,
+        "bytes": corpus.path.stat().st_size,
+        "counts": counts,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "peak_rss_bytes": max(peaks) if peaks else None,
+        "triples_per_s": {
+            "parse": triples / wall["parse"] if wall.get("parse") else None,
+            "total": triples / wall["total"] if wall.get("total") else None,
+        },
+    }
+
+
+def median_phases(runs: Iterable[dict[str, float]]) -> dict[str, float]:
+    runs = list(runs)
+    result = {phase: statistics.median(run.get(phase, 0.0) for run in runs) for phase in PHASES}
+    result["total"] = statistics.median(sum(run.values()) for run in runs)
+    return result
+
+
+def print_table(results: list[dict]) -> None:
+    header = f"{'generator':<8} {'corpus':<62} {'triples':>9} {'total ms':>9} {'parse':>8} {'extract':>8} {'render':>8} {'write':>8} {'triples/s':>11} {'peak MiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        wall = result["wall_s"]
+        rate = result["triples_per_s"]["total"]
+        peak = result["peak_rss_bytes"]
+        print(
+            f"{result['generator']:<8} {result['corpus']:<62} {result['counts'].get('triples', 0):>9}"
+            f" {wall['total'] * 1000:>9.1f} {wall['parse'] * 1000:>8.1f} {wall['extract'] * 1000:>8.1f}"
+            f" {wall['render'] * 1000:>8.1f} {wall['write'] * 1000:>8.1f}"
+            f" {rate if rate is not None else 0:>11.0f} {peak / 2**20 if peak else 0:>9.1f}"
+        )
+
+
+def compare_files(baseline_path: Path, current_path: Path, threshold: float, min_delta_ms: float) -> int:
+    """Print the cases that got slower or bigger than the baseline. Returns 1 if any did."""
+    baseline = load_results(baseline_path)
+    current = load_results(current_path)
+
+    regressions = []
+    for key, result in current.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"new      {key[0]} {key[1]}")
+            continue
+
+        for phase in (*PHASES, "total"):
+            old, new = base["wall_s"].get(phase), result["wall_s"].get(phase)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and (new - old) * 1000 >= min_delta_ms:
+                change = f" ({new / old - 1:+.0%})" if old else ""
+                regressions.append(f"{key[0]} {key[1]}: {phase} {old * 1000:.1f} ms -> {new * 1000:.1f} ms{change}")
+
+        old_peak, new_peak = base.get("peak_rss_bytes"), result.get("peak_rss_bytes")
+        if old_peak and new_peak and new_peak > old_peak * (1 + threshold) and new_peak - old_peak >= 2**20:
+            regressions.append(
+                f"{key[0]} {key[1]}: peak memory {old_peak / 2**20:.1f} MiB -> {new_peak / 2**20:.1f} MiB ({new_peak / old_peak - 1:+.0%})"
+            )
+
+    for key in baseline.keys() - current.keys():
+        print(f"missing  {key[0]} {key[1]}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {baseline_path} (threshold {threshold:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print(f"\nNo regressions against {baseline_path} (threshold {threshold:.0%}).")
+    return 0
+
+
+def load_results(path: Path) -> dict[tuple[str, str], dict]:
+    document = json.loads(path.read_text(encoding="utf-8"))
+    if document.get("version") != RESULTS_VERSION:
+        raise SystemExit(f"{path}: unsupported results version {document.get('version')!r}")
+    return {(case["generator"], case["corpus"]): case for case in document["cases"]}
+
+
+if __name__ == "__main__":
+    main()
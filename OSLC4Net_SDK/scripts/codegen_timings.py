@@ -0,0 +1,230 @@
+"""Phase timings, counters and profiling for the OSLC4Net code generation scripts.
+
+All generators accept ``--timings`` (print a JSON report to stderr when the run
+ends) and ``--profile-out FILE`` (write the report to FILE, with the hottest
+functions from cProfile). Without either flag, ``Timings`` is disabled and
+``phase()`` returns a shared no-op context manager.
+
+Report format (``version`` 1)::
+
+    {
+      "tool": "oslc_shapes_gen", "version": 1, "status": "ok", "exit_code": 0,
+      "started": "2026-01-01T00:00:00+00:00", "wall_s": 0.31, "cpu_s": 0.29,
+      "phases": {"parse": {"wall_s": 0.05, "cpu_s": 0.05, "calls": 1}, ...},
+      "counts": {"triples": 12189, "shapes": 84, ...},
+      "caches": {"parse": {"hits": 1, "misses": 0, "hit_rate": 1.0}, ...},
+      "profile": {"sort": "tottime", "functions": [...]}
+    }
+
+Phases opened inside another phase are reported as ``outer.inner``, and their
+time is also part of the outer phase. Phases timed in worker processes are
+merged into the parent report, so their times add up across workers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+REPORT_VERSION = 1
+DEFAULT_PROFILE_TOP = 25
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class Timings:
+    """Collects per-phase durations, counts and cache statistics for one run.
+
+    Use it as a context manager around the run; on exit the report is printed
+    and/or written as configured.
+    """
+
+    def __init__(
+        self,
+        tool: str,
+        *,
+        enabled: bool = True,
+        to_stderr: bool = False,
+        report_path: Path | None = None,
+        profile: bool = False,
+        profile_top: int = DEFAULT_PROFILE_TOP,
+    ):
+        self.tool = tool
+        self.enabled = enabled
+        self.to_stderr = to_stderr
+        self.report_path = report_path
+        self.profile_top = profile_top
+        self.phases: dict[str, list[float]] = {}
+        self.counts: dict[str, int] = {}
+        self.caches: dict[str, list[int]] = {}
+        self._stack: list[str] = []
+        self._profiler = None
+        self._profile_requested = enabled and profile
+        self._started: str | None = None
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._exit_code = 0
+
+    def phase(self, name: str) -> contextlib.AbstractContextManager[None]:
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        if self._stack:
+            name = f"{self._stack[-1]}.{name}"
+        self._stack.append(name)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, [0.0, 0.0, 0])
+            totals[0] += time.perf_counter() - wall_start
+            totals[1] += time.process_time() - cpu_start
+            totals[2] += 1
+            self._stack.pop()
+
+    def count(self, name: str, value: int) -> None:
+        if self.enabled:
+            self.counts[name] = value
+
+    def cache(self, name: str, hits: int, misses: int) -> None:
+        """Add hits and misses of a named cache (parse cache, memoized helpers, ...)."""
+        if self.enabled:
+            totals = self.caches.setdefault(name, [0, 0])
+            totals[0] += hits
+            totals[1] += misses
+
+    def drain(self) -> dict:
+        """Return and reset the phases and caches collected so far (for worker processes)."""
+        data = {"phases": self.phases, "caches": self.caches}
+        self.phases, self.caches = {}, {}
+        return data
+
+    def merge(self, data: dict) -> None:
+        """Add what another process's ``drain()`` returned."""
+        if not self.enabled:
+            return
+        for name, (wall, cpu, calls) in data["phases"].items():
+            totals = self.phases.setdefault(name, [0.0, 0.0, 0])
+            totals[0] += wall
+            totals[1] += cpu
+            totals[2] += calls
+        for name, (hits, misses) in data["caches"].items():
+            self.cache(name, hits, misses)
+
+    def __enter__(self) -> Timings:
+        if self.enabled:
+            import datetime
+
+            self._started = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+            self._wall_start, self._cpu_start = time.perf_counter(), time.process_time()
+            if self._profile_requested:
+                import cProfile
+
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if not self.enabled:
+            return
+        if self._profiler is not None:
+            self._profiler.disable()
+        if exc_type is SystemExit:
+            self._exit_code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        elif exc_type is not None:
+            self._exit_code = 1
+        self.emit()
+
+    def report(self) -> dict:
+        report = {
+            "tool": self.tool,
+            "version": REPORT_VERSION,
+            "status": "ok" if self._exit_code == 0 else "failed",
+            "exit_code": self._exit_code,
+            "started": self._started,
+            "wall_s": time.perf_counter() - self._wall_start,
+            "cpu_s": time.process_time() - self._cpu_start,
+            "phases": {
+                name: {"wall_s": wall, "cpu_s": cpu, "calls": calls}
+                for name, (wall, cpu, calls) in self.phases.items()
+            },
+            "counts": dict(self.counts),
+            "caches": {
+                name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else None}
+                for name, (hits, misses) in self.caches.items()
+            },
+        }
+        if self._profiler is not None:
+            report["profile"] = {"sort": "tottime", "functions": hottest_functions(self._profiler, self.profile_top)}
+        return report
+
+    def emit(self) -> None:
+        import json
+
+        report = self.report()
+        if self.report_path is not None:
+            self.report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        if self.to_stderr:
+            print(json.dumps(report, indent=2), file=sys.stderr)
+
+
+DISABLED = Timings("", enabled=False)
+
+
+def hottest_functions(profiler, limit: int) -> list[dict]:
+    import pstats
+
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {
+            "function": function,
+            "file": file,
+            "line": line,
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "total_s": total,
+            "cumulative_s": cumulative,
+        }
+        for (file, line, function), (primitive_calls, calls, total, cumulative, _callers) in rows
+    ]
+
+
+def add_timing_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("timings")
+    group.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print a JSON report with phase durations, counts and cache hit rates to stderr.",
+    )
+    group.add_argument(
+        "--profile-out",
+        type=Path,
+        metavar="FILE",
+        help="Write the JSON report to FILE, including the hottest functions from cProfile.",
+    )
+    group.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_PROFILE_TOP,
+        metavar="N",
+        help=f"Number of functions listed in the profile (default: {DEFAULT_PROFILE_TOP}).",
+    )
+
+
+def timings_from_args(args: argparse.Namespace, tool: str) -> Timings:
+    return Timings(
+        tool,
+        enabled=args.timings or args.profile_out is not None,
+        to_stderr=args.timings,
+        report_path=args.profile_out,
+        profile=args.profile_out is not None,
+        profile_top=args.profile_top,
+    )
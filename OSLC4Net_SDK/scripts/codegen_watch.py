@@ -0,0 +1,71 @@
+"""Polling watch mode for the OSLC4Net code generation scripts.
+
+With ``--watch``, a generator keeps running after its first run and regenerates
+when an input file changes. Changes are found by polling each file's
+modification time and size every ``--poll-interval`` seconds, so no
+OS-specific file notification API is needed. A change is reported once the
+file has looked the same on two consecutive polls, so a file that an editor is
+still writing is not read half-way. Stop watching with Ctrl+C.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from collections.abc import Collection, Iterator
+from pathlib import Path
+
+DEFAULT_POLL_INTERVAL = 0.2
+
+Stamp = tuple[int, int] | None
+
+
+def add_watch_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("watch")
+    group.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate whenever an input file changes (stop with Ctrl+C).",
+    )
+    group.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SECONDS",
+        help=f"How often --watch checks the input files (default: {DEFAULT_POLL_INTERVAL}).",
+    )
+
+
+def file_stamp(path: Path) -> Stamp:
+    """Modification time and size of ``path``, or ``None`` if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def poll_changes(paths: Collection[Path], interval: float = DEFAULT_POLL_INTERVAL) -> Iterator[set[Path]]:
+    """Yield the ``paths`` that changed since the previous yield, polling every ``interval`` seconds.
+
+    Never returns. A file that is deleted is reported as changed once it has
+    stayed deleted for a poll, and again when it comes back.
+    """
+    seen = {path: file_stamp(path) for path in paths}
+    pending: dict[Path, Stamp] = {}
+    while True:
+        time.sleep(interval)
+        settled = set()
+        for path in paths:
+            stamp = file_stamp(path)
+            if stamp == seen[path]:
+                pending.pop(path, None)
+            elif pending.get(path, seen[path]) == stamp:
+                seen[path] = stamp
+                pending.pop(path)
+                settled.add(path)
+            else:
+                pending[path] = stamp
+        if settled:
+            yield settled
@@ -0,0 +1,688 @@
+#!/usr/bin/env -S uv run --script
+
+# /// script
+# dependencies = ["rdflib==7.*"]
+# ///
+
+"""Generate a synthetic corpus of OSLC resources from resource shapes, for load testing.
+
+Example:
+    OSLC4Net_SDK/scripts/oslc_corpus_gen.py \\
+        OSLC4Net_SDK/OSLC4Net.Domains.ChangeManagement/Resources/shapes.nt \\
+        --count 1000000 --seed 42 --output cm-1m.ttl
+
+Every shape that has an ``oslc:describes`` type contributes resources in turn,
+so resource ``i`` has the ``i % len(shapes)``-th type. Each property of a shape
+gets values that respect its ``oslc:occurs``, ``oslc:valueType``, ``oslc:range``
+and ``oslc:representation``:
+
+* literal value types get random lexical forms of that datatype;
+* references point to other resources of the corpus whose type is the
+  property's range (any resource if the range is open, an external IRI if no
+  shape describes it);
+* inline values (``oslc:Inline`` or ``oslc:LocalResource``) become blank nodes
+  typed with the range, carrying the literal properties of its shape.
+
+Optional properties get values with probability ``--optional-ratio``; each
+multi-valued property gets 1 to ``--fan-out`` values, which sets the out-degree
+of the link graph. The same shapes, options and ``--seed`` always give the
+same graph, in every output format.
+
+Resources are written one at a time as N-Triples, Turtle, RDF/XML or JSON-LD
+(chosen by ``--format`` or the output file extension), and links are chosen by
+index arithmetic rather than from a list of generated resources, so memory use
+does not grow with ``--count``. Each resource has its own random stream, so
+``oslc_query_pages.py`` can generate any page of a corpus on its own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import contextlib
+import datetime
+import io
+import json
+import math
+import random
+import re
+import sys
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TextIO
+from xml.sax.saxutils import escape as xml_escape
+
+from codegen_timings import Timings, add_timing_arguments, timings_from_args
+from rdf_index import (
+    DCTERMS,
+    RDF,
+    RDF_TYPE,
+    RDFS,
+    XSD,
+    BNode,
+    IRI,
+    Literal,
+    RdfSyntaxError,
+    add_cache_arguments,
+    cache_from_args,
+    load_compact_index,
+)
+from shape_model import OSLC, SHAPE_PREDICATES, PropertyRecord, ShapeModel
+
+FORMATS = {".nt": "nt", ".ttl": "ttl", ".rdf": "rdfxml", ".xml": "rdfxml", ".owl": "rdfxml", ".jsonld": "jsonld"}
+DEFAULT_BASE_URI = "http://example.com/oslc/resources/"
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+# (minimum, maximum) number of values; None is unbounded
+OCCURS = {
+    OSLC["Exactly-one"]: (1, 1),
+    OSLC["Zero-or-one"]: (0, 1),
+    OSLC["Zero-or-many"]: (0, None),
+    OSLC["One-or-many"]: (1, None),
+}
+RESOURCE_VALUE_TYPES = frozenset({OSLC.Resource, OSLC.AnyResource, OSLC.LocalResource})
+OPEN_RANGES = frozenset({None, OSLC.Any, RDFS.Resource})
+
+WORDS = (
+    "alpha", "baseline", "change", "component", "configuration", "defect", "delivery", "design", "feature",
+    "integration", "interface", "milestone", "model", "module", "plan", "quality", "release", "request",
+    "requirement", "review", "risk", "safety", "stream", "system", "task", "test", "trace", "validation",
+    "verification", "version",
+)
+EPOCH = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+FIVE_YEARS = 5 * 365 * 24 * 3600
+
+
+def _words(rng: random.Random, low: int = 2, high: int = 8) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def _moment(rng: random.Random) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(seconds=rng.randrange(FIVE_YEARS))
+
+
+def _integer(low: int, high: int) -> Callable[[random.Random], str]:
+    return lambda rng: str(rng.randint(low, high))
+
+
+# Lexical form generators by datatype; other datatypes get words
+LEXICAL_FORMS: dict[str, Callable[[random.Random], str]] = {
+    XSD.string: _words,
+    XSD.normalizedString: _words,
+    XSD.token: _words,
+    XSD.Name: lambda rng: rng.choice(WORDS),
+    XSD.NCName: lambda rng: rng.choice(WORDS),
+    XSD.NMTOKEN: lambda rng: rng.choice(WORDS),
+    XSD.language: lambda rng: rng.choice(("en", "de", "fr", "sv", "ja")),
+    XSD.anyURI: lambda rng: f"{DEFAULT_BASE_URI}documents/{rng.randrange(1_000_000)}",
+    XSD.boolean: lambda rng: rng.choice(("true", "false")),
+    XSD.integer: _integer(-1_000_000, 1_000_000),
+    XSD.int: _integer(-(2**31), 2**31 - 1),
+    XSD.long: _integer(-(2**63), 2**63 - 1),
+    XSD.short: _integer(-(2**15), 2**15 - 1),
+    XSD.byte: _integer(-128, 127),
+    XSD.nonNegativeInteger: _integer(0, 1_000_000),
+    XSD.positiveInteger: _integer(1, 1_000_000),
+    XSD.nonPositiveInteger: _integer(-1_000_000, 0),
+    XSD.negativeInteger: _integer(-1_000_000, -1),
+    XSD.unsignedLong: _integer(0, 2**64 - 1),
+    XSD.unsignedInt: _integer(0, 2**32 - 1),
+    XSD.unsignedShort: _integer(0, 2**16 - 1),
+    XSD.unsignedByte: _integer(0, 255),
+    XSD.decimal: lambda rng: f"{rng.uniform(-10_000, 10_000):.2f}",
+    XSD.double: lambda rng: repr(rng.uniform(-1e6, 1e6)),
+    XSD.float: lambda rng: f"{rng.uniform(-1e3, 1e3):.3f}",
+    XSD.dateTime: lambda rng: _moment(rng).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    XSD.dateTimeStamp: lambda rng: _moment(rng).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    XSD.date: lambda rng: _moment(rng).strftime("%Y-%m-%d"),
+    XSD.time: lambda rng: _moment(rng).strftime("%H:%M:%S"),
+    XSD.gYear: lambda rng: _moment(rng).strftime("%Y"),
+    XSD.gYearMonth: lambda rng: _moment(rng).strftime("%Y-%m"),
+    XSD.gMonth: lambda rng: _moment(rng).strftime("--%m"),
+    XSD.gMonthDay: lambda rng: _moment(rng).strftime("--%m-%d"),
+    XSD.gDay: lambda rng: _moment(rng).strftime("---%d"),
+    XSD.duration: lambda rng: f"P{rng.randrange(30)}DT{rng.randrange(24)}H{rng.randrange(60)}M",
+    XSD.dayTimeDuration: lambda rng: f"P{rng.randrange(30)}DT{rng.randrange(24)}H",
+    XSD.yearMonthDuration: lambda rng: f"P{rng.randrange(5)}Y{rng.randrange(12)}M",
+    XSD.hexBinary: lambda rng: rng.randbytes(rng.randint(4, 32)).hex().upper(),
+    XSD.base64Binary: lambda rng: base64.b64encode(rng.randbytes(rng.randint(4, 32))).decode("ascii"),
+    RDF.XMLLiteral: lambda rng: f'<span xmlns="http://www.w3.org/1999/xhtml">{_words(rng)}</span>',
+    RDF.HTML: lambda rng: f"<p>{_words(rng)}</p>",
+    RDF.JSON: lambda rng: f'{{"value": {rng.randrange(1000)}}}',
+}
+# Datatypes written as plain strings or language-tagged strings instead
+PLAIN_DATATYPES = frozenset({XSD.string})
+LANGUAGE_DATATYPES = frozenset({RDF.langString, RDF.dirLangString})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic corpus of OSLC resources that conform to resource shapes."
+    )
+    add_corpus_arguments(parser)
+    parser.add_argument("-o", "--output", type=Path, help="Output file. Defaults to stdout.")
+    parser.add_argument(
+        "--format",
+        choices=tuple(WRITERS),
+        help="Output format (default: from the --output extension, else nt).",
+    )
+    parser.add_argument(
+        "--base-uri",
+        default=DEFAULT_BASE_URI,
+        help=f"Prefix of the generated resource URIs (default: {DEFAULT_BASE_URI}).",
+    )
+    add_timing_arguments(parser)
+    args = parser.parse_args()
+    check_corpus_arguments(parser, args)
+    if args.format is None:
+        args.format = FORMATS.get(args.output.suffix.lower(), "nt") if args.output is not None else "nt"
+
+    with timings_from_args(args, "oslc_corpus_gen") as timings:
+        generate(args, timings)
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """The shapes and the options that decide which resources are generated."""
+    parser.add_argument("shapes", nargs="+", type=Path, help="RDF shape files. Format is inferred from the extension.")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="Number of resources (default: 1000).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator (default: 0).")
+    parser.add_argument(
+        "--fan-out",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Maximum number of values of a multi-valued property, and so links per property (default: 3).",
+    )
+    parser.add_argument(
+        "--optional-ratio",
+        type=float,
+        default=0.5,
+        metavar="P",
+        help="Probability that an optional property has values (default: 0.5).",
+    )
+    add_cache_arguments(parser)
+
+
+def check_corpus_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.count < 0:
+        parser.error("--count must not be negative")
+    if args.fan_out < 1:
+        parser.error("--fan-out must be at least 1")
+    if not 0 <= args.optional_ratio <= 1:
+        parser.error("--optional-ratio must be between 0 and 1")
+
+
+def corpus_from_args(args: argparse.Namespace, base_uri: str, timings: Timings) -> Corpus:
+    """Parses the shapes and plans the corpus; exits with an error message if that fails."""
+    cache = cache_from_args(args)
+    try:
+        with timings.phase("parse"):
+            graph = load_compact_index(
+                args.shapes, predicates=SHAPE_PREDICATES, default_format="turtle", cache=cache, jobs=args.parse_jobs
+            )
+    except (OSError, RdfSyntaxError) as error:
+        sys.exit(f"error: {error}")
+    if cache is not None:
+        timings.cache("parse", cache.hits, cache.misses)
+
+    with timings.phase("plan"):
+        plans = plan_resources(ShapeModel.from_index(graph))
+    if not plans:
+        sys.exit("error: no shape with an oslc:describes type")
+    timings.count("shapes", len(plans))
+    return Corpus(plans, args.count, base_uri, args.fan_out, args.optional_ratio)
+
+
+def generate(args: argparse.Namespace, timings: Timings) -> None:
+    corpus = corpus_from_args(args, args.base_uri, timings)
+    with timings.phase("write"), open_output(args.output) as output:
+        writer = WRITERS[args.format](output, corpus.vocabulary())
+        writer.begin()
+        for resource in corpus.resources(args.seed):
+            writer.write(resource)
+        writer.end()
+    timings.count("resources", args.count)
+    timings.count("triples", writer.triples)
+
+
+@contextlib.contextmanager
+def open_output(path: Path | None) -> Iterator[TextIO]:
+    if path is None:
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8", newline="\n", buffering=OUTPUT_BUFFER_SIZE) as output:
+        yield output
+
+
+class PropertyPlan:
+    """How to generate the values of one shape property."""
+
+    __slots__ = ("predicate", "minimum", "maximum", "kind", "datatype", "range", "targets", "external")
+
+    def __init__(self, record: PropertyRecord, predicate: IRI):
+        self.predicate = predicate
+        self.minimum, self.maximum = OCCURS.get(record.occurs, (0, 1))
+        self.range = IRI(record.range) if record.range is not None else None
+        value_type = record.value_type or (OSLC.Resource if record.range is not None else XSD.string)
+        if value_type not in RESOURCE_VALUE_TYPES:
+            self.kind = "literal"
+        elif value_type == OSLC.LocalResource or record.representation == OSLC.Inline:
+            self.kind = "inline"
+        else:
+            self.kind = "link"
+        self.datatype = IRI(value_type)
+        # Positions of the resource plans a link may point to, else the prefix
+        # of external IRIs to link to; both set by Corpus
+        self.targets: tuple[int, ...] = ()
+        self.external = ""
+
+
+class ResourcePlan:
+    """The type and property plans of the resources generated from one shape."""
+
+    __slots__ = ("type", "segment", "properties")
+
+    def __init__(self, type: IRI, segment: str, properties: list[PropertyPlan]):  # noqa: A002
+        self.type = type
+        self.segment = segment
+        self.properties = properties
+
+
+def plan_resources(model: ShapeModel) -> list[ResourcePlan]:
+    """One ResourcePlan per shape with an ``oslc:describes`` type, in input order."""
+    plans: list[ResourcePlan] = []
+    segments: set[str] = set()
+    for shape in model.shapes:
+        if shape.describes is None:
+            continue
+        properties = [
+            PropertyPlan(record, IRI(record.property_definition))
+            for record in model.shape_properties(shape)
+            if record.property_definition is not None and record.property_definition != RDF_TYPE
+        ]
+        segment = unique_segment(local_name(shape.describes), segments)
+        plans.append(ResourcePlan(IRI(shape.describes), segment, properties))
+    return plans
+
+
+def unique_segment(name: str, used: set[str]) -> str:
+    segment = re.sub(r"[^A-Za-z0-9_-]+", "-", name).strip("-") or "resource"
+    candidate, suffix = segment, 2
+    while candidate.lower() in used:
+        candidate, suffix = f"{segment}-{suffix}", suffix + 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def local_name(uri: str) -> str:
+    index = max(uri.rfind("#"), uri.rfind("/"))
+    return uri[index + 1 :] if index >= 0 else uri
+
+
+class Resource:
+    """One generated resource: subject, type and values grouped by predicate in shape order."""
+
+    __slots__ = ("subject", "type", "values")
+
+    def __init__(self, subject: IRI | BNode, type: IRI | None, values: list[tuple[IRI, list[Value]]]):  # noqa: A002
+        self.subject = subject
+        self.type = type
+        self.values = values
+
+
+Value = IRI | Literal | Resource
+
+
+class Corpus:
+    """The resources generated from a list of ResourcePlans, produced one at a time."""
+
+    def __init__(self, plans: list[ResourcePlan], count: int, base_uri: str, fan_out: int, optional_ratio: float):
+        self.plans = plans
+        self.count = count
+        self.base_uri = base_uri
+        self.fan_out = fan_out
+        self.optional_ratio = optional_ratio
+        # Only plans that get at least one resource can be linked to
+        populated = range(min(len(plans), count))
+        by_type: dict[str, list[int]] = {}
+        for position in populated:
+            by_type.setdefault(plans[position].type, []).append(position)
+        self.inline_plans = {plan.type: plan for plan in reversed(plans)}
+        for plan in plans:
+            for prop in plan.properties:
+                if prop.kind == "link":
+                    prop.targets = tuple(populated) if prop.range in OPEN_RANGES else tuple(by_type.get(prop.range, ()))
+                    prop.external = f"{base_uri}external/{local_name(prop.range or 'resource')}/"
+
+    def resource_uri(self, index: int) -> IRI:
+        return IRI(f"{self.base_uri}{self.plans[index % len(self.plans)].segment}/{index}")
+
+    def resources(self, seed: int, start: int = 0, stop: int | None = None) -> Iterator[Resource]:
+        """
+        The resources from index start up to stop (default: all). Each resource
+        draws from its own random stream, seeded with seed and its index, so any
+        range can be generated without the resources before it.
+        """
+        rng = random.Random()
+        for index in range(start, self.count if stop is None else min(stop, self.count)):
+            rng.seed(f"{seed}/{index}")
+            yield self.resource(index, rng)
+
+    def resource(self, index: int, rng: random.Random) -> Resource:
+        plan = self.plans[index % len(self.plans)]
+        values = []
+        blank_nodes = 0
+        for prop in plan.properties:
+            objects: list[Value] = []
+            for _ in range(self.value_count(prop, rng)):
+                if prop.kind == "literal":
+                    objects.append(self.literal(prop, rng))
+                elif prop.kind == "link":
+                    objects.append(self.link(prop, rng))
+                else:
+                    blank_nodes += 1
+                    objects.append(self.inline(prop, BNode(f"r{index}b{blank_nodes}"), rng))
+            if len(objects) > 1 and prop.kind != "inline":
+                # A value drawn twice would be one triple, so drop repeats to keep the counts exact
+                objects = list(dict.fromkeys(objects))
+            if objects:
+                values.append((prop.predicate, objects))
+        return Resource(self.resource_uri(index), plan.type, values)
+
+    def value_count(self, prop: PropertyPlan, rng: random.Random) -> int:
+        if prop.minimum == 0 and rng.random() >= self.optional_ratio:
+            return 0
+        if prop.maximum == 1:
+            return 1
+        return rng.randint(max(prop.minimum, 1), self.fan_out)
+
+    def literal(self, prop: PropertyPlan, rng: random.Random) -> Literal:
+        lexical = LEXICAL_FORMS.get(prop.datatype, _words)(rng)
+        if prop.datatype in PLAIN_DATATYPES:
+            return Literal(lexical)
+        if prop.datatype in LANGUAGE_DATATYPES:
+            return Literal(lexical, language="en")
+        return Literal(lexical, prop.datatype)
+
+    def link(self, prop: PropertyPlan, rng: random.Random) -> IRI:
+        if not prop.targets:
+            return IRI(f"{prop.external}{rng.randrange(1_000_000)}")
+        # Resources of plan p are the indexes p, p + len(plans), ... below count
+        position = rng.choice(prop.targets)
+        stride = len(self.plans)
+        return self.resource_uri(position + stride * rng.randrange(math.ceil((self.count - position) / stride)))
+
+    def inline(self, prop: PropertyPlan, node: BNode, rng: random.Random) -> Resource:
+        """A blank node typed with the range, with the literal properties of its shape (links are not nested)."""
+        if prop.range in OPEN_RANGES:
+            return Resource(node, None, [])
+        values = []
+        plan = self.inline_plans.get(prop.range)
+        for nested in plan.properties if plan is not None else ():
+            if nested.kind == "literal":
+                objects: list[Value] = list(
+                    dict.fromkeys(self.literal(nested, rng) for _ in range(self.value_count(nested, rng)))
+                )
+                if objects:
+                    values.append((nested.predicate, objects))
+        return Resource(node, prop.range, values)
+
+    def vocabulary(self) -> list[str]:
+        """Every predicate, type and datatype IRI the resources can use, for namespace declarations."""
+        iris = {RDF_TYPE}
+        for plan in self.plans:
+            iris.add(plan.type)
+            for prop in plan.properties:
+                iris.add(prop.predicate)
+                if prop.kind == "literal":
+                    iris.add(prop.datatype)
+                elif prop.range is not None:
+                    iris.add(prop.range)
+        return sorted(iris)
+
+
+# --- Writers ---
+# Each writer gets every resource once and writes it out at once, so none of
+# them keeps state that grows with the corpus.
+
+_NT_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+# A local name that is both a Turtle PN_LOCAL and an XML NCName
+_LOCAL_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*$")
+WELL_KNOWN_PREFIXES = {
+    str(RDF): "rdf",
+    str(RDFS): "rdfs",
+    str(XSD): "xsd",
+    str(DCTERMS): "dcterms",
+    str(OSLC): "oslc",
+    "http://xmlns.com/foaf/0.1/": "foaf",
+}
+
+
+def split_iri(iri: str) -> tuple[str, str] | None:
+    """Split ``iri`` into a namespace and a local name usable in Turtle and RDF/XML, if possible."""
+    match = _LOCAL_NAME.search(iri)
+    if match is None or match.start() == 0:
+        return None
+    return iri[: match.start()], iri[match.start() :]
+
+
+def namespace_prefixes(iris: list[str]) -> dict[str, str]:
+    """Prefix names for the namespaces of ``iris``: well-known ones, else derived from the namespace."""
+    prefixes: dict[str, str] = {}
+    used: set[str] = set()
+    namespaces = {parts[0] for parts in map(split_iri, iris) if parts is not None}
+    # Well-known namespaces first, so that they keep their usual prefixes
+    for namespace in sorted(namespaces, key=lambda namespace: (namespace not in WELL_KNOWN_PREFIXES, namespace)):
+        prefix = WELL_KNOWN_PREFIXES.get(namespace)
+        if prefix is None:
+            segments = [segment.lower() for segment in re.split(r"[^A-Za-z0-9]+", namespace) if segment]
+            prefix = next(
+                (s for s in reversed(segments) if s[0].isalpha() and s != "ns" and not s.startswith("xml")), "ns"
+            )
+        candidate, suffix = prefix, 2
+        while candidate in used:
+            candidate, suffix = f"{prefix}{suffix}", suffix + 1
+        used.add(candidate)
+        prefixes[namespace] = candidate
+    return prefixes
+
+
+def prefixed_names(iris: list[str], prefixes: dict[str, str]) -> dict[str, str]:
+    """``prefix:local`` names of the ``iris`` that have one."""
+    names = {}
+    for iri in iris:
+        parts = split_iri(iri)
+        if parts is not None and parts[0] in prefixes:
+            names[iri] = f"{prefixes[parts[0]]}:{parts[1]}"
+    return names
+
+
+class NTriplesWriter:
+    def __init__(self, output: TextIO, vocabulary: list[str]):
+        self.output = output
+        self.triples = 0
+
+    def begin(self) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def write(self, resource: Resource) -> None:
+        lines: list[str] = []
+        self._collect(resource, lines)
+        self.triples += len(lines)
+        self.output.write("".join(lines))
+
+    def _collect(self, resource: Resource, lines: list[str]) -> None:
+        subject = self.term(resource.subject)
+        if resource.type is not None:
+            lines.append(f"{subject} <{RDF_TYPE}> <{resource.type}> .\n")
+        for predicate, objects in resource.values:
+            for obj in objects:
+                if isinstance(obj, Resource):
+                    lines.append(f"{subject} <{predicate}> {self.term(obj.subject)} .\n")
+                    self._collect(obj, lines)
+                else:
+                    lines.append(f"{subject} <{predicate}> {self.term(obj)} .\n")
+
+    def term(self, term: IRI | BNode | Literal) -> str:
+        if isinstance(term, Literal):
+            text = f'"{term.lexical.translate(_NT_ESCAPES)}"'
+            if term.language is not None:
+                return f"{text}@{term.language}"
+            return f"{text}^^<{term.datatype}>" if term.datatype is not None else text
+        if isinstance(term, BNode):
+            return f"_:{term}"
+        return f"<{term}>"
+
+
+class TurtleWriter(NTriplesWriter):
+    def __init__(self, output: TextIO, vocabulary: list[str]):
+        super().__init__(output, vocabulary)
+        self.prefixes = namespace_prefixes(vocabulary)
+        self.names = prefixed_names(vocabulary, self.prefixes)
+
+    def begin(self) -> None:
+        self.output.write("".join(f"@prefix {prefix}: <{ns}> .\n" for ns, prefix in self.prefixes.items()) + "\n")
+
+    def write(self, resource: Resource) -> None:
+        self.output.write(f"<{resource.subject}>{self._body(resource, '    ')} .\n\n")
+
+    def _body(self, resource: Resource, indent: str) -> str:
+        statements = []
+        if resource.type is not None:
+            statements.append(f"a {self.name(resource.type)}")
+            self.triples += 1
+        for predicate, objects in resource.values:
+            rendered = []
+            for obj in objects:
+                if isinstance(obj, Resource):
+                    body = self._body(obj, indent + "    ")
+                    rendered.append(f"[{body}\n{indent}]" if body else "[]")
+                else:
+                    rendered.append(self.term(obj))
+            statements.append(f"{self.name(predicate)} {', '.join(rendered)}")
+            self.triples += len(objects)
+        return "".join(f"\n{indent}{statement} ;" for statement in statements)[:-2] if statements else ""
+
+    def term(self, term: IRI | BNode | Literal) -> str:
+        if isinstance(term, Literal) and term.datatype is not None and term.language is None:
+            return f'"{term.lexical.translate(_NT_ESCAPES)}"^^{self.name(term.datatype)}'
+        return super().term(term)
+
+    def name(self, iri: str) -> str:
+        return self.names.get(iri) or f"<{iri}>"
+
+
+class RdfXmlWriter:
+    def __init__(self, output: TextIO, vocabulary: list[str]):
+        self.output = output
+        self.triples = 0
+        self.prefixes = namespace_prefixes(vocabulary)
+        self.names = prefixed_names(vocabulary, self.prefixes)
+
+    def begin(self) -> None:
+        declarations = "".join(f'\n    xmlns:{prefix}="{xml_escape(ns)}"' for ns, prefix in self.prefixes.items())
+        self.output.write(f'<?xml version="1.0" encoding="utf-8"?>\n<rdf:RDF{declarations}>\n')
+
+    def end(self) -> None:
+        self.output.write("</rdf:RDF>\n")
+
+    def write(self, resource: Resource) -> None:
+        buffer = io.StringIO()
+        buffer.write(f'  <rdf:Description rdf:about="{attribute(resource.subject)}">\n')
+        self._properties(resource, buffer, "    ")
+        buffer.write("  </rdf:Description>\n")
+        self.output.write(buffer.getvalue())
+
+    def _properties(self, resource: Resource, buffer: io.StringIO, indent: str) -> None:
+        if resource.type is not None:
+            buffer.write(f'{indent}<rdf:type rdf:resource="{attribute(resource.type)}"/>\n')
+            self.triples += 1
+        for predicate, objects in resource.values:
+            element = self.names.get(predicate)
+            if element is None:
+                raise ValueError(f"{predicate} cannot be written as an RDF/XML property element")
+            for obj in objects:
+                self.triples += 1
+                if isinstance(obj, Resource):
+                    buffer.write(f'{indent}<{element} rdf:parseType="Resource">\n')
+                    self._properties(obj, buffer, indent + "  ")
+                    buffer.write(f"{indent}</{element}>\n")
+                elif isinstance(obj, Literal):
+                    if obj.datatype == RDF.XMLLiteral:
+                        # The generated XML literals are well-formed, so they are embedded as they are
+                        buffer.write(f'{indent}<{element} rdf:parseType="Literal">{obj.lexical}</{element}>\n')
+                        continue
+                    if obj.language is not None:
+                        annotation = f' xml:lang="{attribute(obj.language)}"'
+                    elif obj.datatype is not None:
+                        annotation = f' rdf:datatype="{attribute(obj.datatype)}"'
+                    else:
+                        annotation = ""
+                    buffer.write(f"{indent}<{element}{annotation}>{xml_escape(obj.lexical)}</{element}>\n")
+                else:
+                    buffer.write(f'{indent}<{element} rdf:resource="{attribute(obj)}"/>\n')
+
+
+class JsonLdWriter:
+    """Writes a JSON-LD document with one node object per resource in @graph; inline resources are embedded."""
+
+    def __init__(self, output: TextIO, vocabulary: list[str]):
+        self.output = output
+        self.triples = 0
+        self.prefixes = namespace_prefixes(vocabulary)
+        self.names = prefixed_names(vocabulary, self.prefixes)
+        self.separator = "\n"
+
+    def begin(self) -> None:
+        context = json.dumps({prefix: namespace for namespace, prefix in self.prefixes.items()})
+        self.output.write(f'{{"@context": {context}, "@graph": [')
+
+    def end(self) -> None:
+        self.output.write("\n]}\n")
+
+    def write(self, resource: Resource) -> None:
+        self.output.write(self.separator + json.dumps(self._node(resource), ensure_ascii=False))
+        self.separator = ",\n"
+
+    def _node(self, resource: Resource) -> dict:
+        subject = resource.subject
+        node: dict = {"@id": f"_:{subject}" if isinstance(subject, BNode) else subject}
+        if resource.type is not None:
+            node["@type"] = self.names.get(resource.type, resource.type)
+            self.triples += 1
+        for predicate, objects in resource.values:
+            node[self.names.get(predicate, predicate)] = [self._value(obj) for obj in objects]
+            self.triples += len(objects)
+        return node
+
+    def _value(self, value: Value) -> dict:
+        if isinstance(value, Resource):
+            return self._node(value)
+        if isinstance(value, Literal):
+            if value.language is not None:
+                return {"@value": value.lexical, "@language": value.language}
+            if value.datatype is not None:
+                return {"@value": value.lexical, "@type": self.names.get(value.datatype, value.datatype)}
+            return {"@value": value.lexical}
+        return {"@id": value}
+
+
+def attribute(value: str) -> str:
+    return xml_escape(value, {'"': "&quot;"})
+
+
+Writer = NTriplesWriter | RdfXmlWriter | JsonLdWriter
+WRITERS: dict[str, Callable[[TextIO, list[str]], Writer]] = {
+    "nt": NTriplesWriter,
+    "ttl": TurtleWriter,
+    "rdfxml": RdfXmlWriter,
+    "jsonld": JsonLdWriter,
+}
+
+
+if __name__ == "__main__":
+    main()
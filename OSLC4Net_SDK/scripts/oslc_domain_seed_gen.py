@@ -13,6 +13,13 @@ Example:
         --vocabulary-uri https://www.omg.org/spec/sysml/vocabulary# \
         --shapes OSLC4Net_SDK/OSLC4Net.Domains.SysMLV2/Resources/shapes.nt \
         --output OSLC4Net_SDK/OSLC4Net.Domains.SysMLV2/SysMLDomain.cs
+
+Add ``--ir Resources/shapes.oslcir --ir-vocabulary Resources/vocab.nt`` to also
+write the compact shape IR (see ``shape_ir.py``). A domain project that lists
+the ``.oslcir`` file as its only AdditionalFile lets the source generator skip
+N-Triples parsing.
+
+``oslc_domains_gen.py`` runs this for every domain listed in ``oslc_domains.toml``.
 """
 
 from __future__ import annotations
@@ -21,7 +28,9 @@ import argparse
 import re
 from pathlib import Path
 
-from rdflib import Graph, URIRef
+from codegen_timings import Timings, add_timing_arguments, timings_from_args
+from rdf_index import IRI, CompactIndex, TripleIndex, add_cache_arguments, cache_from_args, load_compact_index
+from shape_ir import IR_PREDICATES, encode_ir
 
 
 OSLC = "http://open-services.net/ns/core#"
@@ -52,6 +61,7 @@ BCL_TYPE_NAMES = {
     "Uri",
     "ValueType",
 }
+SEED_PREDICATES = (RDF + "type", OSLC + "describes")
 
 
 def main() -> None:
@@ -75,38 +85,106 @@ def main() -> None:
         default="record",
         help="Generate partial records or partial classes.",
     )
+    parser.add_argument(
+        "--ir",
+        type=Path,
+        metavar="FILE",
+        help="Also write the compact shape IR read by OSLC4Net.CodeGen to FILE (conventionally *.oslcir).",
+    )
+    parser.add_argument(
+        "--ir-vocabulary",
+        nargs="+",
+        type=Path,
+        default=[],
+        metavar="FILE",
+        help="Vocabulary files to include in the --ir output along with the shapes.",
+    )
+    add_cache_arguments(parser)
+    add_timing_arguments(parser)
     args = parser.parse_args()
+    if args.ir_vocabulary and args.ir is None:
+        parser.error("--ir-vocabulary requires --ir")
 
-    graph = Graph()
-    for shape_file in args.shapes:
-        graph.parse(shape_file, format=guess_format(shape_file))
+    with timings_from_args(args, "oslc_domain_seed_gen") as timings:
+        generate(args, timings)
+
+
+def generate(args: argparse.Namespace, timings: Timings) -> None:
+    cache = cache_from_args(args)
+    with timings.phase("parse"):
+        graph = load_compact_index(
+            domain_inputs(args), predicates=domain_predicates(args), cache=cache, jobs=args.parse_jobs
+        )
+    timings.count("triples", graph.triples_read)
+    timings.count("indexed_triples", len(graph))
+    if cache is not None:
+        timings.cache("parse", cache.hits, cache.misses)
+
+    timings.count("shapes", write_domain(graph, args, timings))
 
-    declarations = build_declarations(graph, args.resource_kind, domain_prefix(args.namespace))
-    source = render_source(
-        namespace=args.namespace,
-        vocabulary_class=args.vocabulary_class,
-        vocabulary_uri=args.vocabulary_uri,
-        declarations=declarations,
-    )
 
-    if args.output is None:
-        print(source, end="")
-    else:
-        args.output.write_text(source, encoding="utf-8")
+def domain_inputs(args: argparse.Namespace) -> list[Path]:
+    # One parse serves both outputs; vocabularies declare no shapes
+    return list(args.shapes) if args.ir is None else [*args.shapes, *args.ir_vocabulary]
 
 
-def build_declarations(graph: Graph, resource_kind: str, domain_prefix: str) -> list[tuple[str, str]]:
-    shape_type = URIRef(OSLC + "ResourceShape")
-    describes = URIRef(OSLC + "describes")
+def domain_predicates(args: argparse.Namespace) -> tuple[str, ...]:
+    return SEED_PREDICATES if args.ir is None else IR_PREDICATES
+
+
+def write_domain(graph: TripleIndex | CompactIndex, args: argparse.Namespace, timings: Timings) -> int:
+    """Write the seed file (and IR, if requested) of one domain from its parsed inputs; returns the shape count."""
+    with timings.phase("extract"):
+        declarations = build_declarations(graph, args.resource_kind, domain_prefix(args.namespace))
+
+    with timings.phase("render"):
+        source = render_source(
+            namespace=args.namespace,
+            vocabulary_class=args.vocabulary_class,
+            vocabulary_uri=args.vocabulary_uri,
+            declarations=declarations,
+        )
+
+    with timings.phase("write"):
+        if args.output is None:
+            print(source, end="")
+        elif not is_up_to_date(args.output, source):
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(source, encoding="utf-8")
+
+    if args.ir is not None:
+        with timings.phase("render_ir"):
+            ir = encode_ir(graph)
+        with timings.phase("write_ir"):
+            if not is_up_to_date(args.ir, ir):
+                args.ir.parent.mkdir(parents=True, exist_ok=True)
+                args.ir.write_text(ir, encoding="utf-8", newline="\n")
+
+    return len(declarations)
+
+
+def is_up_to_date(path: Path, content: str) -> bool:
+    """Whether ``path`` already holds ``content``; unchanged files are not rewritten, so they keep their mtime."""
+    try:
+        return path.read_text(encoding="utf-8") == content
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def build_declarations(
+    graph: TripleIndex | CompactIndex, resource_kind: str, domain_prefix: str
+) -> list[tuple[str, str]]:
+    shape_type = OSLC + "ResourceShape"
+    describes = OSLC + "describes"
 
     declarations: list[tuple[str, str]] = []
     used_names: set[str] = set()
-    for shape in sorted(graph.subjects(URIRef(RDF + "type"), shape_type), key=str):
-        if not isinstance(shape, URIRef):
+    for shape in sorted(graph.subjects(RDF + "type", shape_type), key=str):
+        if not isinstance(shape, IRI):
             continue
 
         described_resources = sorted(
-            resource for resource in graph.objects(shape, describes) if isinstance(resource, URIRef)
+            resource for resource in graph.objects(shape, describes) if isinstance(resource, IRI)
         )
         if not described_resources:
             continue
@@ -165,17 +243,6 @@ def class_suffix(resource_kind: str) -> str:
     return ";" if resource_kind == "record" else "\n{\n}"
 
 
-def guess_format(path: Path) -> str:
-    suffix = path.suffix.lower()
-    if suffix == ".nt":
-        return "nt"
-    if suffix in {".ttl", ".turtle"}:
-        return "turtle"
-    if suffix == ".rdf":
-        return "xml"
-    return "nt"
-
-
 def local_name(uri: str) -> str:
     index = max(uri.rfind("#"), uri.rfind("/"))
     return uri[index + 1 :] if index >= 0 else uri
@@ -0,0 +1,423 @@
+#!/usr/bin/env -S uv run --script
+
+# /// script
+# requires-python = ">=3.11"
+# dependencies = ["rdflib==7.*"]
+# ///
+
+"""Regenerate the seed files of all domains listed in a manifest, in one process.
+
+Example:
+    OSLC4Net_SDK/scripts/oslc_domains_gen.py OSLC4Net_SDK/scripts/oslc_domains.toml
+
+The manifest is TOML (or JSON with the same structure) with one ``[[domain]]``
+table per domain. Its keys are the ``oslc_domain_seed_gen.py`` options::
+
+    version = 1
+
+    [[domain]]
+    name = "KerML"                      # optional, defaults to the last namespace segment
+    namespace = "OSLC4Net.Domains.KerML"
+    vocabulary-class = "KerMLVocabulary"
+    vocabulary-uri = "https://www.omg.org/spec/kerml/vocabulary#"
+    shapes = ["../OSLC4Net.Domains.KerML/Resources/shapes.nt"]
+    output = "generated/KerML/KerMLDomain.cs"
+    # optional: resource-kind = "class", ir = "...", ir-vocabulary = ["..."]
+
+Paths are relative to the manifest. Inputs listed by more than one domain (such
+as a vocabulary in several ``ir-vocabulary`` lists) are parsed once, before the
+domains run; ``--parse-jobs`` applies to those. Domains are scheduled largest
+input first across ``--jobs`` worker processes.
+
+A domain is skipped when its settings, the content of its inputs, the generator
+scripts and its output files are all the same as after its last run, which is
+recorded in ``.oslc_domains_gen.json`` next to the manifest. ``--force``
+regenerates every domain. Domains with missing inputs are reported and skipped.
+
+With ``--watch``, the driver then keeps every input parsed in memory and polls
+the inputs for changes (see ``codegen_watch.py``). A changed file is parsed
+again on its own, and only the domains that read it are regenerated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import oslc_domain_seed_gen
+import rdf_index
+import shape_ir
+from codegen_timings import Timings, add_timing_arguments, timings_from_args
+from codegen_watch import add_watch_arguments, poll_changes
+from oslc_domain_seed_gen import domain_inputs, domain_predicates, write_domain
+from rdf_index import (
+    CompactIndex,
+    CompactIndexBuilder,
+    ParseCache,
+    RdfSyntaxError,
+    add_cache_arguments,
+    cache_from_args,
+    decode_index,
+    encode_index,
+    guess_format,
+    load_compact_index,
+    read_file,
+)
+
+MANIFEST_VERSION = 1
+STATE_FILENAME = ".oslc_domains_gen.json"
+STATE_VERSION = 1
+# Any change to these scripts makes every domain out of date
+GENERATOR_SOURCES = tuple(Path(module.__file__) for module in (oslc_domain_seed_gen, shape_ir, rdf_index))
+
+REQUIRED_KEYS = ("namespace", "vocabulary-class", "vocabulary-uri", "shapes", "output")
+OPTIONAL_KEYS = ("name", "resource-kind", "ir", "ir-vocabulary")
+
+
+class ManifestError(ValueError):
+    """The manifest cannot be read or describes an invalid domain."""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Regenerate the domain seed files listed in a manifest.")
+    parser.add_argument("manifest", type=Path, help="Domain manifest (.toml or .json).")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Generate domains in N worker processes (0: one per CPU; default: 1).",
+    )
+    parser.add_argument("--force", action="store_true", help="Regenerate domains even if they are up to date.")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Only consider the named domains.")
+    add_cache_arguments(parser)
+    add_timing_arguments(parser)
+    add_watch_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        domains = load_manifest(args.manifest)
+    except ManifestError as error:
+        parser.error(str(error))
+    if args.only:
+        unknown = sorted(set(args.only) - {domain.name for domain in domains})
+        if unknown:
+            parser.error(f"unknown domain(s): {', '.join(unknown)}")
+        domains = [domain for domain in domains if domain.name in args.only]
+
+    with timings_from_args(args, "oslc_domains_gen") as timings:
+        failed = generate(args, domains, timings)
+    if args.watch:
+        try:
+            watch(args, domains)
+        except KeyboardInterrupt:
+            pass
+    elif failed:
+        sys.exit(1)
+
+
+def load_manifest(path: Path) -> list[argparse.Namespace]:
+    """Read ``path`` and return one ``oslc_domain_seed_gen`` argument namespace per domain."""
+    try:
+        if path.suffix == ".toml":
+            import tomllib
+
+            with open(path, "rb") as source:
+                data = tomllib.load(source)
+        else:
+            data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as error:
+        raise ManifestError(f"{path}: {error}") from error
+
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        raise ManifestError(f"{path}: expected a manifest with version = {MANIFEST_VERSION}")
+
+    base = path.parent
+    domains: list[argparse.Namespace] = []
+    for position, entry in enumerate(data.get("domain", []), start=1):
+        where = f"{path}: domain {position}"
+        if not isinstance(entry, dict):
+            raise ManifestError(f"{where}: expected a table")
+        missing = [key for key in REQUIRED_KEYS if key not in entry]
+        if missing:
+            raise ManifestError(f"{where}: missing {', '.join(missing)}")
+        unknown = sorted(set(entry) - {*REQUIRED_KEYS, *OPTIONAL_KEYS})
+        if unknown:
+            raise ManifestError(f"{where}: unknown key(s) {', '.join(unknown)}")
+
+        def path_of(value: str) -> Path:
+            return Path(os.path.normpath(base / value))
+
+        def paths(key: str) -> list[Path]:
+            value = entry.get(key, [])
+            return [path_of(item) for item in ([value] if isinstance(value, str) else value)]
+
+        domain = argparse.Namespace(
+            name=entry.get("name") or entry["namespace"].rsplit(".", maxsplit=1)[-1],
+            namespace=entry["namespace"],
+            vocabulary_class=entry["vocabulary-class"],
+            vocabulary_uri=entry["vocabulary-uri"],
+            shapes=paths("shapes"),
+            output=path_of(entry["output"]),
+            resource_kind=entry.get("resource-kind", "record"),
+            ir=path_of(entry["ir"]) if "ir" in entry else None,
+            ir_vocabulary=paths("ir-vocabulary"),
+        )
+        if domain.resource_kind not in ("record", "class"):
+            raise ManifestError(f"{where}: resource-kind must be record or class")
+        if domain.ir_vocabulary and domain.ir is None:
+            raise ManifestError(f"{where}: ir-vocabulary requires ir")
+        if any(domain.name == other.name for other in domains):
+            raise ManifestError(f"{where}: duplicate domain name {domain.name}")
+        domains.append(domain)
+
+    return domains
+
+
+def generate(args: argparse.Namespace, domains: list[argparse.Namespace], timings: Timings) -> bool:
+    """Regenerate the out-of-date ``domains``; returns whether any of them failed."""
+    state_path = args.manifest.parent / STATE_FILENAME
+    previous = load_state(state_path)
+    names = {domain.name for domain in domains}
+    # Domains left out with --only keep their state
+    state = {name: entry for name, entry in previous.items() if name not in names}
+    digests: dict[Path, str | None] = {}
+
+    with timings.phase("check"):
+        generator = generator_digest()
+        stale = []
+        skipped = 0
+        for domain in domains:
+            missing = [path for path in domain_inputs(domain) if file_digest(path, digests) is None]
+            if missing:
+                print(f"{domain.name}: skipped, missing {', '.join(map(str, missing))}")
+                skipped += 1
+                continue
+
+            fingerprint = domain_fingerprint(domain, generator, digests)
+            entry = previous.get(domain.name, {})
+            up_to_date = entry.get("fingerprint") == fingerprint and entry.get("outputs") == output_digests(domain)
+            if up_to_date and not args.force:
+                print(f"{domain.name}: unchanged")
+                state[domain.name] = entry
+            else:
+                stale.append((domain, fingerprint))
+    timings.count("domains", len(domains))
+    timings.count("unchanged", len(domains) - len(stale) - skipped)
+    if not stale:
+        save_state(state_path, state)
+        return False
+
+    # Largest first, so that the longest domain does not start last
+    stale.sort(key=lambda item: sum(path.stat().st_size for path in domain_inputs(item[0])), reverse=True)
+    cache = cache_from_args(args)
+    with timings.phase("parse_shared"):
+        shared = parse_inputs([domain for domain, _ in stale], cache, args.parse_jobs, min_uses=2)
+    timings.count("shared_inputs", len(shared))
+    if cache is not None:
+        timings.cache("parse", cache.hits, cache.misses)
+
+    jobs = min(args.jobs or os.cpu_count() or 1, len(stale))
+    init_args = (shared, None if cache is None else cache.directory, timings.enabled)
+    tasks = [domain for domain, _ in stale]
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=init_args)
+        results = executor.map(_generate_domain_task, tasks)
+    else:
+        executor = None
+        _init_worker(*init_args)
+        results = map(_generate_domain_task, tasks)
+
+    failed = 0
+    try:
+        for (domain, fingerprint), (message, worker_timings) in zip(stale, results):
+            timings.merge(worker_timings)
+            if message is None:
+                state[domain.name] = {"fingerprint": fingerprint, "outputs": output_digests(domain)}
+                print(f"{domain.name}: generated")
+            else:
+                failed += 1
+                print(f"{domain.name}: failed, {message}", file=sys.stderr)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    timings.count("generated", len(stale) - failed)
+    timings.count("failed", failed)
+
+    with timings.phase("write_state"):
+        save_state(state_path, state)
+    return failed > 0
+
+
+def parse_inputs(
+    domains: list[argparse.Namespace], cache: ParseCache | None, jobs: int, *, min_uses: int = 1
+) -> dict[tuple[Path, tuple[str, ...]], bytes]:
+    """Parse every input that at least ``min_uses`` of ``domains`` read; values are ``encode_index`` payloads."""
+    uses = Counter(input_key(domain, path) for domain in domains for path in set(domain_inputs(domain)))
+    return {
+        key: parse_input(*key, cache=cache, jobs=jobs) for key, count in uses.items() if count >= min_uses
+    }
+
+
+def input_key(domain: argparse.Namespace, path: Path) -> tuple[Path, tuple[str, ...]]:
+    return path.resolve(), domain_predicates(domain)
+
+
+def parse_input(path: Path, predicates: tuple[str, ...], *, cache: ParseCache | None = None, jobs: int = 1) -> bytes:
+    """Parse one input with its own blank node scope, for ``build_index`` to decode into a domain."""
+    return encode_index(load_compact_index([path], predicates=predicates, cache=cache, jobs=jobs), scope="0")
+
+
+def watch(args: argparse.Namespace, domains: list[argparse.Namespace]) -> None:
+    """Regenerate the domains that read an input whenever it changes; never returns."""
+    state_path = args.manifest.parent / STATE_FILENAME
+    generator = generator_digest()
+    inputs = {domain.name: {path.resolve() for path in domain_inputs(domain)} for domain in domains}
+    parsed: dict[tuple[Path, tuple[str, ...]], bytes] = {}
+    cache = cache_from_args(args)
+    for domain in domains:
+        for path in domain_inputs(domain):
+            key = input_key(domain, path)
+            if key not in parsed and path.exists():
+                try:
+                    parsed[key] = parse_input(*key, cache=cache, jobs=args.parse_jobs)
+                except RdfSyntaxError:
+                    pass  # Reported when the file is fixed, or when its domains are regenerated
+    _init_worker(parsed, None, False)
+
+    watched = set().union(*inputs.values())
+    print(f"Watching {len(watched)} input files of {len(domains)} domains; press Ctrl+C to stop.")
+    for changed in poll_changes(watched, args.poll_interval):
+        started = time.perf_counter()
+        for key in [key for key in parsed if key[0] in changed]:
+            del parsed[key]
+
+        state = load_state(state_path)
+        digests: dict[Path, str | None] = {}
+        for domain in domains:
+            if not inputs[domain.name] & changed:
+                continue
+            state.pop(domain.name, None)
+            try:
+                for path in domain_inputs(domain):
+                    key = input_key(domain, path)
+                    if key not in parsed:
+                        parsed[key] = parse_input(*key, cache=cache, jobs=args.parse_jobs)
+            except (OSError, RdfSyntaxError) as error:
+                print(f"{domain.name}: failed, {error}", file=sys.stderr)
+                continue
+
+            message, _ = _generate_domain_task(domain)
+            if message is None:
+                fingerprint = domain_fingerprint(domain, generator, digests)
+                state[domain.name] = {"fingerprint": fingerprint, "outputs": output_digests(domain)}
+                print(f"{domain.name}: regenerated in {time.perf_counter() - started:.2f} s")
+            else:
+                print(f"{domain.name}: failed, {message}", file=sys.stderr)
+        save_state(state_path, state)
+
+
+# --- Worker processes (or this process, with one job) ---
+
+_worker: dict = {}
+
+
+def _init_worker(
+    shared: dict[tuple[Path, tuple[str, ...]], bytes], cache_directory: Path | None, timings_enabled: bool
+) -> None:
+    _worker["shared"] = shared
+    _worker["cache"] = None if cache_directory is None else ParseCache(cache_directory)
+    _worker["timings"] = Timings("oslc_domains_gen worker", enabled=timings_enabled)
+
+
+def _generate_domain_task(domain: argparse.Namespace) -> tuple[str | None, dict]:
+    """Generate one domain; returns an error message (``None`` on success) and the drained timings."""
+    timings: Timings = _worker["timings"]
+    cache: ParseCache | None = _worker["cache"]
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    try:
+        with timings.phase("parse"):
+            graph = build_index(domain, _worker["shared"], cache)
+        write_domain(graph, domain, timings)
+        message = None
+    except (OSError, RdfSyntaxError) as error:
+        message = str(error)
+    if cache is not None:
+        timings.cache("parse", cache.hits - hits, cache.misses - misses)
+    return message, timings.drain()
+
+
+def build_index(
+    domain: argparse.Namespace, shared: dict[tuple[Path, tuple[str, ...]], bytes], cache: ParseCache | None
+) -> CompactIndex:
+    """The index ``oslc_domain_seed_gen`` would load for ``domain``, reusing the ``shared`` parse results."""
+    predicates = domain_predicates(domain)
+    index = CompactIndexBuilder(predicates)
+    for scope, path in enumerate(domain_inputs(domain)):
+        data = shared.get(input_key(domain, path))
+        if data is not None:
+            decode_index(data, index, scope=str(scope))
+        elif cache is None:
+            read_file(path, guess_format(path, "nt"), index, scope=str(scope))
+        else:
+            cache.load(path, guess_format(path, "nt"), index, scope=str(scope))
+    return index.build()
+
+
+# --- Up-to-date checks ---
+
+
+def generator_digest() -> str:
+    return hashlib.sha256(b"".join(path.read_bytes() for path in GENERATOR_SOURCES)).hexdigest()
+
+
+def file_digest(path: Path, digests: dict[Path, str | None]) -> str | None:
+    """SHA-256 of the content of ``path``, or ``None`` if it cannot be read; memoized in ``digests``."""
+    if path not in digests:
+        try:
+            digests[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            digests[path] = None
+    return digests[path]
+
+
+def domain_fingerprint(domain: argparse.Namespace, generator: str, digests: dict[Path, str | None]) -> str:
+    digest = hashlib.sha256(f"{STATE_VERSION}\0{generator}\0".encode())
+    digest.update(json.dumps(vars(domain), default=str, sort_keys=True).encode())
+    for path in domain_inputs(domain):
+        digest.update(f"\0{file_digest(path, digests)}".encode())
+    return digest.hexdigest()
+
+
+def output_digests(domain: argparse.Namespace) -> dict[str, str | None]:
+    outputs = {"output": domain.output} if domain.ir is None else {"output": domain.output, "ir": domain.ir}
+    return {key: file_digest(path, {}) for key, path in outputs.items()}
+
+
+def load_state(path: Path) -> dict[str, dict]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("domains", {})
+
+
+def save_state(path: Path, domains: dict[str, dict]) -> None:
+    text = json.dumps({"version": STATE_VERSION, "domains": dict(sorted(domains.items()))}, indent=2) + "\n"
+    if not oslc_domain_seed_gen.is_up_to_date(path, text):
+        path.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
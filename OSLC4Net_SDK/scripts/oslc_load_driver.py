@@ -0,0 +1,871 @@
+#!/usr/bin/env -S uv run --script
+
+# /// script
+# requires-python = ">=3.11"
+# dependencies = ["rdflib==7.*"]
+# ///
+
+"""Drive an OSLC provider on localhost with concurrent requests from a scenario and report latencies per endpoint.
+
+Examples:
+    # A local stand-in provider, and 30 s of the example scenario against it from 16 clients
+    OSLC4Net_SDK/scripts/oslc_query_pages.py serve \\
+        OSLC4Net_SDK/OSLC4Net.Domains.ChangeManagement/Resources/shapes.nt --count 10000 &
+    OSLC4Net_SDK/scripts/oslc_load_driver.py run OSLC4Net_SDK/scripts/oslc_load_scenario.toml \\
+        --concurrency 16 --duration 30 --output baseline.json
+
+    # 500 requests per second whatever the response times, compared with the first run
+    OSLC4Net_SDK/scripts/oslc_load_driver.py run OSLC4Net_SDK/scripts/oslc_load_scenario.toml \\
+        --mode open --rate 500 --baseline baseline.json
+
+    # Compare two result files
+    OSLC4Net_SDK/scripts/oslc_load_driver.py compare baseline.json results.json
+
+The scenario is TOML (or JSON with the same structure). Paths are relative to it::
+
+    version = 1
+    name = "cm-mixed"                   # optional, defaults to the file name
+    shapes = ["../OSLC4Net.Domains.ChangeManagement/Resources/shapes.nt"]
+    resources = 10000                   # resources on the provider (the stand-in's --count)
+    # optional: seed = 0, accept = "application/rdf+xml", accept-encoding = "gzip", bodies = 32
+
+    [[step]]
+    name = "get-resource"
+    weight = 6                          # relative frequency, default 1
+    path = "resources/{segment}/{index}"
+    # optional: method = "GET"; body = "text/turtle" sends a generated resource
+
+    [[step]]
+    name = "catalog"
+    kind = "catalog"                    # GET, then GET every oslc:serviceProvider listed
+    path = "catalog"
+    # optional: providers = 10
+
+    [[step]]
+    name = "query"
+    kind = "query"                      # GET, then follow oslc:nextPage
+    path = "query?oslc.paging=true&oslc.pageSize=100"
+    # optional: pages = 1, queries = "queries.jsonl" (from oslc_query_corpus_gen.py)
+
+Paths are relative to ``--base-url``. ``{index}`` is a random resource index
+below ``resources`` and ``{segment}`` the path segment of its type, as in
+``oslc_corpus_gen.py`` and ``oslc_query_pages.py``; a step with a ``body``
+sends one of ``bodies`` resources generated from the shapes, and its path uses
+that resource's index. Query steps add the parameters of a random query from
+``queries`` to the path. Requests a step makes after the first (providers,
+next pages) are reported as ``<step>/provider`` and ``<step>/next``.
+
+``--mode closed`` (the default) runs ``--concurrency`` clients that each send a
+request as soon as their previous one finishes. ``--mode open`` starts steps
+at exponentially spaced times averaging ``--rate`` per second, whether or not
+earlier ones have finished, and measures each from its start time, so a slow
+provider shows up as latency rather than as fewer requests. Either way, the
+requests share ``--connections`` keep-alive HTTP/1.1 connections.
+
+Latencies of successful responses (status below 400) go into log-linear
+histograms in the manner of HdrHistogram, accurate to 1/2**SIGNIFICANT_BITS.
+Requests during ``--warmup`` are not counted. The results are written as JSON
+with ``--output``, and ``--baseline`` or ``compare`` flags every endpoint whose
+p50 or p99 latency grew, or whose throughput fell, by more than
+``--threshold`` percent, or whose error rate grew by more than a percentage
+point; the exit status is then 1.
+
+Only loopback addresses are driven unless ``--allow-remote`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import gzip
+import io
+import ipaddress
+import json
+import math
+import os
+import random
+import socket
+import ssl
+import string
+import sys
+import zlib
+from pathlib import Path
+from urllib.parse import urlencode, urljoin, urlsplit
+from xml.etree import ElementTree
+
+from codegen_timings import DISABLED
+from oslc_corpus_gen import WRITERS, Corpus, add_corpus_arguments, corpus_from_args, split_iri
+from oslc_query_pages import FORMATS_BY_MEDIA_TYPE, read_headers, write_document
+from rdf_index import RDF
+from shape_model import OSLC
+
+SCENARIO_VERSION = 1
+RESULTS_FORMAT = "oslc-load-results"
+RESULTS_VERSION = 1
+DEFAULT_BASE_URL = "http://127.0.0.1:8080/"
+DEFAULT_ACCEPT = "application/rdf+xml"
+KINDS = ("request", "catalog", "query")
+METHODS = ("GET", "HEAD", "POST", "PUT", "DELETE")
+PATH_FIELDS = frozenset({"index", "segment"})
+
+SCENARIO_KEYS = ("version", "name", "shapes", "resources", "seed", "accept", "accept-encoding", "bodies", "step")
+STEP_KEYS = {
+    "request": ("name", "kind", "weight", "path", "method", "body"),
+    "catalog": ("name", "kind", "weight", "path", "providers"),
+    "query": ("name", "kind", "weight", "path", "pages", "queries"),
+}
+
+# Histogram buckets keep this many leading bits of a latency in microseconds
+SIGNIFICANT_BITS = 8
+PERCENTILES = {"p50": 50.0, "p90": 90.0, "p99": 99.0, "p999": 99.9}
+# (metric, label, whether higher is better) checked by compare
+GATED_METRICS = (("throughput_rps", "req/s", True), ("p50", "p50 ms", False), ("p99", "p99 ms", False))
+ERROR_RATE_TOLERANCE = 0.01
+
+RDF_ABOUT = f"{{{RDF}}}about"
+RDF_RESOURCE = f"{{{RDF}}}resource"
+XML_MEDIA_TYPES = frozenset({"application/rdf+xml", "application/xml", "text/xml"})
+RDFLIB_FORMATS = {"text/turtle": "turtle", "application/ld+json": "json-ld", "application/n-triples": "nt"}
+DECOMPRESSORS = {"gzip": gzip.decompress, "deflate": zlib.decompress}
+
+
+class ScenarioError(ValueError):
+    """The scenario cannot be read or describes an invalid step."""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Drive an OSLC provider with concurrent requests and report latencies."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run a scenario.")
+    run_parser.add_argument("scenario", type=Path, help="Scenario file (.toml or .json).")
+    run_parser.add_argument(
+        "--base-url",
+        default=DEFAULT_BASE_URL,
+        help=f"URL the step paths are relative to (default: {DEFAULT_BASE_URL}).",
+    )
+    run_parser.add_argument(
+        "--mode", choices=("closed", "open"), default="closed", help="Closed or open loop (default: closed)."
+    )
+    run_parser.add_argument(
+        "-c", "--concurrency", type=int, default=8, metavar="N", help="Clients in closed loop (default: 8)."
+    )
+    run_parser.add_argument(
+        "--rate", type=float, default=100.0, metavar="N", help="Steps started per second in open loop (default: 100)."
+    )
+    run_parser.add_argument(
+        "--connections",
+        type=int,
+        metavar="N",
+        help="Size of the connection pool (default: --concurrency in closed loop, 64 in open loop).",
+    )
+    run_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=10_000,
+        metavar="N",
+        help="Open loop: steps that may be unfinished at once; later ones are dropped and counted (default: 10000).",
+    )
+    run_parser.add_argument(
+        "-d", "--duration", type=float, default=30.0, metavar="SECONDS", help="Measured time (default: 30)."
+    )
+    run_parser.add_argument(
+        "--warmup", type=float, default=5.0, metavar="SECONDS", help="Unmeasured time before it (default: 5)."
+    )
+    run_parser.add_argument(
+        "--timeout", type=float, default=30.0, metavar="SECONDS", help="Time limit of a request (default: 30)."
+    )
+    run_parser.add_argument("--insecure", action="store_true", help="Do not verify HTTPS certificates.")
+    run_parser.add_argument("--allow-remote", action="store_true", help="Allow a base URL that is not on localhost.")
+    run_parser.add_argument("-o", "--output", type=Path, help="Write the results as JSON to this file.")
+    run_parser.add_argument("--baseline", type=Path, help="Results of an earlier run to compare with.")
+    add_threshold_argument(run_parser)
+
+    compare_parser = commands.add_parser("compare", help="Compare the results of two runs.")
+    compare_parser.add_argument("baseline", type=Path, help="Results of the earlier run.")
+    compare_parser.add_argument("current", type=Path, help="Results of the later run.")
+    add_threshold_argument(compare_parser)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        sys.exit(1 if compare_files(parser, args.baseline, args.current, args.threshold) else 0)
+
+    if min(args.concurrency, args.max_in_flight) < 1 or args.rate <= 0 or args.duration <= 0 or args.warmup < 0:
+        parser.error("--concurrency, --max-in-flight, --rate and --duration must be positive")
+    if args.connections is None:
+        args.connections = args.concurrency if args.mode == "closed" else 64
+    elif args.connections < 1:
+        parser.error("--connections must be at least 1")
+    if not args.base_url.endswith("/"):
+        args.base_url += "/"
+    url = urlsplit(args.base_url)
+    if url.scheme not in ("http", "https") or not url.hostname:
+        parser.error("--base-url must be an http or https URL")
+    if not args.allow_remote and not is_loopback(url.hostname):
+        parser.error(f"{url.hostname} is not a loopback address; pass --allow-remote to drive it anyway")
+    try:
+        scenario = load_scenario(args.scenario)
+    except ScenarioError as error:
+        parser.error(str(error))
+
+    results = asyncio.run(LoadDriver(scenario, args).run())
+    print_results(results)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.baseline is not None:
+        print()
+        sys.exit(1 if compare_files(parser, args.baseline, results, args.threshold) else 0)
+
+
+def add_threshold_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        metavar="PERCENT",
+        help="Change in latency or throughput that counts as a regression (default: 10).",
+    )
+
+
+def is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        pass
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except OSError:
+        return False
+    return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback for address in addresses)
+
+
+# --- Scenario ---
+
+
+class Step:
+    """One weighted kind of work of a scenario."""
+
+    __slots__ = ("name", "kind", "weight", "path", "method", "body", "providers", "pages", "queries")
+
+    def __init__(self, entry: dict, base: Path, where: str):
+        self.name = entry["name"]
+        self.kind = entry.get("kind", "request")
+        self.weight = entry.get("weight", 1)
+        self.path = entry["path"]
+        self.method = entry.get("method", "GET").upper()
+        self.body: str | None = entry.get("body")
+        self.providers = entry.get("providers", 10)
+        self.pages = entry.get("pages", 1)
+        self.queries: list[dict[str, str]] = []
+        if not isinstance(self.weight, (int, float)) or self.weight <= 0:
+            raise ScenarioError(f"{where}: weight must be a positive number")
+        if self.method not in METHODS:
+            raise ScenarioError(f"{where}: method must be one of {', '.join(METHODS)}")
+        if self.body is not None and self.body not in FORMATS_BY_MEDIA_TYPE:
+            raise ScenarioError(f"{where}: body must be one of {', '.join(FORMATS_BY_MEDIA_TYPE)}")
+        if self.body is not None and self.method not in ("POST", "PUT"):
+            raise ScenarioError(f"{where}: only POST and PUT steps have a body")
+        if not all(isinstance(value, int) and value >= 1 for value in (self.providers, self.pages)):
+            raise ScenarioError(f"{where}: providers and pages must be positive integers")
+        try:
+            fields = {field for _, field, _, _ in string.Formatter().parse(self.path) if field is not None}
+        except ValueError as error:
+            raise ScenarioError(f"{where}: path: {error}") from error
+        if fields - PATH_FIELDS:
+            raise ScenarioError(f"{where}: path can only use {{index}} and {{segment}}")
+        if "queries" in entry:
+            self.queries = load_queries(Path(os.path.normpath(base / entry["queries"])), where)
+
+    def needs_corpus(self) -> bool:
+        return self.body is not None or any(f"{{{field}}}" in self.path for field in PATH_FIELDS)
+
+
+class Scenario:
+    """The settings and steps of a scenario file."""
+
+    __slots__ = ("name", "shapes", "resources", "seed", "accept", "accept_encoding", "bodies", "steps")
+
+    def __init__(self, data: dict, path: Path):
+        base = path.parent
+        self.name = data.get("name") or path.stem
+        shapes = data.get("shapes", [])
+        shapes = [shapes] if isinstance(shapes, str) else shapes
+        self.shapes = [Path(os.path.normpath(base / item)) for item in shapes]
+        self.resources = data.get("resources", 1000)
+        self.seed = data.get("seed", 0)
+        self.accept = data.get("accept", DEFAULT_ACCEPT)
+        self.accept_encoding: str | None = data.get("accept-encoding")
+        self.bodies = data.get("bodies", 32)
+        if not all(isinstance(value, int) and value >= 1 for value in (self.resources, self.bodies)):
+            raise ScenarioError(f"{path}: resources and bodies must be positive integers")
+
+        self.steps: list[Step] = []
+        for position, entry in enumerate(data.get("step", []), start=1):
+            where = f"{path}: step {position}"
+            if not isinstance(entry, dict):
+                raise ScenarioError(f"{where}: expected a table")
+            missing = [key for key in ("name", "path") if key not in entry]
+            if missing:
+                raise ScenarioError(f"{where}: missing {', '.join(missing)}")
+            kind = entry.get("kind", "request")
+            if kind not in KINDS:
+                raise ScenarioError(f"{where}: kind must be one of {', '.join(KINDS)}")
+            unknown = sorted(set(entry) - set(STEP_KEYS[kind]))
+            if unknown:
+                raise ScenarioError(f"{where}: unknown key(s) for a {kind} step: {', '.join(unknown)}")
+            if any(entry["name"] == step.name for step in self.steps):
+                raise ScenarioError(f"{where}: duplicate step name {entry['name']}")
+            self.steps.append(Step(entry, base, where))
+        if not self.steps:
+            raise ScenarioError(f"{path}: expected at least one [[step]]")
+        if not self.shapes and any(step.needs_corpus() for step in self.steps):
+            raise ScenarioError(f"{path}: steps with a body, {{index}} or {{segment}} need shapes")
+
+
+def load_scenario(path: Path) -> Scenario:
+    try:
+        if path.suffix == ".toml":
+            import tomllib
+
+            with open(path, "rb") as source:
+                data = tomllib.load(source)
+        else:
+            data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as error:
+        raise ScenarioError(f"{path}: {error}") from error
+
+    if not isinstance(data, dict) or data.get("version") != SCENARIO_VERSION:
+        raise ScenarioError(f"{path}: expected a scenario with version = {SCENARIO_VERSION}")
+    unknown = sorted(set(data) - set(SCENARIO_KEYS))
+    if unknown:
+        raise ScenarioError(f"{path}: unknown key(s) {', '.join(unknown)}")
+    return Scenario(data, path)
+
+
+def load_queries(path: Path, where: str) -> list[dict[str, str]]:
+    """The query parameters of a corpus written by oslc_query_corpus_gen.py."""
+    try:
+        with open(path, encoding="utf-8") as source:
+            header = json.loads(next(source, "null"))
+            if not isinstance(header, dict) or header.get("format") != "oslc-query-corpus":
+                raise ScenarioError(f"{where}: {path} is not a query corpus")
+            queries = [json.loads(line)["params"] for line in source if line.strip()]
+    except (OSError, ValueError, KeyError) as error:
+        raise ScenarioError(f"{where}: {path}: {error}") from error
+    if not queries:
+        raise ScenarioError(f"{where}: {path} has no queries")
+    return queries
+
+
+# --- Statistics ---
+
+
+class LatencyHistogram:
+    """
+    Latencies in microseconds, counted in log-linear buckets the way HdrHistogram
+    does: a value keeps its SIGNIFICANT_BITS leading bits, so bucket bounds are
+    within 1/2**SIGNIFICANT_BITS of the values in them, at any magnitude.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, seconds: float) -> None:
+        micros = max(1, round(seconds * 1_000_000))
+        shift = max(0, micros.bit_length() - SIGNIFICANT_BITS)
+        bucket = micros >> shift << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.min = micros if not self.count else min(self.min, micros)
+        self.max = max(self.max, micros)
+        self.count += 1
+        self.total += micros
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        if other.count:
+            self.min = other.min if not self.count else min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, percent: float) -> int:
+        """The highest value equivalent to the ``percent``-th percentile, in microseconds."""
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                width = 1 << max(0, bucket.bit_length() - SIGNIFICANT_BITS)
+                return min(bucket + width - 1, self.max)
+        return self.max
+
+
+class EndpointStats:
+    """Outcomes of the requests to one endpoint."""
+
+    __slots__ = ("histogram", "statuses", "errors", "bytes")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.statuses: dict[str, int] = {}
+        self.errors = 0
+        self.bytes = 0
+
+    def record(self, status: int | str, seconds: float, size: int) -> None:
+        """Counts a response with ``status``, or a failure named by ``status``."""
+        key = str(status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self.bytes += size
+        if isinstance(status, int) and status < 400:
+            self.histogram.record(seconds)
+        else:
+            self.errors += 1
+
+    def merge(self, other: EndpointStats) -> None:
+        self.histogram.merge(other.histogram)
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+        self.errors += other.errors
+        self.bytes += other.bytes
+
+    def to_json(self, duration: float) -> dict:
+        histogram = self.histogram
+        requests = histogram.count + self.errors
+        mean = histogram.total / histogram.count if histogram.count else 0
+        latency = {"min": histogram.min / 1000, "mean": mean / 1000}
+        latency.update({name: histogram.percentile(percent) / 1000 for name, percent in PERCENTILES.items()})
+        latency["max"] = histogram.max / 1000
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "error_rate": self.errors / requests if requests else 0,
+            "throughput_rps": requests / duration,
+            "bytes": self.bytes,
+            "statuses": dict(sorted(self.statuses.items())),
+            "latency_ms": latency,
+            "histogram_us": sorted(histogram.counts.items()),
+        }
+
+
+# --- HTTP ---
+
+
+class Response:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def content(self) -> bytes:
+        """The body without its content coding."""
+        decompress = DECOMPRESSORS.get(self.headers.get("content-encoding", "").lower())
+        return decompress(self.body) if decompress is not None else self.body
+
+    def media_type(self) -> str:
+        return self.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to the origin of ``base_url``, at most ``size`` in use at once."""
+
+    def __init__(self, base_url: str, size: int, insecure: bool):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.origin = f"{url.scheme}://{url.netloc}"
+        self.host_header = url.netloc
+        self.ssl_context: ssl.SSLContext | None = None
+        if url.scheme == "https":
+            self.ssl_context = ssl.create_default_context()
+            if insecure:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.slots = asyncio.Semaphore(size)
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.opened = 0
+        self.requests = 0
+
+    async def request(self, method: str, target: str, headers: dict[str, str], body: bytes | None = None) -> Response:
+        async with self.slots:
+            connection = self.idle.pop() if self.idle else None
+            reused = connection is not None
+            if connection is None:
+                connection = await self.open()
+            try:
+                try:
+                    response, keep_alive = await self.exchange(connection, method, target, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # The provider closed the idle connection; try once more on a new one
+                    connection[1].close()
+                    connection = await self.open()
+                    response, keep_alive = await self.exchange(connection, method, target, headers, body)
+            except BaseException:
+                connection[1].close()
+                raise
+            self.requests += 1
+            if keep_alive:
+                self.idle.append(connection)
+            else:
+                connection[1].close()
+            return response
+
+    async def open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        connection = await asyncio.open_connection(self.host, self.port, ssl=self.ssl_context)
+        self.opened += 1
+        return connection
+
+    async def exchange(
+        self,
+        connection: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        body: bytes | None,
+    ) -> tuple[Response, bool]:
+        reader, writer = connection
+        head = f"{method} {target} HTTP/1.1\r\nHost: {self.host_header}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        if body is not None:
+            head += f"Content-Length: {len(body)}\r\n"
+        writer.write((head + "\r\n").encode("latin-1") + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before the response")
+        version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+        response_headers = await read_headers(reader)
+        keep_alive = version == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or int(status) in (204, 304) or int(status) < 200:
+            content = b""
+        elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+            content = await read_chunked(reader)
+        elif "content-length" in response_headers:
+            content = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+        return Response(int(status), response_headers, content), keep_alive
+
+    def target(self, iri: str) -> str | None:
+        """The request target of ``iri`` if it is on this origin."""
+        if not iri.startswith(self.origin + "/"):
+            return None
+        return iri[len(self.origin) :]
+
+
+async def read_chunked(reader: asyncio.StreamReader) -> bytes:
+    body = io.BytesIO()
+    while True:
+        size = int((await reader.readline()).split(b";")[0], 16)
+        if size == 0:
+            break
+        body.write(await reader.readexactly(size))
+        await reader.readexactly(2)
+    await read_headers(reader)  # trailers
+    return body.getvalue()
+
+
+def linked_iris(response: Response, predicate: str, base: str) -> list[str]:
+    """
+    The objects of ``predicate`` in the response, as absolute IRIs. RDF/XML is
+    read with ElementTree; other formats go through rdflib, which costs far
+    more client time per response.
+    """
+    media_type = response.media_type()
+    try:
+        content = response.content()
+        if media_type in XML_MEDIA_TYPES:
+            namespace, local = split_iri(predicate)
+            iris = []
+            for element in ElementTree.fromstring(content).iter(f"{{{namespace}}}{local}"):
+                iri = element.get(RDF_RESOURCE) or next(
+                    (child.get(RDF_ABOUT) for child in element if child.get(RDF_ABOUT)), None
+                )
+                if iri:
+                    iris.append(urljoin(base, iri))
+            return iris
+        if media_type in RDFLIB_FORMATS:
+            import rdflib
+
+            graph = rdflib.Graph().parse(data=content, format=RDFLIB_FORMATS[media_type], publicID=base)
+            return [str(iri) for iri in graph.objects(None, rdflib.URIRef(predicate))]
+    except Exception:  # noqa: BLE001 - an unreadable body has no links to follow
+        return []
+    return []
+
+
+# --- Driver ---
+
+
+class LoadDriver:
+    """Runs the steps of a scenario against one provider and collects EndpointStats."""
+
+    def __init__(self, scenario: Scenario, args: argparse.Namespace):
+        self.scenario = scenario
+        self.args = args
+        self.rng = random.Random(scenario.seed)
+        self.weights = [step.weight for step in scenario.steps]
+        self.stats: dict[str, EndpointStats] = {step.name: EndpointStats() for step in scenario.steps}
+        self.dropped = 0
+        self.corpus: Corpus | None = None
+        # Generated bodies by content type: (resource index, bytes)
+        self.bodies: dict[str, list[tuple[int, bytes]]] = {}
+        self.headers = {"Accept": scenario.accept, "OSLC-Core-Version": "2.0", "User-Agent": "oslc_load_driver"}
+        if scenario.accept_encoding:
+            self.headers["Accept-Encoding"] = scenario.accept_encoding
+        self.record_from = 0.0
+
+    async def run(self) -> dict:
+        if any(step.needs_corpus() for step in self.scenario.steps):
+            self.prepare_corpus()
+        args = self.args
+        self.pool = ConnectionPool(args.base_url, args.connections, args.insecure)
+        loop = asyncio.get_running_loop()
+        started = datetime.datetime.now(datetime.timezone.utc)
+        print(
+            f"Running {self.scenario.name} against {args.base_url} in {args.mode} loop: "
+            f"{args.warmup:g} s warmup, {args.duration:g} s measured",
+            file=sys.stderr,
+        )
+        self.record_from = loop.time() + args.warmup
+        end = self.record_from + args.duration
+        if args.mode == "closed":
+            await asyncio.gather(*(self.closed_client(end) for _ in range(args.concurrency)))
+        else:
+            await self.open_loop(end)
+        for _, writer in self.pool.idle:
+            writer.close()
+        return self.results(started)
+
+    def prepare_corpus(self) -> None:
+        scenario = self.scenario
+        # The same options as the oslc_corpus_gen.py command line would give
+        parser = argparse.ArgumentParser()
+        add_corpus_arguments(parser)
+        options = parser.parse_args([*map(str, scenario.shapes), "--count", str(scenario.resources)])
+        self.corpus = corpus_from_args(options, self.args.base_url + "resources/", DISABLED)
+        vocabulary = self.corpus.vocabulary()
+        indexes = self.rng.sample(range(scenario.resources), min(scenario.bodies, scenario.resources))
+        for media_type in {step.body for step in scenario.steps if step.body is not None}:
+            entries = []
+            for index in indexes:
+                output = io.StringIO()
+                writer = WRITERS[FORMATS_BY_MEDIA_TYPE[media_type]](output, vocabulary)
+                write_document(writer, self.corpus.resources(scenario.seed, index, index + 1))
+                entries.append((index, output.getvalue().encode("utf-8")))
+            self.bodies[media_type] = entries
+
+    async def closed_client(self, end: float) -> None:
+        loop = asyncio.get_running_loop()
+        while loop.time() < end:
+            await self.run_step(self.pick(), loop.time())
+
+    async def open_loop(self, end: float) -> None:
+        loop = asyncio.get_running_loop()
+        pending: set[asyncio.Task] = set()
+        start = loop.time()
+        while start < end:
+            # Sleeping even when behind schedule lets the started steps run
+            await asyncio.sleep(max(0.0, start - loop.time()))
+            if len(pending) >= self.args.max_in_flight:
+                if start >= self.record_from:
+                    self.dropped += 1
+            else:
+                task = asyncio.create_task(self.run_step(self.pick(), start))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            start += self.rng.expovariate(self.args.rate)
+        if pending:
+            await asyncio.wait(pending)
+
+    def pick(self) -> Step:
+        return self.rng.choices(self.scenario.steps, self.weights)[0]
+
+    async def run_step(self, step: Step, start: float) -> None:
+        body = None
+        index = self.rng.randrange(self.scenario.resources)
+        if step.body is not None:
+            index, body = self.rng.choice(self.bodies[step.body])
+        path = step.path
+        if self.corpus is not None:
+            segment = self.corpus.plans[index % len(self.corpus.plans)].segment
+            path = path.format(index=index, segment=segment)
+        if step.queries:
+            path += ("&" if "?" in path else "?") + urlencode(self.rng.choice(step.queries))
+        target = urlsplit(urljoin(self.args.base_url, path))
+        target = target.path + (f"?{target.query}" if target.query else "")
+
+        response = await self.call(step.name, step.method, target, start, body, step.body)
+        if response is None or response.status >= 400:
+            return
+        if step.kind == "catalog":
+            base = self.pool.origin + target
+            for iri in linked_iris(response, OSLC.serviceProvider, base)[: step.providers]:
+                provider = self.pool.target(iri)
+                if provider is not None:
+                    await self.call(f"{step.name}/provider", "GET", provider)
+        elif step.kind == "query":
+            for _ in range(step.pages - 1):
+                next_pages = linked_iris(response, OSLC.nextPage, self.pool.origin + target)
+                target = self.pool.target(next_pages[0]) if next_pages else None
+                if target is None:
+                    break
+                response = await self.call(f"{step.name}/next", "GET", target)
+                if response is None or response.status >= 400:
+                    break
+
+    async def call(
+        self,
+        endpoint: str,
+        method: str,
+        target: str,
+        start: float | None = None,
+        body: bytes | None = None,
+        content_type: str | None = None,
+    ) -> Response | None:
+        """Sends one request and counts it for ``endpoint`` unless it started during the warmup."""
+        loop = asyncio.get_running_loop()
+        if start is None:
+            start = loop.time()
+        headers = self.headers if content_type is None else {**self.headers, "Content-Type": content_type}
+        response = None
+        try:
+            response = await asyncio.wait_for(self.pool.request(method, target, headers, body), self.args.timeout)
+            status: int | str = response.status
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except (OSError, asyncio.IncompleteReadError, ValueError) as error:
+            status = type(error).__name__
+        if start >= self.record_from:
+            stats = self.stats.get(endpoint)
+            if stats is None:
+                stats = self.stats[endpoint] = EndpointStats()
+            stats.record(status, loop.time() - start, len(response.body) if response is not None else 0)
+        return response
+
+    def results(self, started: datetime.datetime) -> dict:
+        args = self.args
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.merge(stats)
+        return {
+            "format": RESULTS_FORMAT,
+            "version": RESULTS_VERSION,
+            "scenario": self.scenario.name,
+            "base_url": args.base_url,
+            "started": started.isoformat(timespec="seconds"),
+            "load": {
+                "mode": args.mode,
+                "concurrency": args.concurrency if args.mode == "closed" else None,
+                "rate": args.rate if args.mode == "open" else None,
+                "connections": args.connections,
+                "duration_s": args.duration,
+                "warmup_s": args.warmup,
+            },
+            "connections": {"opened": self.pool.opened, "requests": self.pool.requests},
+            "dropped": self.dropped,
+            "endpoints": {name: stats.to_json(args.duration) for name, stats in self.stats.items()},
+            "total": total.to_json(args.duration),
+        }
+
+
+# --- Reports ---
+
+
+def print_results(results: dict) -> None:
+    rows = [*results["endpoints"].items(), ("total", results["total"])]
+    width = max(len(name) for name, _ in rows)
+    print(
+        f"{'endpoint':<{width}} {'requests':>9} {'req/s':>9} {'errors':>7}"
+        f" {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9} {'max ms':>9}"
+    )
+    for name, endpoint in rows:
+        latency = endpoint["latency_ms"]
+        print(
+            f"{name:<{width}} {endpoint['requests']:>9} {endpoint['throughput_rps']:>9.1f} {endpoint['errors']:>7}"
+            + "".join(f" {latency[key]:>9.2f}" for key in ("p50", "p90", "p99", "p999", "max"))
+        )
+    connections = results["connections"]
+    print(
+        f"{connections['requests']} requests on {connections['opened']} connections"
+        + (f", {results['dropped']} steps dropped" if results["dropped"] else "")
+    )
+
+
+def compare_files(
+    parser: argparse.ArgumentParser, baseline: Path | dict, current: Path | dict, threshold: float
+) -> bool:
+    """Prints how ``current`` differs from ``baseline``; returns whether anything regressed."""
+    loaded = []
+    for source in (baseline, current):
+        if isinstance(source, dict):
+            loaded.append(source)
+            continue
+        try:
+            data = json.loads(source.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as error:
+            parser.error(f"{source}: {error}")
+        if not isinstance(data, dict) or data.get("format") != RESULTS_FORMAT:
+            parser.error(f"{source}: not a results file")
+        if data.get("version") != RESULTS_VERSION:
+            parser.error(f"{source}: results version {data.get('version')}, expected {RESULTS_VERSION}")
+        loaded.append(data)
+    if loaded[0]["load"] != loaded[1]["load"]:
+        print("warning: the runs had different load settings, so their numbers may not be comparable")
+    lines, regressions = compare_results(*loaded, threshold)
+    print("\n".join(lines))
+    print(f"{len(regressions)} regression(s)" + (f": {', '.join(regressions)}" if regressions else ""))
+    return bool(regressions)
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Table lines comparing the endpoints of two results, and the regressions as ``endpoint metric``."""
+    names = [*baseline["endpoints"], *(name for name in current["endpoints"] if name not in baseline["endpoints"])]
+    rows = [(name, baseline["endpoints"].get(name), current["endpoints"].get(name)) for name in names]
+    rows.append(("total", baseline["total"], current["total"]))
+    width = max(len(name) for name, _, _ in rows)
+    lines = [f"{'endpoint':<{width}} {'metric':<10} {'baseline':>10} {'current':>10} {'change':>8}"]
+    regressions = []
+    for name, before, after in rows:
+        if before is None or after is None:
+            lines.append(f"{name:<{width}} only in the {'current' if before is None else 'baseline'} results")
+            continue
+        for metric, label, higher_is_better in GATED_METRICS:
+            old = before[metric] if metric in before else before["latency_ms"][metric]
+            new = after[metric] if metric in after else after["latency_ms"][metric]
+            change = (new - old) / old * 100 if old else 0.0
+            regressed = (-change if higher_is_better else change) > threshold
+            if regressed:
+                regressions.append(f"{name} {label}")
+            flag = "  REGRESSED" if regressed else ""
+            lines.append(f"{name:<{width}} {label:<10} {old:>10.2f} {new:>10.2f} {change:>+7.1f}%{flag}")
+        old, new = before["error_rate"], after["error_rate"]
+        regressed = new - old > ERROR_RATE_TOLERANCE
+        if regressed:
+            regressions.append(f"{name} errors")
+        lines.append(
+            f"{name:<{width}} {'errors':<10} {old:>10.2%} {new:>10.2%} {'':>8}" + ("  REGRESSED" if regressed else "")
+        )
+    return lines, regressions
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(130)
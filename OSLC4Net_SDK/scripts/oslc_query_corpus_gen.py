@@ -0,0 +1,430 @@
+#!/usr/bin/env -S uv run --script
+
+# /// script
+# dependencies = ["rdflib==7.*"]
+# ///
+
+"""Generate a corpus of OSLC queries from resource shapes, for benchmarking and regression-testing the query parsers.
+
+Example:
+    OSLC4Net_SDK/scripts/oslc_query_corpus_gen.py \\
+        OSLC4Net_SDK/OSLC4Net.Domains.ChangeManagement/Resources/shapes.nt \\
+        --count 10000 --max-depth 3 --output cm-queries.jsonl
+
+Each query targets the resources of one shape with an ``oslc:describes`` type,
+taken in turn, and has the query parameters that ``OSLC4Net.Core.Query`` parses:
+
+* ``oslc.where``: up to ``--max-terms`` terms joined by `` and ``. A term
+  compares a property with a value of its ``oslc:valueType``, lists up to
+  ``--max-in`` values with ``in``, or, for references and inline resources,
+  is a scoped term over the properties of the range's shape, down to
+  ``--max-depth`` levels;
+* ``oslc.select``: properties and wildcards, nested the same way;
+* ``oslc.orderBy``: ascending and descending sort keys, scoped the same way;
+* ``oslc.searchTerms``: up to ``--max-search-terms`` quoted strings;
+* ``oslc.prefix``: a declaration of every prefix the other parameters use.
+
+Prefixes come from ``vann:preferredNamespacePrefix`` in the vocabulary files
+(``--vocab``, by default the ``vocab.nt`` next to each shapes file) and are
+derived from the namespace otherwise. References point at resources of the
+corpus ``oslc_corpus_gen.py`` generates from the same shapes, so queries can
+match its output.
+
+The corpus is JSON Lines. The first line describes the corpus, including
+``version`` (CORPUS_VERSION, raised whenever the same options would give
+different queries) and the options used; every other line is one query:
+
+    {"id": 0, "type": "http://open-services.net/ns/cm#ChangeRequest",
+     "params": {"oslc.prefix": "...", "oslc.where": "...", ...},
+     "shapes": {"oslc.where": "t2/d1/in1", ...}}
+
+``shapes`` gives the structure of each parameter, for grouping parse times:
+``t`` top-level terms (``s`` strings for ``oslc.searchTerms``, ``p``
+prefixes for ``oslc.prefix``), ``d`` nesting depth and ``in`` number of
+``in`` terms. The same shapes, options and ``--seed`` always give the same
+corpus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+from codegen_timings import Timings, add_timing_arguments, timings_from_args
+from oslc_corpus_gen import (
+    DEFAULT_BASE_URI,
+    LANGUAGE_DATATYPES,
+    LEXICAL_FORMS,
+    PLAIN_DATATYPES,
+    Corpus,
+    PropertyPlan,
+    ResourcePlan,
+    _words,
+    namespace_prefixes,
+    open_output,
+    plan_resources,
+    prefixed_names,
+)
+from rdf_index import (
+    XSD,
+    IRI,
+    Literal,
+    Namespace,
+    RdfSyntaxError,
+    add_cache_arguments,
+    cache_from_args,
+    load_compact_index,
+    load_index,
+)
+from shape_model import SHAPE_PREDICATES, ShapeModel
+
+CORPUS_FORMAT = "oslc-query-corpus"
+# Raise whenever the same shapes and options would give different queries
+CORPUS_VERSION = 1
+CLAUSES = ("oslc.where", "oslc.select", "oslc.orderBy", "oslc.searchTerms")
+VANN = Namespace("http://purl.org/vocab/vann/")
+
+# Datatypes written as bare DECIMAL tokens
+NUMERIC_DATATYPES = frozenset(
+    {
+        XSD.integer, XSD.int, XSD.long, XSD.short, XSD.byte, XSD.decimal,
+        XSD.nonNegativeInteger, XSD.positiveInteger, XSD.nonPositiveInteger, XSD.negativeInteger,
+        XSD.unsignedLong, XSD.unsignedInt, XSD.unsignedShort, XSD.unsignedByte,
+    }
+)
+# Datatypes compared with < and > as well as = and !=
+ORDERED_DATATYPES = NUMERIC_DATATYPES | {
+    XSD.double, XSD.float, XSD.dateTime, XSD.dateTimeStamp, XSD.date, XSD.time,
+    XSD.gYear, XSD.gYearMonth, XSD.duration, XSD.dayTimeDuration, XSD.yearMonthDuration,
+}
+EQUALITY_OPERATORS = ("=", "!=")
+ORDER_OPERATORS = ("=", "!=", "<", ">", "<=", ">=")
+# Chance that a term on a reference is scoped rather than compared, that a
+# term is an in term, and that a select level has a wildcard
+SCOPE_RATIO = 0.5
+IN_RATIO = 0.25
+WILDCARD_RATIO = 0.1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a corpus of OSLC queries over the properties of resource shapes."
+    )
+    parser.add_argument("shapes", nargs="+", type=Path, help="RDF shape files. Format is inferred from the extension.")
+    parser.add_argument(
+        "--vocab",
+        action="append",
+        type=Path,
+        help="Vocabulary file with vann:preferredNamespacePrefix; may be repeated "
+        "(default: the vocab.nt next to each shapes file, if any).",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Output file. Defaults to stdout.")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="Number of queries (default: 1000).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator (default: 0).")
+    parser.add_argument(
+        "--clauses",
+        default=",".join(CLAUSES),
+        help=f"Comma-separated query parameters every query has (default: {','.join(CLAUSES)}).",
+    )
+    parser.add_argument(
+        "--max-depth", type=int, default=2, metavar="N", help="Maximum nesting of scoped terms (default: 2)."
+    )
+    parser.add_argument(
+        "--max-terms", type=int, default=4, metavar="N", help="Maximum terms or properties per level (default: 4)."
+    )
+    parser.add_argument(
+        "--max-in",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Maximum values of an in term; 0 disables in terms (default: 5).",
+    )
+    parser.add_argument(
+        "--max-search-terms", type=int, default=3, metavar="N", help="Maximum oslc.searchTerms strings (default: 3)."
+    )
+    parser.add_argument(
+        "--resources",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="Size of the oslc_corpus_gen.py corpus that references point into (default: 1000).",
+    )
+    parser.add_argument(
+        "--base-uri",
+        default=DEFAULT_BASE_URI,
+        help=f"Prefix of the referenced resource URIs, as in oslc_corpus_gen.py (default: {DEFAULT_BASE_URI}).",
+    )
+    add_cache_arguments(parser)
+    add_timing_arguments(parser)
+    args = parser.parse_args()
+
+    args.clauses = [clause.strip() for clause in args.clauses.split(",") if clause.strip()]
+    unknown = [clause for clause in args.clauses if clause not in CLAUSES]
+    if unknown or not args.clauses:
+        parser.error(f"--clauses must name some of {', '.join(CLAUSES)}")
+    if args.count < 0:
+        parser.error("--count must not be negative")
+    if args.max_depth < 0 or args.max_in < 0:
+        parser.error("--max-depth and --max-in must not be negative")
+    if args.max_terms < 1 or args.max_search_terms < 1 or args.resources < 1:
+        parser.error("--max-terms, --max-search-terms and --resources must be at least 1")
+    if args.max_in == 1:
+        parser.error("--max-in must be 0 or at least 2")
+    if args.vocab is None:
+        args.vocab = [path.parent / "vocab.nt" for path in args.shapes if (path.parent / "vocab.nt").is_file()]
+
+    with timings_from_args(args, "oslc_query_corpus_gen") as timings:
+        generate(args, timings)
+
+
+def generate(args: argparse.Namespace, timings: Timings) -> None:
+    cache = cache_from_args(args)
+    try:
+        with timings.phase("parse"):
+            graph = load_compact_index(
+                args.shapes, predicates=SHAPE_PREDICATES, default_format="turtle", cache=cache, jobs=args.parse_jobs
+            )
+            vocabularies = load_index(args.vocab, predicates=(VANN.preferredNamespacePrefix,), cache=cache)
+    except (OSError, RdfSyntaxError) as error:
+        sys.exit(f"error: {error}")
+    if cache is not None:
+        timings.cache("parse", cache.hits, cache.misses)
+
+    with timings.phase("plan"):
+        plans = plan_resources(ShapeModel.from_index(graph))
+        if not plans:
+            sys.exit("error: no shape with an oslc:describes type")
+        preferred = {
+            str(namespace): prefix.lexical
+            for namespace, _, prefix in vocabularies
+            if isinstance(namespace, IRI) and isinstance(prefix, Literal)
+        }
+        corpus = Corpus(plans, args.resources, args.base_uri, fan_out=1, optional_ratio=0)
+        generator = QueryGenerator(corpus, query_prefixes(corpus.vocabulary(), preferred), args)
+    timings.count("shapes", len(plans))
+
+    header = {
+        "format": CORPUS_FORMAT,
+        "version": CORPUS_VERSION,
+        "shapes": [str(path) for path in args.shapes],
+        "count": args.count,
+        "seed": args.seed,
+        "options": {
+            "clauses": args.clauses,
+            "max_depth": args.max_depth,
+            "max_terms": args.max_terms,
+            "max_in": args.max_in,
+            "max_search_terms": args.max_search_terms,
+            "resources": args.resources,
+            "base_uri": args.base_uri,
+        },
+    }
+    with timings.phase("generate"), open_output(args.output) as output:
+        output.write(json.dumps(header) + "\n")
+        for query in generator.queries(args.seed, args.count):
+            output.write(json.dumps(query, ensure_ascii=False) + "\n")
+    timings.count("queries", args.count)
+
+
+def query_prefixes(iris: list[str], preferred: dict[str, str]) -> dict[str, str]:
+    """
+    Prefixes for the namespaces of ``iris``: the vocabularies' preferred
+    prefixes, else those oslc_corpus_gen.py derives, renamed if they clash.
+    """
+    prefixes = {}
+    used = set()
+    derived = namespace_prefixes(iris)
+    # Preferred prefixes first, so that a derived one never takes their name
+    for namespace in sorted(derived, key=lambda namespace: (namespace not in preferred, namespace)):
+        prefix = preferred.get(namespace, derived[namespace])
+        candidate, suffix = prefix, 2
+        while candidate in used:
+            candidate, suffix = f"{prefix}{suffix}", suffix + 1
+        used.add(candidate)
+        prefixes[namespace] = candidate
+    return prefixes
+
+
+class QueryGenerator:
+    """Random queries over the resource plans of a Corpus."""
+
+    def __init__(self, corpus: Corpus, prefixes: dict[str, str], args: argparse.Namespace):
+        self.corpus = corpus
+        self.prefixes = prefixes
+        self.clauses = args.clauses
+        self.max_depth = args.max_depth
+        self.max_terms = args.max_terms
+        self.max_in = args.max_in
+        self.max_search_terms = args.max_search_terms
+        # (prefix, prefixed name) of every IRI a query can name
+        self.names = {
+            iri: (name.partition(":")[0], name)
+            for iri, name in prefixed_names(corpus.vocabulary(), prefixes).items()
+        }
+        # Properties a query can name, by resource plan
+        self.named = {
+            id(plan): [prop for prop in plan.properties if prop.predicate in self.names] for plan in corpus.plans
+        }
+        self.filterable_cache: dict[tuple[int, int], list[PropertyPlan]] = {}
+        self.sortable_cache: dict[tuple[int, int], list[PropertyPlan]] = {}
+
+    def queries(self, seed: int, count: int) -> Iterator[dict]:
+        """Query i draws from its own random stream, like the resources of a Corpus."""
+        rng = random.Random()
+        for index in range(count):
+            rng.seed(f"{seed}/{index}")
+            yield self.query(index, rng)
+
+    def query(self, index: int, rng: random.Random) -> dict:
+        plan = self.corpus.plans[index % len(self.corpus.plans)]
+        used: set[str] = set()
+        params = {}
+        shapes = {}
+        for clause in self.clauses:
+            stats = {"t": 0, "d": 0, "in": 0}
+            if clause == "oslc.where":
+                text = self.where(plan, 0, rng, used, stats) if self.filterable(plan, 0) else None
+                shape = f"t{stats['t']}/d{stats['d']}/in{stats['in']}"
+            elif clause == "oslc.select":
+                text = self.select(plan, 0, rng, used, stats)
+                shape = f"t{stats['t']}/d{stats['d']}"
+            elif clause == "oslc.orderBy":
+                text = self.order_by(plan, 0, rng, used, stats) if self.sortable(plan, 0) else None
+                shape = f"t{stats['t']}/d{stats['d']}"
+            else:
+                terms = [_words(rng, 1, 3) for _ in range(rng.randint(1, self.max_search_terms))]
+                text = ",".join(f'"{term}"' for term in terms)
+                shape = f"s{len(terms)}"
+            if text is not None:
+                params[clause] = text
+                shapes[clause] = shape
+        if used:
+            namespaces = {prefix: namespace for namespace, prefix in self.prefixes.items()}
+            params = {"oslc.prefix": ",".join(f"{prefix}=<{namespaces[prefix]}>" for prefix in sorted(used)), **params}
+            shapes = {"oslc.prefix": f"p{len(used)}", **shapes}
+        return {"id": index, "type": str(plan.type), "params": params, "shapes": shapes}
+
+    # --- oslc.where ---
+
+    def filterable(self, plan: ResourcePlan, depth: int) -> list[PropertyPlan]:
+        """Properties of ``plan`` a where term at ``depth`` can use: not inline ones with nothing to scope over."""
+        key = (id(plan), depth)
+        props = self.filterable_cache.get(key)
+        if props is None:
+            props = self.filterable_cache[key] = [
+                prop
+                for prop in self.named[id(plan)]
+                if prop.kind != "inline" or self.scoped_plan(prop, depth, self.filterable) is not None
+            ]
+        return props
+
+    def where(self, plan: ResourcePlan, depth: int, rng: random.Random, used: set[str], stats: dict) -> str:
+        props = self.filterable(plan, depth)
+        chosen = rng.sample(props, rng.randint(1, min(self.max_terms, len(props))))
+        if depth == 0:
+            stats["t"] = len(chosen)
+        stats["d"] = max(stats["d"], depth)
+        return " and ".join(self.where_term(prop, depth, rng, used, stats) for prop in chosen)
+
+    def where_term(self, prop: PropertyPlan, depth: int, rng: random.Random, used: set[str], stats: dict) -> str:
+        name = self.name(prop.predicate, used)
+        scoped = self.scoped_plan(prop, depth, self.filterable)
+        if scoped is not None and (prop.kind == "inline" or rng.random() < SCOPE_RATIO):
+            return f"{name}{{{self.where(scoped, depth + 1, rng, used, stats)}}}"
+        if self.max_in and prop.datatype != XSD.boolean and rng.random() < IN_RATIO:
+            stats["in"] += 1
+            values = dict.fromkeys(self.value(prop, rng, used) for _ in range(rng.randint(2, self.max_in)))
+            return f"{name} in [{','.join(values)}]"
+        ordered = prop.kind == "literal" and prop.datatype in ORDERED_DATATYPES
+        operators = ORDER_OPERATORS if ordered else EQUALITY_OPERATORS
+        return f"{name}{rng.choice(operators)}{self.value(prop, rng, used)}"
+
+    def value(self, prop: PropertyPlan, rng: random.Random, used: set[str]) -> str:
+        """A value of the property's value type in the syntax of the where grammar."""
+        if prop.kind != "literal":
+            return f"<{self.corpus.link(prop, rng)}>"
+        if prop.datatype == XSD.boolean:
+            return rng.choice(("true", "false"))
+        lexical = LEXICAL_FORMS.get(prop.datatype, _words)(rng)
+        if prop.datatype in NUMERIC_DATATYPES:
+            return lexical
+        string = '"' + lexical.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        if prop.datatype in LANGUAGE_DATATYPES:
+            return f"{string}@{rng.choice(('en', 'de', 'en-GB'))}"
+        if prop.datatype in PLAIN_DATATYPES or prop.datatype not in self.names:
+            return string
+        return f"{string}^^{self.name(prop.datatype, used)}"
+
+    # --- oslc.select ---
+
+    def select(self, plan: ResourcePlan, depth: int, rng: random.Random, used: set[str], stats: dict) -> str:
+        props = self.named[id(plan)]
+        items = ["*"] if not props or rng.random() < WILDCARD_RATIO else []
+        chosen = rng.sample(props, rng.randint(1, min(self.max_terms, len(props)))) if props else []
+        for prop in chosen:
+            name = self.name(prop.predicate, used)
+            scoped = self.scoped_plan(prop, depth, lambda plan, depth: self.named[id(plan)])
+            if scoped is not None and rng.random() < SCOPE_RATIO:
+                items.append(f"{name}{{{self.select(scoped, depth + 1, rng, used, stats)}}}")
+            else:
+                items.append(name)
+        if depth == 0:
+            stats["t"] = len(items)
+        stats["d"] = max(stats["d"], depth)
+        return ",".join(items)
+
+    # --- oslc.orderBy ---
+
+    def sortable(self, plan: ResourcePlan, depth: int) -> list[PropertyPlan]:
+        """Single-valued literal properties, and references and inline resources with something sortable below."""
+        key = (id(plan), depth)
+        props = self.sortable_cache.get(key)
+        if props is None:
+            props = self.sortable_cache[key] = [
+                prop
+                for prop in self.named[id(plan)]
+                if (prop.kind == "literal" and prop.maximum == 1)
+                or self.scoped_plan(prop, depth, self.sortable) is not None
+            ]
+        return props
+
+    def order_by(self, plan: ResourcePlan, depth: int, rng: random.Random, used: set[str], stats: dict) -> str:
+        props = self.sortable(plan, depth)
+        chosen = rng.sample(props, rng.randint(1, min(self.max_terms, len(props))))
+        if depth == 0:
+            stats["t"] = len(chosen)
+        stats["d"] = max(stats["d"], depth)
+        keys = []
+        for prop in chosen:
+            name = self.name(prop.predicate, used)
+            if prop.kind == "literal" and prop.maximum == 1:
+                keys.append(f"{rng.choice('+-')}{name}")
+            else:
+                scoped = self.scoped_plan(prop, depth, self.sortable)
+                keys.append(f"{name}{{{self.order_by(scoped, depth + 1, rng, used, stats)}}}")
+        return ",".join(keys)
+
+    # --- Names ---
+
+    def scoped_plan(self, prop: PropertyPlan, depth: int, usable) -> ResourcePlan | None:
+        """The plan of the property's range, if a scoped term one level down has properties ``usable`` gives."""
+        if prop.kind == "literal" or depth >= self.max_depth:
+            return None
+        plan = self.corpus.inline_plans.get(prop.range)
+        if plan is None or not usable(plan, depth + 1):
+            return None
+        return plan
+
+    def name(self, iri: str, used: set[str]) -> str:
+        """The prefixed name of ``iri``, which must have one; records its prefix in ``used``."""
+        prefix, name = self.names[iri]
+        used.add(prefix)
+        return name
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,523 @@
+#!/usr/bin/env -S uv run --script
+
+# /// script
+# dependencies = ["rdflib==7.*"]
+# ///
+
+"""Paged OSLC query results from resource shapes, as fixture files or served by a local stand-in provider.
+
+Examples:
+    # 100k ChangeManagement results in RDF/XML pages of 200 resources
+    OSLC4Net_SDK/scripts/oslc_query_pages.py write \\
+        OSLC4Net_SDK/OSLC4Net.Domains.ChangeManagement/Resources/shapes.nt \\
+        --count 100000 --page-size 200 --output-dir pages
+
+    # The same results from http://127.0.0.1:8080/query, with 20 ms latency and gzip
+    OSLC4Net_SDK/scripts/oslc_query_pages.py serve \\
+        OSLC4Net_SDK/OSLC4Net.Domains.ChangeManagement/Resources/shapes.nt \\
+        --count 100000 --page-size 200 --latency 20 --compression gzip
+
+Every page is laid out like ``Tests/OSLC4Net.Client.Tests/data/multiResponseQuery.rdf``:
+the query base URI ``<base>query`` lists the resources of the page with
+``rdfs:member``, the page URI is the ``oslc:ResponseInfo`` with ``oslc:totalCount``
+and, except on the last page, ``oslc:nextPage``, and the full description of
+every member follows. Page ``n`` is at
+``<base>query?oslc.paging=true&oslc.pageSize=<size>&page=<n>``.
+
+The resources come from ``oslc_corpus_gen.py`` and take the same options, so a
+seed gives the same resources there, in the fixture files and from the server.
+
+The server speaks HTTP/1.1 with keep-alive on ``asyncio`` streams. It serves
+``GET <base>query`` with any query parameters (only ``oslc.pageSize`` and
+``page`` are read) and every member at its own URI, and stands in for the rest
+of a provider for ``oslc_load_driver.py``: ``<base>catalog`` lists the service
+provider ``<base>provider``, whose query capability is ``<base>query`` and
+whose creation factory is ``<base>resources/``. POSTs to the creation factory
+are answered ``201 Created`` with a new URI and PUTs to a member with ``204 No
+Content``; neither changes what is served. The content type is
+negotiated from ``Accept`` (RDF/XML, Turtle, JSON-LD or N-Triples, else
+``--format``), and bodies are compressed with ``--compression`` when the client
+accepts it. Rendered pages are kept in an LRU cache of ``--cache-pages``
+entries. Press Ctrl+C to stop; the server then reports how many requests it
+served on how many connections.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import contextlib
+import gzip
+import io
+import math
+import random
+import socket
+import sys
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from codegen_timings import DISABLED, Timings, add_timing_arguments, timings_from_args
+from oslc_corpus_gen import (
+    WRITERS,
+    Corpus,
+    Resource,
+    Writer,
+    add_corpus_arguments,
+    check_corpus_arguments,
+    corpus_from_args,
+    open_output,
+)
+from rdf_index import DCTERMS, IRI, RDF_TYPE, RDFS, XSD, BNode, Literal
+from shape_model import OSLC
+
+QUERY_PATH = "query"
+RESOURCE_PATH = "resources/"
+CATALOG_PATH = "catalog"
+PROVIDER_PATH = "provider"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+EXTENSIONS = {"rdfxml": ".rdf", "ttl": ".ttl", "jsonld": ".jsonld", "nt": ".nt"}
+MEDIA_TYPES = {
+    "rdfxml": "application/rdf+xml",
+    "ttl": "text/turtle",
+    "jsonld": "application/ld+json",
+    "nt": "application/n-triples",
+}
+FORMATS_BY_MEDIA_TYPE = {media_type: name for name, media_type in MEDIA_TYPES.items()}
+COMPRESSORS = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+    "deflate": zlib.compress,
+}
+# Everything a page adds to the corpus vocabulary
+PAGE_VOCABULARY = [RDF_TYPE, RDFS.member, DCTERMS.title, OSLC.ResponseInfo, OSLC.totalCount, OSLC.nextPage]
+# and what the catalog and service provider add
+SERVICE_VOCABULARY = [
+    OSLC.ServiceProviderCatalog, OSLC.serviceProvider, OSLC.ServiceProvider, OSLC.service, OSLC.Service,
+    OSLC.queryCapability, OSLC.QueryCapability, OSLC.queryBase, OSLC.creationFactory, OSLC.CreationFactory,
+    OSLC.creation, OSLC.resourceType,
+]
+MAX_HEADER_LINES = 100
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 411: "Length Required",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Write paged OSLC query results generated from resource shapes, or serve them over HTTP."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    write_parser = commands.add_parser("write", help="Write every page to a file.")
+    add_page_arguments(write_parser)
+    write_parser.add_argument("-o", "--output-dir", type=Path, required=True, help="Directory for the page files.")
+    write_parser.add_argument(
+        "--base-uri",
+        default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/",
+        help=f"URI the pages and resources are under (default: http://{DEFAULT_HOST}:{DEFAULT_PORT}/).",
+    )
+    add_timing_arguments(write_parser)
+
+    serve_parser = commands.add_parser("serve", help="Serve the pages from a local HTTP stand-in provider.")
+    add_page_arguments(serve_parser)
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to listen on (default: {DEFAULT_HOST}).")
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on; 0 picks a free one (default: {DEFAULT_PORT}).",
+    )
+    serve_parser.add_argument(
+        "--latency", type=float, default=0.0, metavar="MS", help="Delay before every response (default: 0)."
+    )
+    serve_parser.add_argument(
+        "--jitter", type=float, default=0.0, metavar="MS", help="Random extra delay of up to MS (default: 0)."
+    )
+    serve_parser.add_argument(
+        "--compression",
+        choices=("none", *COMPRESSORS),
+        default="none",
+        help="Compress response bodies for clients that accept it (default: none).",
+    )
+    serve_parser.add_argument(
+        "--cache-pages",
+        type=int,
+        default=64,
+        metavar="N",
+        help="Number of rendered responses to keep (default: 64).",
+    )
+
+    args = parser.parse_args()
+    check_corpus_arguments(parser, args)
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+
+    if args.command == "write":
+        with timings_from_args(args, "oslc_query_pages") as timings:
+            write_pages(args, timings)
+    else:
+        serve(args)
+
+
+def add_page_arguments(parser: argparse.ArgumentParser) -> None:
+    add_corpus_arguments(parser)
+    parser.add_argument(
+        "--page-size", type=int, default=100, metavar="N", help="Resources per page (default: 100)."
+    )
+    parser.add_argument(
+        "--format",
+        choices=tuple(WRITERS),
+        default="rdfxml",
+        help="Format of the page files, and the default content type of the server (default: rdfxml).",
+    )
+
+
+def page_count(count: int, page_size: int) -> int:
+    # An empty result is still one page that says so
+    return max(1, math.ceil(count / page_size))
+
+
+def page_uri(base_uri: str, page_size: int, page: int) -> str:
+    return f"{base_uri}{QUERY_PATH}?oslc.paging=true&oslc.pageSize={page_size}&page={page}"
+
+
+def page_resources(
+    corpus: Corpus, seed: int, page: int, page_size: int, *, base_uri: str, uri: str | None = None
+) -> Iterator[Resource]:
+    """
+    The query base resource with the members of page ``page`` (1-based), the
+    page's ResponseInfo (at ``uri``, by default the canonical page URI) and the
+    members themselves.
+    """
+    start = (page - 1) * page_size
+    stop = min(start + page_size, corpus.count)
+    members: list = [corpus.resource_uri(index) for index in range(start, stop)]
+    if members:
+        yield Resource(IRI(f"{base_uri}{QUERY_PATH}"), None, [(RDFS.member, members)])
+    info: list = [
+        (DCTERMS.title, [Literal("Query results")]),
+        (OSLC.totalCount, [Literal(str(corpus.count), XSD.integer)]),
+    ]
+    if page < page_count(corpus.count, page_size):
+        info.append((OSLC.nextPage, [IRI(page_uri(base_uri, page_size, page + 1))]))
+    yield Resource(IRI(uri or page_uri(base_uri, page_size, page)), OSLC.ResponseInfo, info)
+    yield from corpus.resources(seed, start, stop)
+
+
+def catalog_resource(base_uri: str) -> Resource:
+    return Resource(
+        IRI(f"{base_uri}{CATALOG_PATH}"),
+        OSLC.ServiceProviderCatalog,
+        [(DCTERMS.title, [Literal("Stand-in catalog")]), (OSLC.serviceProvider, [IRI(f"{base_uri}{PROVIDER_PATH}")])],
+    )
+
+
+def provider_resource(corpus: Corpus, base_uri: str) -> Resource:
+    """A service provider with the query capability and creation factory of the corpus resources."""
+    types: list = list(dict.fromkeys(plan.type for plan in corpus.plans))
+    query = Resource(
+        BNode("query"),
+        OSLC.QueryCapability,
+        [
+            (DCTERMS.title, [Literal("Query")]),
+            (OSLC.queryBase, [IRI(f"{base_uri}{QUERY_PATH}")]),
+            (OSLC.resourceType, types),
+        ],
+    )
+    creation = Resource(
+        BNode("creation"),
+        OSLC.CreationFactory,
+        [
+            (DCTERMS.title, [Literal("Creation")]),
+            (OSLC.creation, [IRI(f"{base_uri}{RESOURCE_PATH}")]),
+            (OSLC.resourceType, types),
+        ],
+    )
+    service = Resource(
+        BNode("service"), OSLC.Service, [(OSLC.queryCapability, [query]), (OSLC.creationFactory, [creation])]
+    )
+    return Resource(
+        IRI(f"{base_uri}{PROVIDER_PATH}"),
+        OSLC.ServiceProvider,
+        [(DCTERMS.title, [Literal("Stand-in service provider")]), (OSLC.service, [service])],
+    )
+
+
+def write_document(writer: Writer, resources: Iterator[Resource]) -> None:
+    writer.begin()
+    for resource in resources:
+        writer.write(resource)
+    writer.end()
+
+
+def write_pages(args: argparse.Namespace, timings: Timings) -> None:
+    corpus = corpus_from_args(args, args.base_uri + RESOURCE_PATH, timings)
+    vocabulary = sorted({*corpus.vocabulary(), *PAGE_VOCABULARY})
+    pages = page_count(corpus.count, args.page_size)
+    width = len(str(pages))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    triples = 0
+    with timings.phase("write"):
+        for page in range(1, pages + 1):
+            path = args.output_dir / f"page-{page:0{width}}{EXTENSIONS[args.format]}"
+            with open_output(path) as output:
+                writer = WRITERS[args.format](output, vocabulary)
+                write_document(writer, page_resources(corpus, args.seed, page, args.page_size, base_uri=args.base_uri))
+            triples += writer.triples
+    timings.count("pages", pages)
+    timings.count("resources", corpus.count)
+    timings.count("triples", triples)
+    print(f"Wrote {pages} pages of {corpus.count} resources to {args.output_dir}")
+
+
+# --- Stand-in provider ---
+
+
+def serve(args: argparse.Namespace) -> None:
+    # Bind first, so that the resource URIs can use the actual port when --port is 0
+    server_socket = socket.create_server((args.host, args.port), reuse_port=False)
+    host, port = server_socket.getsockname()[:2]
+    base_uri = f"http://{host}:{port}/"
+    with contextlib.closing(server_socket):
+        corpus = corpus_from_args(args, base_uri + RESOURCE_PATH, DISABLED)
+        provider = StandInProvider(corpus, args)
+        print(
+            f"Serving {corpus.count} resources in {page_count(corpus.count, args.page_size)} pages "
+            f"at {base_uri}{QUERY_PATH}; press Ctrl+C to stop.",
+            flush=True,
+        )
+        try:
+            asyncio.run(provider.run(server_socket))
+        except KeyboardInterrupt:
+            pass
+    print(provider.summary())
+
+
+class StandInProvider:
+    """Answers OSLC query and resource requests with pages generated from a Corpus."""
+
+    def __init__(self, corpus: Corpus, args: argparse.Namespace):
+        self.corpus = corpus
+        self.seed = args.seed
+        self.page_size = args.page_size
+        self.default_format = args.format
+        self.latency = args.latency / 1000
+        self.jitter = args.jitter / 1000
+        self.compression = args.compression
+        self.cache_size = args.cache_pages
+        self.vocabulary = sorted({*corpus.vocabulary(), *PAGE_VOCABULARY, *SERVICE_VOCABULARY})
+        self.rendered: collections.OrderedDict[tuple, bytes] = collections.OrderedDict()
+        self.jitter_rng = random.Random(args.seed)
+        self.stats: collections.Counter[str] = collections.Counter()
+        self.started = time.perf_counter()
+
+    async def run(self, server_socket: socket.socket) -> None:
+        server = await asyncio.start_server(self.handle, sock=server_socket)
+        async with server:
+            await server.serve_forever()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves the requests of one connection until the client closes it or asks to."""
+        self.stats["connections"] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = await read_headers(reader)
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await send(writer, "HTTP/1.1", 400, {}, b"Malformed request line\n")
+                    break
+                if "transfer-encoding" in headers:
+                    body = b"Send request bodies with Content-Length\n"
+                    await send(writer, version, 411, {"Connection": "close"}, body)
+                    break
+                if "content-length" in headers:
+                    # Request bodies are read and dropped
+                    await reader.readexactly(int(headers["content-length"]))
+
+                status, response_headers, body = await self.respond(method, target, headers)
+                keep_alive = wants_keep_alive(version, headers)
+                if not keep_alive:
+                    response_headers["Connection"] = "close"
+                self.stats["requests"] += 1
+                self.stats["bytes"] += len(body)
+                await send(writer, version, status, response_headers, body, head_only=method == "HEAD")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def respond(self, method: str, target: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.jitter_rng.uniform(0, self.jitter))
+
+        base_uri = f"http://{headers['host']}/" if "host" in headers else self.corpus.base_uri[: -len(RESOURCE_PATH)]
+        url = urlsplit(target)
+        if url.path == f"/{RESOURCE_PATH}":
+            if method != "POST":
+                return 405, {"Allow": "POST"}, b"Only POST is supported\n"
+            # Created resources are not kept, they only get a URI past the corpus
+            index = self.corpus.count + self.stats["created"]
+            self.stats["created"] += 1
+            location = base_uri + urlsplit(self.corpus.resource_uri(index)).path.lstrip("/")
+            return 201, {"Location": location}, b""
+        allowed = ("GET", "HEAD", "PUT") if url.path.startswith(f"/{RESOURCE_PATH}") else ("GET", "HEAD")
+        if method not in allowed:
+            return 405, {"Allow": ", ".join(allowed)}, f"Only {' and '.join(allowed)} are supported\n".encode()
+
+        source_format = negotiate(headers.get("accept", ""), self.default_format)
+        encoding = self.compression if self.compression in accepted_encodings(headers) else None
+        if url.path == f"/{QUERY_PATH}":
+            parameters = parse_qs(url.query)
+            try:
+                page_size = int(parameters.get("oslc.pageSize", [self.page_size])[0])
+                page = int(parameters.get("page", ["1"])[0])
+            except ValueError:
+                return 400, {}, b"oslc.pageSize and page must be integers\n"
+            if page_size < 1 or not 1 <= page <= page_count(self.corpus.count, page_size):
+                return 404, {}, b"No such page\n"
+            key = ("page", base_uri + target.lstrip("/"), page, page_size, source_format, encoding)
+        elif url.path.startswith(f"/{RESOURCE_PATH}"):
+            index = self.resource_index(url.path)
+            if index is None:
+                return 404, {}, b"No such resource\n"
+            if method == "PUT":
+                # Updates are accepted and dropped
+                return 204, {}, b""
+            key = ("resource", index, source_format, encoding)
+        elif url.path in (f"/{CATALOG_PATH}", f"/{PROVIDER_PATH}"):
+            key = (url.path[1:], base_uri, source_format, encoding)
+        else:
+            return 404, {}, b"Not found\n"
+
+        body = self.rendered.get(key)
+        if body is None:
+            body = self.render(key, base_uri)
+            self.stats["rendered"] += 1
+            self.rendered[key] = body
+            if len(self.rendered) > self.cache_size:
+                self.rendered.popitem(last=False)
+        else:
+            self.rendered.move_to_end(key)
+        response_headers = {
+            "Content-Type": f"{MEDIA_TYPES[source_format]}; charset=utf-8",
+            "OSLC-Core-Version": "2.0",
+            "Vary": "Accept, Accept-Encoding",
+        }
+        if encoding is not None:
+            response_headers["Content-Encoding"] = encoding
+        return 200, response_headers, body
+
+    def resource_index(self, path: str) -> int | None:
+        """Index of the corpus resource at ``path``, if there is one."""
+        try:
+            index = int(path.rsplit("/", 1)[1])
+        except ValueError:
+            return None
+        if not 0 <= index < self.corpus.count or urlsplit(self.corpus.resource_uri(index)).path != path:
+            return None
+        return index
+
+    def render(self, key: tuple, base_uri: str) -> bytes:
+        *_, source_format, encoding = key
+        if key[0] == "page":
+            _, uri, page, page_size, *_ = key
+            resources = page_resources(self.corpus, self.seed, page, page_size, base_uri=base_uri, uri=uri)
+        elif key[0] == CATALOG_PATH:
+            resources = iter([catalog_resource(base_uri)])
+        elif key[0] == PROVIDER_PATH:
+            resources = iter([provider_resource(self.corpus, base_uri)])
+        else:
+            resources = self.corpus.resources(self.seed, key[1], key[1] + 1)
+        output = io.StringIO()
+        write_document(WRITERS[source_format](output, self.vocabulary), resources)
+        body = output.getvalue().encode("utf-8")
+        return COMPRESSORS[encoding](body) if encoding is not None else body
+
+    def summary(self) -> str:
+        requests, connections = self.stats["requests"], self.stats["connections"]
+        elapsed = time.perf_counter() - self.started
+        return (
+            f"Served {requests} requests on {connections} connections "
+            f"({requests / connections if connections else 0:.1f} per connection), "
+            f"{self.stats['bytes']} body bytes, {self.stats['rendered']} responses rendered, in {elapsed:.1f} s."
+        )
+
+
+async def read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    raise ValueError("too many header lines")
+
+
+async def send(
+    writer: asyncio.StreamWriter,
+    version: str,
+    status: int,
+    headers: dict[str, str],
+    body: bytes,
+    *,
+    head_only: bool = False,
+) -> None:
+    reason = REASONS[status]
+    head = f"{version if version.startswith('HTTP/1.') else 'HTTP/1.1'} {status} {reason}\r\n"
+    if status >= 400:
+        headers.setdefault("Content-Type", "text/plain; charset=utf-8")
+    if status != 204:
+        headers["Content-Length"] = str(len(body))
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    writer.write(head.encode("latin-1") + (b"" if head_only else body))
+    await writer.drain()
+
+
+def wants_keep_alive(version: str, headers: dict[str, str]) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def negotiate(accept: str, default: str) -> str:
+    """The first supported format in ``accept`` by quality, else ``default``."""
+    ranges = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, *parameters = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                with contextlib.suppress(ValueError):
+                    quality = float(value)
+        ranges.append((-quality, position, media_type.lower()))
+    for quality, _, media_type in sorted(ranges):
+        if quality < 0 and media_type in FORMATS_BY_MEDIA_TYPE:
+            return FORMATS_BY_MEDIA_TYPE[media_type]
+    return default
+
+
+def accepted_encodings(headers: dict[str, str]) -> set[str]:
+    return {item.split(";")[0].strip().lower() for item in headers.get("accept-encoding", "").split(",")}
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -0,0 +1,729 @@
+#!/usr/bin/env -S uv run --script
+
+# /// script
+# requires-python = ">=3.11"
+# dependencies = ["rdflib==7.*"]
+# ///
+
+"""Report what changed between two versions of a domain's resource shapes and vocabulary.
+
+Examples:
+    # The KerML shapes and vocabulary of a new revision against the pinned one
+    OSLC4Net_SDK/scripts/oslc_shape_diff.py kerml-20250201/shapes.nt kerml-new/shapes.nt \\
+        --old-vocab kerml-20250201/vocab.nt --new-vocab kerml-new/vocab.nt \\
+        --rename https://www.omg.org/spec/kerml/20250201/=https://www.omg.org/spec/kerml/20250701/
+
+    # The same as JSON, then render only the classes that it lists
+    OSLC4Net_SDK/scripts/oslc_shape_diff.py kerml-20250201/shapes.nt kerml-new/shapes.nt \\
+        --rename https://www.omg.org/spec/kerml/20250201/=https://www.omg.org/spec/kerml/20250701/ \\
+        --format json -o kerml.diff.json
+    OSLC4Net_SDK/scripts/oslc_shapes_gen.py kerml-new/shapes.nt -o Generated --only-diff kerml.diff.json
+
+Both versions are canonicalized before they are compared:
+
+* ``--rename OLD=NEW`` rewrites the IRIs of the old version that start with
+  ``OLD`` (split at the first ``=``), so that shapes in a namespace carrying
+  the revision, such as ``https://www.omg.org/spec/kerml/20250201/shapes#``,
+  line up with the new ones.
+* Blank nodes are labelled with a digest of their canonical triples, so
+  property nodes that a new publication relabels compare equal.
+* Literals are compared by value: booleans and integers in canonical lexical
+  form, plain literals the same as ``xsd:string`` ones, language tags in lower
+  case.
+
+Each version is then reduced to sets of (predicate, object) facts: one per
+shape for its own triples, one per shape and property for the node the shape
+links with ``oslc:property``, keyed by its ``oslc:propertyDefinition``, and
+one per vocabulary term. Set differences give the shapes, properties and terms
+that were added or removed, and for those in both versions, the aspects
+(occurs, value type, range, ...) whose values differ. The order of triples and
+of ``oslc:property`` links is not compared.
+
+Under ``regenerate``, the JSON report lists the shapes that
+``oslc_shapes_gen.py`` renders differently: added shapes, and shapes with
+changes to the predicates it reads (``SHAPE_PREDICATES``). Shapes whose only
+difference is that ``--rename`` mapped IRIs the generated code contains are
+reported as ``relabelled`` and regenerated too. The report also lists the
+classes of removed shapes, and whether the vocabulary class of
+``vocab_gen.py`` changes because terms were added, removed or retyped.
+``oslc_shapes_gen.py --only-diff`` takes the report and renders just those
+shapes. It checks first that the shapes file is the report's new version.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sys
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import TextIO
+
+from codegen_timings import Timings, add_timing_arguments, timings_from_args
+from oslc_corpus_gen import open_output, prefixed_names
+from oslc_query_corpus_gen import query_prefixes
+from oslc_shapes_gen import SHAPE_DIFF_FORMAT, SHAPE_DIFF_VERSION, shape_class_name
+from rdf_index import (
+    DCTERMS,
+    INTEGER_DATATYPES,
+    IRI,
+    RDF_TYPE,
+    RDFS,
+    VANN,
+    XSD,
+    XSD_BOOLEAN,
+    BNode,
+    Literal,
+    RdfSyntaxError,
+    Term,
+    TripleIndex,
+    add_cache_arguments,
+    cache_from_args,
+    load_index,
+)
+from shape_model import OSLC, SHAPE_PREDICATES
+
+# Predicates reported under a short aspect name, in report order; others keep their IRI
+ASPECTS = {
+    RDF_TYPE: "type",
+    OSLC.name: "name",
+    OSLC.describes: "describes",
+    OSLC.occurs: "occurs",
+    OSLC.valueType: "value_type",
+    OSLC.range: "range",
+    OSLC.representation: "representation",
+    OSLC.readOnly: "read_only",
+    DCTERMS.title: "title",
+    DCTERMS.description: "description",
+    RDFS.label: "label",
+    RDFS.comment: "comment",
+}
+_ASPECT_ORDER = {predicate: position for position, predicate in enumerate(ASPECTS)}
+
+# Changes to these make oslc_shapes_gen.py render a shape differently
+GENERATED_PREDICATES = frozenset(SHAPE_PREDICATES)
+# Changes to these make vocab_gen.py write the vocabulary class differently
+VOCABULARY_PREDICATES = frozenset((RDF_TYPE,))
+
+# Looked up in loops; Namespace attributes are built on every access
+OSLC_PROPERTY = OSLC.property
+OSLC_PROPERTY_DEFINITION = OSLC.propertyDefinition
+OSLC_NAME = OSLC.name
+XSD_STRING = XSD.string
+
+STATUSES = ("added", "removed", "changed")
+SHAPE_STATUSES = (*STATUSES, "relabelled")
+STATUS_MARKS = {"added": "+", "removed": "-", "changed": "~", "relabelled": "="}
+# Longest literal shown in the text report
+MAX_SHOWN_LENGTH = 72
+
+_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+_ESCAPED = re.compile(r"\\(.)")
+_UNESCAPES = {"n": "\n", "r": "\r"}
+
+Facts = frozenset[tuple[str, str]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare two versions of a domain's resource shapes and vocabulary as sets of canonical triples."
+    )
+    parser.add_argument("old", type=Path, help="Shapes file of the old version. Format is inferred from the extension.")
+    parser.add_argument("new", type=Path, help="Shapes file of the new version.")
+    parser.add_argument("--old-vocab", type=Path, help="Vocabulary file of the old version; needs --new-vocab.")
+    parser.add_argument("--new-vocab", type=Path, help="Vocabulary file of the new version; needs --old-vocab.")
+    parser.add_argument(
+        "--rename",
+        action="append",
+        default=[],
+        metavar="OLD=NEW",
+        help="Rewrite IRIs of the old version that start with OLD to start with NEW; may be repeated "
+        "(the longest matching OLD wins).",
+    )
+    parser.add_argument(
+        "--format", choices=("text", "json"), default="text", help="Report format (default: text)."
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Output file. Defaults to stdout.")
+    parser.add_argument(
+        "--exit-code", action="store_true", help="Exit with status 1 if the versions differ, as diff does."
+    )
+    add_cache_arguments(parser)
+    add_timing_arguments(parser)
+    args = parser.parse_args()
+
+    if (args.old_vocab is None) != (args.new_vocab is None):
+        parser.error("--old-vocab and --new-vocab must be given together")
+    renames = []
+    for rename in args.rename:
+        old, separator, new = rename.partition("=")
+        if not separator or not old:
+            parser.error(f"--rename expects OLD=NEW, got {rename!r}")
+        renames.append((old, new))
+    args.rename = renames
+
+    with timings_from_args(args, "oslc_shape_diff") as timings:
+        differ = compare(args, timings)
+    if args.exit_code and differ:
+        sys.exit(1)
+
+
+def compare(args: argparse.Namespace, timings: Timings) -> bool:
+    """Write the report of ``args``; returns whether the versions differ."""
+    cache = cache_from_args(args)
+    try:
+        with timings.phase("parse"):
+            old_index = load_index([args.old], default_format="turtle", cache=cache)
+            new_index = load_index([args.new], default_format="turtle", cache=cache)
+            vocabularies = None
+            if args.old_vocab is not None:
+                vocabularies = (
+                    load_index([args.old_vocab], default_format="turtle", cache=cache),
+                    load_index([args.new_vocab], default_format="turtle", cache=cache),
+                )
+            digests = [file_sha256(path) for path in (args.old, args.new)]
+    except (OSError, RdfSyntaxError) as error:
+        sys.exit(f"error: {error}")
+    if cache is not None:
+        timings.cache("parse", cache.hits, cache.misses)
+    timings.count("triples", old_index.triples_read + new_index.triples_read)
+
+    with timings.phase("canonicalize"):
+        old_canonical = Canonicalizer(old_index, args.rename)
+        new_canonical = Canonicalizer(new_index)
+        old_shapes = shape_facts(old_index, old_canonical, Canonicalizer(old_index) if args.rename else None)
+        new_shapes = shape_facts(new_index, new_canonical)
+        old_terms = new_terms = {}
+        if vocabularies is not None:
+            old_terms = term_facts(vocabularies[0], Canonicalizer(vocabularies[0], args.rename))
+            new_terms = term_facts(vocabularies[1], Canonicalizer(vocabularies[1]))
+    timings.count("shapes", len(old_shapes) + len(new_shapes))
+    timings.count("terms", len(old_terms) + len(new_terms))
+
+    with timings.phase("compare"):
+        diff = DomainDiff(diff_shapes(old_shapes, new_shapes), diff_terms(old_terms, new_terms))
+        diff.unchanged_shapes = (
+            len(old_shapes.keys() & new_shapes.keys())
+            - diff.count("shapes", "changed")
+            - diff.count("shapes", "relabelled")
+        )
+        diff.unchanged_terms = len(old_terms.keys() & new_terms.keys()) - diff.count("terms", "changed")
+        diff.vocabulary_compared = vocabularies is not None
+
+    with timings.phase("report"), open_output(args.output) as output:
+        if args.format == "json":
+            sources = {
+                "old": {"shapes": str(args.old), "shapes_sha256": digests[0], "vocab": optional_str(args.old_vocab)},
+                "new": {"shapes": str(args.new), "shapes_sha256": digests[1], "vocab": optional_str(args.new_vocab)},
+                "renames": [{"old": old, "new": new} for old, new in args.rename],
+            }
+            json.dump({"format": SHAPE_DIFF_FORMAT, "version": SHAPE_DIFF_VERSION, **sources, **diff.to_json()},
+                      output, indent=2, ensure_ascii=False)
+            output.write("\n")
+        else:
+            preferred = {} if vocabularies is None else preferred_prefixes(vocabularies[1])
+            write_text(output, diff, args, preferred)
+    return bool(diff.shapes or diff.terms)
+
+
+class Canonicalizer:
+    """Canonical N-Triples text of the terms of one version.
+
+    IRIs are rewritten by ``renames``, longest prefix first. Literals get their
+    canonical lexical form, and blank nodes a label derived from their own
+    canonical triples, so the same content reads the same in both versions.
+    """
+
+    __slots__ = ("index", "renames", "_iris", "_blank_nodes", "_facts")
+
+    def __init__(self, index: TripleIndex, renames: Sequence[tuple[str, str]] = ()):
+        self.index = index
+        self.renames = sorted(renames, key=lambda rename: len(rename[0]), reverse=True)
+        self._iris: dict[str, str] = {}
+        self._blank_nodes: dict[str, str] = {}
+        self._facts: dict[tuple[Term, str | None], Facts] = {}
+
+    def iri(self, value: str) -> str:
+        """``value`` after renaming, without angle brackets."""
+        renamed = self._iris.get(value)
+        if renamed is None:
+            renamed = value
+            for old, new in self.renames:
+                if value.startswith(old):
+                    renamed = new + value[len(old) :]
+                    break
+            self._iris[value] = renamed
+        return renamed
+
+    def term(self, value: Term) -> str:
+        if isinstance(value, IRI):
+            return f"<{self.iri(value)}>"
+        if isinstance(value, BNode):
+            return self.blank_node(value)
+        return self.literal(value)
+
+    def literal(self, value: Literal) -> str:
+        lexical = value.lexical
+        if value.language:
+            return f'"{lexical.translate(_ESCAPES)}"@{value.language.lower()}'
+        datatype = value.datatype
+        if datatype is None or datatype == XSD_STRING:
+            return f'"{lexical.translate(_ESCAPES)}"'
+        if datatype == XSD_BOOLEAN:
+            lexical = "true" if lexical.strip().lower() in ("1", "true") else "false"
+        elif datatype in INTEGER_DATATYPES:
+            with contextlib.suppress(ValueError):
+                lexical = str(int(lexical))
+        return f'"{lexical.translate(_ESCAPES)}"^^<{self.iri(datatype)}>'
+
+    def blank_node(self, node: BNode) -> str:
+        label = self._blank_nodes.get(node)
+        if label is None:
+            # Blank nodes on a cycle see this placeholder for the node being labelled
+            self._blank_nodes[node] = "_:cycle"
+            digest = hashlib.sha256("\n".join(sorted(f"{p} {o}" for p, o in self.facts(node))).encode())
+            label = self._blank_nodes[node] = f"_:b{digest.hexdigest()[:32]}"
+        return label
+
+    def facts(self, subject: Term, skip: str | None = None) -> Facts:
+        """Canonical (predicate, object) pairs of ``subject``, without ``skip``; predicates are bare IRIs."""
+        facts = self._facts.get((subject, skip))
+        if facts is None:
+            facts = self._facts[subject, skip] = frozenset(
+                (self.iri(p), self.term(o)) for p, o in self.index.predicate_objects(subject) if p != skip
+            )
+        return facts
+
+
+class ShapeFacts:
+    """The canonical facts of one shape: its own triples, and those of each property node by property key.
+
+    ``source_iri`` is the shape's IRI before renaming. ``generated`` holds what
+    oslc_shapes_gen.py renders the shape from, without renames: the shape IRI,
+    the values of the predicates it reads, and which property nodes are IRIs.
+    """
+
+    __slots__ = ("iri", "source_iri", "facts", "properties", "generated")
+
+    def __init__(
+        self, iri: str, source_iri: str, facts: Facts, properties: dict[str, Facts], generated: frozenset[tuple]
+    ):
+        self.iri = iri
+        self.source_iri = source_iri
+        self.facts = facts
+        self.properties = properties
+        self.generated = generated
+
+
+def shape_facts(
+    index: TripleIndex, canonical: Canonicalizer, plain: Canonicalizer | None = None
+) -> dict[str, ShapeFacts]:
+    """The ``oslc:ResourceShape`` subjects of ``index`` with an IRI, by canonical IRI.
+
+    ``plain`` is a ``Canonicalizer`` of the same index without renames, for
+    ``ShapeFacts.generated``; ``canonical`` itself if it has none.
+    """
+    plain = plain or canonical
+    by_node: dict[Term, tuple[str, Facts]] = {}  # shapes share property nodes
+    generated_by_node: dict[Term, tuple] = {}
+    shapes = {}
+    for node in index.subjects(RDF_TYPE, OSLC.ResourceShape):
+        if not isinstance(node, IRI):
+            continue  # oslc_shapes_gen.py skips these too
+        properties: dict[str, Facts] = {}
+        generated: list[tuple] = [("shape", str(node))]
+        for property_node in index.objects(node, OSLC_PROPERTY):
+            known = by_node.get(property_node)
+            if known is None:
+                facts = canonical.facts(property_node)
+                known = by_node[property_node] = (property_key(facts) or bare(canonical.term(property_node)), facts)
+            key, facts = known
+            base, duplicate = key, 2
+            while key in properties:
+                key, duplicate = f"{base} #{duplicate}", duplicate + 1
+            properties[key] = facts
+            link = generated_by_node.get(property_node)
+            if link is None:
+                # oslc_shapes_gen.py renders the properties of IRI nodes and skips blank ones
+                link = ("property", "_:")
+                if isinstance(property_node, IRI):
+                    read = frozenset(fact for fact in plain.facts(property_node) if fact[0] in GENERATED_PREDICATES)
+                    link = ("property", str(property_node), read)
+                generated_by_node[property_node] = link
+            generated.append(link)
+        own = canonical.facts(node, skip=OSLC_PROPERTY)
+        plain_own = own if plain is canonical else plain.facts(node, skip=OSLC_PROPERTY)
+        generated.extend(fact for fact in plain_own if fact[0] in GENERATED_PREDICATES)
+        iri = canonical.iri(node)
+        shapes[iri] = ShapeFacts(iri, str(node), own, properties, frozenset(generated))
+    return shapes
+
+
+def property_key(facts: Facts) -> str | None:
+    """The ``oslc:propertyDefinition`` IRI of a property node, else its ``oslc:name``, if it has either."""
+    definitions = sorted(value for predicate, value in facts if predicate == OSLC_PROPERTY_DEFINITION)
+    if definitions:
+        return bare(definitions[0])
+    names = sorted(value for predicate, value in facts if predicate == OSLC_NAME)
+    if names:
+        return f"name {names[0]}"
+    return None
+
+
+def term_facts(index: TripleIndex, canonical: Canonicalizer) -> dict[str, Facts]:
+    """The IRI subjects of a vocabulary, by canonical IRI; blank nodes are part of the terms that use them."""
+    subjects = dict.fromkeys(subject for subject, _, _ in index if isinstance(subject, IRI))
+    return {canonical.iri(subject): canonical.facts(subject) for subject in subjects}
+
+
+class Change:
+    """The values one predicate has in the old and the new version, where they differ."""
+
+    __slots__ = ("predicate", "old", "new")
+
+    def __init__(self, predicate: str, old: list[str], new: list[str]):
+        self.predicate = predicate
+        self.old = old
+        self.new = new
+
+    @property
+    def aspect(self) -> str:
+        return ASPECTS.get(self.predicate, self.predicate)
+
+    def to_json(self) -> dict:
+        return {"aspect": self.aspect, "predicate": self.predicate, "old": self.old, "new": self.new}
+
+
+def changes(old: Facts, new: Facts) -> list[Change]:
+    """One ``Change`` per predicate with values in one of the fact sets but not in the other."""
+    if old == new:
+        return []
+    differing = sorted(
+        {predicate for predicate, _ in old ^ new}, key=lambda p: (_ASPECT_ORDER.get(p, len(ASPECTS)), p)
+    )
+    return [
+        Change(
+            predicate,
+            sorted(value for p, value in old if p == predicate),
+            sorted(value for p, value in new if p == predicate),
+        )
+        for predicate in differing
+    ]
+
+
+class PropertyDiff:
+    """A property a shape gained, lost or constrains differently."""
+
+    __slots__ = ("key", "name", "status", "changes")
+
+    def __init__(self, key: str, name: str | None, status: str, changes: list[Change]):
+        self.key = key
+        self.name = name
+        self.status = status
+        self.changes = changes
+
+    def to_json(self) -> dict:
+        return {
+            "key": self.key,
+            "name": self.name,
+            "status": self.status,
+            "changes": [change.to_json() for change in self.changes],
+        }
+
+
+class ShapeDiff:
+    """A shape that was added, removed, changed or relabelled, and whether its generated class changes.
+
+    Relabelled shapes have the same canonical facts in both versions, but IRIs
+    that oslc_shapes_gen.py writes out were renamed, or property nodes changed
+    between IRIs and blank nodes.
+    """
+
+    __slots__ = ("iri", "old_iri", "class_name", "status", "changes", "properties", "regenerate")
+
+    def __init__(
+        self,
+        iri: str,
+        old_iri: str | None,
+        status: str,
+        changes: list[Change],
+        properties: list[PropertyDiff],
+        regenerate: bool,
+    ):
+        self.iri = iri
+        self.old_iri = old_iri
+        # Removed shapes keep the class name their old IRI was generated under
+        self.class_name = shape_class_name(old_iri if status == "removed" else iri)
+        self.status = status
+        self.changes = changes
+        self.properties = properties
+        self.regenerate = regenerate
+
+    def to_json(self) -> dict:
+        return {
+            "iri": self.iri,
+            "old_iri": self.old_iri,
+            "class": self.class_name,
+            "status": self.status,
+            "regenerate": self.regenerate,
+            "changes": [change.to_json() for change in self.changes],
+            "properties": [prop.to_json() for prop in self.properties],
+        }
+
+
+class TermDiff:
+    """A vocabulary term that was added, removed or changed."""
+
+    __slots__ = ("iri", "status", "changes")
+
+    def __init__(self, iri: str, status: str, changes: list[Change]):
+        self.iri = iri
+        self.status = status
+        self.changes = changes
+
+    def to_json(self) -> dict:
+        return {"iri": self.iri, "status": self.status, "changes": [change.to_json() for change in self.changes]}
+
+
+def diff_shapes(old: dict[str, ShapeFacts], new: dict[str, ShapeFacts]) -> list[ShapeDiff]:
+    """The shapes that differ between ``old`` and ``new``, by IRI.
+
+    A shape in both is regenerated if what oslc_shapes_gen.py reads of it
+    differs, so changes to other predicates, such as ``oslc:hidden``, are
+    reported but do not regenerate it.
+    """
+    diffs = []
+    for iri in sorted(old.keys() | new.keys()):
+        before, after = old.get(iri), new.get(iri)
+        if before is None:
+            diffs.append(ShapeDiff(iri, None, "added", [], whole_properties(after, "added"), True))
+        elif after is None:
+            diffs.append(ShapeDiff(iri, before.source_iri, "removed", [], whole_properties(before, "removed"), False))
+        else:
+            properties = diff_properties(before.properties, after.properties)
+            own = changes(before.facts, after.facts)
+            regenerate = before.generated != after.generated
+            if own or properties or regenerate:
+                status = "changed" if own or properties else "relabelled"
+                diffs.append(ShapeDiff(iri, before.source_iri, status, own, properties, regenerate))
+    return diffs
+
+
+def whole_properties(shape: ShapeFacts, status: str) -> list[PropertyDiff]:
+    """The properties of a shape that was added or removed as a whole."""
+    return [PropertyDiff(key, property_name(facts), status, []) for key, facts in sorted(shape.properties.items())]
+
+
+def diff_properties(old: dict[str, Facts], new: dict[str, Facts]) -> list[PropertyDiff]:
+    diffs = []
+    for key in sorted(old.keys() | new.keys()):
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+        if before is None:
+            diffs.append(PropertyDiff(key, property_name(after), "added", []))
+        elif after is None:
+            diffs.append(PropertyDiff(key, property_name(before), "removed", []))
+        else:
+            diffs.append(PropertyDiff(key, property_name(after), "changed", changes(before, after)))
+    return diffs
+
+
+def diff_terms(old: dict[str, Facts], new: dict[str, Facts]) -> list[TermDiff]:
+    diffs = []
+    for iri in sorted(old.keys() | new.keys()):
+        before, after = old.get(iri), new.get(iri)
+        if before == after:
+            continue
+        if before is None:
+            diffs.append(TermDiff(iri, "added", []))
+        elif after is None:
+            diffs.append(TermDiff(iri, "removed", []))
+        else:
+            diffs.append(TermDiff(iri, "changed", changes(before, after)))
+    return diffs
+
+
+def property_name(facts: Facts) -> str | None:
+    names = sorted(value for predicate, value in facts if predicate == OSLC_NAME)
+    return literal_value(names[0]) if names else None
+
+
+class DomainDiff:
+    """The shapes and terms that differ between two versions, and what has to be regenerated."""
+
+    __slots__ = ("shapes", "terms", "unchanged_shapes", "unchanged_terms", "vocabulary_compared")
+
+    def __init__(self, shapes: list[ShapeDiff], terms: list[TermDiff]):
+        self.shapes = shapes
+        self.terms = terms
+        self.unchanged_shapes = 0
+        self.unchanged_terms = 0
+        self.vocabulary_compared = False
+
+    def count(self, kind: str, status: str) -> int:
+        if kind == "properties":
+            # Within changed shapes; the properties of added and removed shapes are not counted
+            return sum(
+                prop.status == status for shape in self.shapes if shape.status == "changed" for prop in shape.properties
+            )
+        return sum(item.status == status for item in getattr(self, kind))
+
+    def regenerate_vocabulary(self) -> bool:
+        return any(
+            term.status != "changed" or any(change.predicate in VOCABULARY_PREDICATES for change in term.changes)
+            for term in self.terms
+        )
+
+    def summary(self) -> dict:
+        summary = {f"shapes_{status}": self.count("shapes", status) for status in SHAPE_STATUSES}
+        summary["shapes_unchanged"] = self.unchanged_shapes
+        summary.update({f"properties_{status}": self.count("properties", status) for status in STATUSES})
+        if self.vocabulary_compared:
+            summary.update({f"terms_{status}": self.count("terms", status) for status in STATUSES})
+            summary["terms_unchanged"] = self.unchanged_terms
+        return summary
+
+    def to_json(self) -> dict:
+        return {
+            "summary": self.summary(),
+            "regenerate": {
+                "shapes": [shape.iri for shape in self.shapes if shape.regenerate],
+                "classes": sorted({shape.class_name for shape in self.shapes if shape.regenerate}),
+                "removed_classes": sorted({shape.class_name for shape in self.shapes if shape.status == "removed"}),
+                "vocabulary": self.regenerate_vocabulary(),
+            },
+            "shapes": [shape.to_json() for shape in self.shapes],
+            "terms": [term.to_json() for term in self.terms] if self.vocabulary_compared else None,
+        }
+
+
+def write_text(output: TextIO, diff: DomainDiff, args: argparse.Namespace, preferred: dict[str, str]) -> None:
+    """Write the readable report: counts, then one block per shape and term, then what to regenerate."""
+    iris = set()
+    for shape in diff.shapes:
+        iris.add(shape.iri)
+        iris.update(prop.key for prop in shape.properties)
+        iris.update(value_iris(shape.changes))
+        for prop in shape.properties:
+            iris.update(value_iris(prop.changes))
+    for term in diff.terms:
+        iris.add(term.iri)
+        iris.update(value_iris(term.changes))
+    prefixes = query_prefixes(sorted(iris), preferred)
+    names = prefixed_names(sorted(iris), prefixes)
+
+    def show(value: str, skip: int = 0) -> str:
+        """``value`` with a prefixed name if it is an IRI, or shortened, from ``skip`` on, if it is a literal."""
+        if value.startswith("<"):
+            return names.get(value[1:-1], value)
+        if not value.startswith('"'):
+            return value  # a blank node
+        end = value.rindex('"')
+        lexical, suffix = value[1:end], value[end + 1 :]
+        if skip > 0:
+            lexical = "…" + lexical[skip:]
+        if len(lexical) > MAX_SHOWN_LENGTH:
+            lexical = lexical[: MAX_SHOWN_LENGTH - 1] + "…"
+        if suffix.startswith("^^"):
+            suffix = "^^" + show(suffix[2:])
+        return f'"{lexical}"{suffix}'
+
+    def show_changes(items: Iterable[Change], indent: str) -> None:
+        for change in items:
+            aspect = ASPECTS.get(change.predicate) or show(f"<{change.predicate}>")
+            skip = 0
+            if len(change.old) == 1 and len(change.new) == 1:
+                # Start long literals shortly before they differ
+                common = len(os.path.commonprefix((change.old[0], change.new[0])))
+                skip = max(0, common - 1 - MAX_SHOWN_LENGTH // 2)
+            old = ", ".join(show(value, skip) for value in change.old) or "(none)"
+            new = ", ".join(show(value, skip) for value in change.new) or "(none)"
+            output.write(f"{indent}{aspect}: {old} -> {new}\n")
+
+    output.write(f"--- {args.old}\n+++ {args.new}\n")
+    for namespace, prefix in sorted(prefixes.items(), key=lambda item: item[1]):
+        output.write(f"@prefix {prefix}: <{namespace}> .\n")
+    summary = diff.summary()
+    output.write("\n")
+    for kind in ("shapes", "properties", "terms"):
+        if f"{kind}_added" in summary:
+            statuses = SHAPE_STATUSES if kind == "shapes" else STATUSES
+            counts = ", ".join(f"{summary[f'{kind}_{status}']} {status}" for status in statuses)
+            unchanged = f", {summary[f'{kind}_unchanged']} unchanged" if f"{kind}_unchanged" in summary else ""
+            output.write(f"{kind.capitalize()}: {counts}{unchanged}\n")
+
+    relabelled = [shape.class_name for shape in diff.shapes if shape.status == "relabelled"]
+    for shape in diff.shapes:
+        if shape.status == "relabelled":
+            continue
+        note = "" if shape.regenerate or shape.status == "removed" else ", generated code unchanged"
+        output.write(f"\n{STATUS_MARKS[shape.status]} shape {show(f'<{shape.iri}>')}")
+        output.write(f" (class {shape.class_name}{note})\n")
+        show_changes(shape.changes, "    ")
+        if shape.status != "changed":
+            output.write(f"    properties: {len(shape.properties)}\n")
+            continue
+        for prop in shape.properties:
+            name = f" ({prop.name})" if prop.name else ""
+            output.write(f"    {STATUS_MARKS[prop.status]} property {names.get(prop.key, prop.key)}{name}\n")
+            show_changes(prop.changes, "        ")
+    if relabelled:
+        output.write(f"\n= {len(relabelled)} shapes only relabelled, classes {', '.join(relabelled)}\n")
+    for term in diff.terms:
+        output.write(f"\n{STATUS_MARKS[term.status]} term {show(f'<{term.iri}>')}\n")
+        show_changes(term.changes, "    ")
+
+    regenerate = diff.to_json()["regenerate"]
+    output.write("\n")
+    for label, classes in (("regenerate", regenerate["classes"]), ("remove", regenerate["removed_classes"])):
+        listed = f" ({', '.join(classes)})" if classes else ""
+        output.write(f"Classes to {label}: {len(classes)}{listed}\n")
+    if diff.vocabulary_compared:
+        output.write(f"Vocabulary class: {'regenerate' if regenerate['vocabulary'] else 'unchanged'}\n")
+
+
+def value_iris(items: Iterable[Change]) -> Iterable[str]:
+    for change in items:
+        yield change.predicate
+        for value in (*change.old, *change.new):
+            if value.startswith("<"):
+                yield value[1:-1]
+            elif value.endswith(">"):
+                yield value[value.rindex("<") + 1 : -1]  # a literal's datatype
+
+
+def preferred_prefixes(vocabulary: TripleIndex) -> dict[str, str]:
+    """The ``vann:preferredNamespacePrefix`` values of a vocabulary, by namespace."""
+    preferred = VANN.preferredNamespacePrefix
+    return {
+        str(namespace): prefix.lexical
+        for namespace, predicate, prefix in vocabulary
+        if predicate == preferred and isinstance(namespace, IRI) and isinstance(prefix, Literal)
+    }
+
+
+def bare(term: str) -> str:
+    """An IRI term without its angle brackets; other terms unchanged."""
+    return term[1:-1] if term.startswith("<") else term
+
+
+def literal_value(term: str) -> str:
+    """The lexical form of a canonical literal."""
+    return _ESCAPED.sub(lambda match: _UNESCAPES.get(match[1], match[1]), term[1 : term.rindex('"')])
+
+
+def optional_str(path: Path | None) -> str | None:
+    return None if path is None else str(path)
+
+
+def file_sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,29 @@
 #!/usr/bin/env -S uv run --script
 
 # /// script
+# requires-python = ">=3.11"
 # dependencies = ["rdflib==7.*", "jinja2", "beautifulsoup4"]
 # ///
 
-import rdflib
 import argparse
+import collections
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
+import json
 import sys
 import os
 import re
-from rdflib import Graph, URIRef, Literal, Namespace
-from rdflib.namespace import RDF, RDFS, DCTERMS, XSD  # Common namespaces
-from jinja2 import Environment, FileSystemLoader, Template # Added Template for inline
-import html # For unescaping HTML entities
-from bs4 import BeautifulSoup # For stripping HTML tags
+import stat
+import time
+from codegen_timings import DISABLED, Timings, add_timing_arguments, timings_from_args
+from codegen_watch import add_watch_arguments, poll_changes
+from rdf_index import IRI, CompactIndexBuilder, RdfSyntaxError, load_compact_index
+from rdf_index import add_cache_arguments, cache_from_args, decode_index, encode_index
+from rdf_index import RDF, XSD  # Common namespaces
+from shape_model import OSLC, SHAPE_PREDICATES, ShapeModel
 
 # --- Try importing the helper function ---
 def to_pascal_case(input_str: str) -> str:
@@ -58,20 +68,29 @@ def to_pascal_case(input_str: str) -> str:
 
     return "".join(pascal_components)
 
+@functools.lru_cache(maxsize=4096)
 def clean_description(raw_text):
     """
     Strips HTML tags, unescapes HTML entities, and replaces newlines with spaces.
+
+    The result is the same as taking BeautifulSoup(raw_text, 'html.parser').get_text(separator=' ')
+    and normalizing it, but BeautifulSoup is only used for markup outside the simple subset that
+    OSLC shapes use. Results are cached because the same descriptions recur across shapes.
     """
     if not raw_text:
         return "" # Return empty string if input is None or empty
 
-    # 1. Use BeautifulSoup to parse HTML and get text content
-    #    'html.parser' is a built-in parser, no extra dependencies needed beyond bs4
-    #    separator=' ' helps put spaces between text blocks from different tags
-    soup = BeautifulSoup(raw_text, 'html.parser')
-    text_content = soup.get_text(separator=' ')
+    # Fast path: plain text has nothing to strip or unescape
+    if "<" not in raw_text and "&" not in raw_text:
+        return ' '.join(raw_text.split())
+
+    # 1. Get the text content, putting a space between text blocks from different tags
+    text_content = get_text_of_simple_html(raw_text)
+    if text_content is None:
+        text_content = get_text_with_beautifulsoup(raw_text)
 
     # 2. Unescape HTML entities (like <, &)
+    import html # Only needed for markup, so plain-text runs skip the import
     text_unescaped = html.unescape(text_content)
 
     # 3. Replace newline characters (and carriage returns) with spaces
@@ -81,107 +100,117 @@ def clean_description(raw_text):
     # 4. Remove potential leading/trailing whitespace
     return cleaned_text.strip()
 
-# --- Define Namespaces ---
-OSLC = Namespace("http://open-services.net/ns/core#")
+
+# Plain start/end tags with quoted attribute values
+_SIMPLE_TAG = re.compile(
+    r"<(/?)([A-Za-z][A-Za-z0-9]*)"
+    r"((?:\s+[A-Za-z_:][-A-Za-z0-9_:.]*(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'))?)*)\s*/?>"
+)
+# Entity and character references that BeautifulSoup decodes exactly like html.unescape
+_SIMPLE_REFERENCE = re.compile(r"&(?:(amp|lt|gt|quot|nbsp);|#([0-9]{1,7});|#[xX]([0-9A-Fa-f]{1,6});)")
+_SIMPLE_ENTITIES = {"amp": "&", "lt": "<", "gt": ">", "quot": '"', "nbsp": "\xa0"}
+# Text inside these is not returned by get_text() or is raw text to html.parser
+_OPAQUE_TAGS = {"script", "style", "template", "textarea", "title", "rp", "rt"}
+
+
+def get_text_of_simple_html(raw_text):
+    """
+    Streams through raw_text and returns the same text as BeautifulSoup's
+    get_text(separator=' ') with 'html.parser', or None if the markup is not plain
+    tags, the basic named entities and numeric references (comments, scripts,
+    unquoted attributes, a stray '<' or '&', ...).
+    """
+    pieces = []
+    position = 0
+    for tag in _SIMPLE_TAG.finditer(raw_text):
+        is_end_tag, name, attributes = tag.groups()
+        if (is_end_tag and attributes) or name.lower() in _OPAQUE_TAGS:
+            return None
+        text = _decode_simple_references(raw_text[position:tag.start()])
+        if text is None:
+            return None
+        if text:
+            pieces.append(text)
+        position = tag.end()
+
+    text = _decode_simple_references(raw_text[position:])
+    if text is None:
+        return None
+    if text:
+        pieces.append(text)
+    return ' '.join(pieces)
+
+
+def _decode_simple_references(text):
+    if "<" in text:
+        return None
+    if "&" not in text:
+        return text
+
+    decoded = []
+    position = 0
+    for reference in _SIMPLE_REFERENCE.finditer(text):
+        if "&" in text[position:reference.start()]:
+            return None
+        name, decimal, hexadecimal = reference.groups()
+        if name:
+            decoded.append(text[position:reference.start()] + _SIMPLE_ENTITIES[name])
+        else:
+            codepoint = int(decimal, 10) if decimal else int(hexadecimal, 16)
+            # BeautifulSoup reads 128-159 as Windows-1252 and html.unescape drops control
+            # characters and noncharacters, so only unambiguous code points are decoded here
+            if not (codepoint in (9, 10, 13) or 32 <= codepoint <= 126 or 160 <= codepoint <= 0xD7FF
+                    or 0xE000 <= codepoint <= 0xFDCF or 0xFDF0 <= codepoint <= 0xFFFD):
+                return None
+            decoded.append(text[position:reference.start()] + chr(codepoint))
+        position = reference.end()
+
+    if "&" in text[position:]:
+        return None
+    decoded.append(text[position:])
+    return "".join(decoded)
+
+
+def get_text_with_beautifulsoup(raw_text):
+    """Reference path for markup that get_text_of_simple_html() does not handle."""
+    # 'html.parser' is a built-in parser, no extra dependencies needed beyond bs4
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(raw_text, 'html.parser')
+    return soup.get_text(separator=' ')
+
+# --- Namespaces ---
+# OSLC and the predicates read from the shapes file (SHAPE_PREDICATES) live in shape_model
 # Add other namespaces used in your shapes file if needed (e.g., OSLC_RM)
 # OSLC_RM = Namespace("http://open-services.net/ns/rm#")
 
 # --- Jinja2 Template for C# Class ---
-# Using an inline template string for simplicity here.
-# You could move this to a separate file (e.g., 'csharp_class.jinja')
-CSHARP_TEMPLATE_STR = """\
-using OSLC4Net.Core.Attribute;
-using OSLC4Net.Core.Model;
-using ValueType = OSLC4Net.Core.Model.ValueType;
-
-namespace {{ csharp_namespace }} // Target C# namespace
-{
-    // Generated from OSLC Shape: {{ shape.uri }}
-    [OslcNamespace(OslcConstants.OSLC_CORE_NAMESPACE)] // Example: Define constants elsewhere
-    [OslcResourceShape(title = "{{ shape.title }}", describes = "{{ shape.describes }}")] // Add attributes from shape if needed
-    public partial record {{ shape.class_name }} : AbstractResource // Or another base class
-    {
-        public {{ shape.class_name }}(Uri about) : base(about) {}
-        public {{ shape.class_name }}() : base() {}
-
-        {% for prop in shape.properties %}
-        {% if prop.description %}
-        [OslcDescription("{{ prop.description | replace('"', '\\"') }}")] // Escape quotes in description
-        {% endif %}
-        {% if prop.occurs %}
-        [OslcOccurs(Occurs.{{ prop.occurs }})]
-        {% endif %}
-        {% if prop.property_definition %}
-        [OslcPropertyDefinition("{{ prop.property_definition }}")]
-        {% endif %}
-        {% if prop.name %}
-        [OslcName("{{ prop.name }}")]
-        {% endif %}
-        {% if prop.value_type_enum %}
-        [OslcValueType(ValueType.{{ prop.value_type_enum }})]
-        {% elif prop.range %}
-        // Range specified: {{ prop.range }} - Consider adding OslcRange attribute if needed
-        {% endif %}
-        {% if prop.representation %}
-        [OslcRepresentation(Representation.{{ prop.representation }})]
-        {% endif %}
-        [OslcReadOnly({{ prop.read_only | lower }})] // Assuming read_only property exists
-        [OslcTitle("{{ prop.title | default(prop.name, true) }}")] // Use prop name as fallback title
-        public {{ prop.csharp_type }} {{ prop.csharp_name }} { get; set; }
-        {% if not loop.last %}
-
-        {% endif %}
-        {% endfor %}
-
-        // Method to add properties dynamically if needed (Example for multi-valued)
-        // public void AddSomeMultiValueProperty(URI value) { ... }
-    }
+# Shapes are rendered with a template file, templates/csharp_class.cs.jinja by
+# default; --template selects another one (e.g. a class instead of a record, or
+# different attributes). Other templates in the same directory can be
+# {% include %}d or {% extends %}ed from it.
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+DEFAULT_TEMPLATE = os.path.join(TEMPLATE_DIR, "csharp_class.cs.jinja")
 
-    // Define related constants if needed, e.g.:
-    // public static class OslcConstants {
-    //     public const string OSLC_CORE_NAMESPACE = "{{ oslc_ns }}";
-    //     public const string DCTERMS_NAMESPACE = "{{ dcterms_ns }}";
-    // }
-}
-"""
+# Changes to the template files are picked up automatically; bump GENERATOR_VERSION
+# when the extraction or type mapping code changes what gets rendered.
+GENERATOR_VERSION = 1
 
-# --- Helper Functions ---
+# Rendered code is streamed to the output file in batches of this many template
+# chunks (a few KB each); unchanged prefixes are copied in blocks of COPY_BLOCK_SIZE
+WRITE_BATCH_CHUNKS = 1024
+COPY_BLOCK_SIZE = 64 * 1024
 
-def get_literal_value(graph, subject, predicate):
-    """
-    Safely gets a literal value as a string.
-    Specifically handles rdf:XMLLiteral by returning its string content.
-    """
-    value = graph.value(subject, predicate)
-    if isinstance(value, Literal):
-        # *** CHANGE HERE: Check for XMLLiteral FIRST ***
-        if value.datatype == RDF.XMLLiteral:
-            # Return the string value of the XMLLiteral directly
-            return str(value)
-        else:
-            # For other literal types, attempt conversion via toPython()
-            try:
-                # toPython might return non-string types (bool, int, etc.)
-                py_val = value.toPython()
-                # Ensure we return a string representation for the template
-                return str(py_val)
-            except Exception as e:
-                # Fallback if toPython fails for some reason
-                print(f"Warning: Could not convert literal with datatype {value.datatype} using toPython() for {subject} {predicate}. Using raw string value. Error: {e}", file=sys.stderr)
-                return str(value) # Use raw string value as fallback
-    elif isinstance(value, URIRef):
-        # If the object is a URI, return its string representation
-        return str(value)
-    # Return None or "" if no suitable value found
-    return None # Or "" if you prefer empty strings over None
-
-
-def get_uri_value(graph, subject, predicate):
-    """Safely gets a URI value as a string."""
-    value = graph.value(subject, predicate)
-    if isinstance(value, URIRef):
-        return str(value)
-    return None
+DEFAULT_BASE_CLASS = "AbstractResource"
+
+# --- Incremental generation manifest (kept in the output directory) ---
+MANIFEST_FILENAME = ".oslc_shapes_gen.json"
+MANIFEST_VERSION = 1
+
+# --- Reports of oslc_shape_diff.py accepted by --only-diff ---
+SHAPE_DIFF_FORMAT = "oslc-shape-diff"
+SHAPE_DIFF_VERSION = 1
+
+# --- Helper Functions ---
 
 def get_local_name(uri_string):
     """Extracts the local name (fragment or last path segment) from a URI."""
@@ -193,9 +222,13 @@ def get_local_name(uri_string):
         return uri_string.split('/')[-1]
     return uri_string # Fallback
 
-def map_oslc_occurs_to_csharp(occurs_uri):
-    """Maps OSLC occurs URI to C# enum string."""
-    local_name = get_local_name(occurs_uri)
+def shape_class_name(shape_uri):
+    """Derives the C# class name of a shape from its local name, without the common "Shape" suffix."""
+    return to_pascal_case((get_local_name(str(shape_uri)) or "").replace("Shape", ""))
+
+def map_oslc_occurs_to_csharp(prop):
+    """Maps the oslc:occurs URI of a PropertyRecord to C# enum string."""
+    local_name = get_local_name(prop.occurs)
     mapping = {
         "Exactly-one": "ExactlyOne",
         "Zero-or-one": "ZeroOrOne",
@@ -204,8 +237,9 @@ def map_oslc_occurs_to_csharp(occurs_uri):
     }
     return mapping.get(local_name) # Returns None if not found
 
-def map_oslc_value_type_to_csharp_enum(value_type_uri):
-    """Maps OSLC value type URI to C# ValueType enum string."""
+def map_oslc_value_type_to_csharp_enum(prop):
+    """Maps the oslc:valueType URI of a PropertyRecord to C# ValueType enum string."""
+    value_type_uri = prop.value_type
     # This depends heavily on the specific C# library (like OSLC4Net)
     # Using common examples
     if not value_type_uri:
@@ -234,9 +268,9 @@ def map_oslc_value_type_to_csharp_enum(value_type_uri):
         # if local in ["Resource", "LocalResource", "AnyResource"]: return local
         return None # Fallback
 
-def map_oslc_representation_to_csharp(rep_uri):
-    """Maps OSLC representation URI to C# enum string."""
-    local_name = get_local_name(rep_uri)
+def map_oslc_representation_to_csharp(prop):
+    """Maps the oslc:representation URI of a PropertyRecord to C# enum string."""
+    local_name = get_local_name(prop.representation)
     mapping = {
         "Inline": "Inline",
         "Reference": "Reference",
@@ -244,11 +278,11 @@ def map_oslc_representation_to_csharp(rep_uri):
     }
     return mapping.get(local_name)
 
-def map_rdf_type_to_csharp_type(g, prop_uri):
-    """Determines the C# property type based on oslc:valueType or oslc:range."""
-    value_type = g.value(prop_uri, OSLC.valueType)
-    range_uri = g.value(prop_uri, OSLC.range)
-    occurs = g.value(prop_uri, OSLC.occurs)
+def map_rdf_type_to_csharp_type(prop):
+    """Determines the C# property type of a PropertyRecord based on oslc:valueType or oslc:range."""
+    value_type = prop.value_type
+    range_uri = prop.range
+    occurs = prop.occurs
 
     is_multi_valued = occurs in [OSLC['Zero-or-many'], OSLC['One-or-many']]
     csharp_base_type = "object" # Default fallback
@@ -269,7 +303,7 @@ def map_rdf_type_to_csharp_type(g, prop_uri):
         # If occurs is ExactlyOne or OneOrMany, maybe non-nullable? Check C# lib conventions
         if occurs == OSLC['Exactly-one'] or occurs == OSLC['One-or-many']:
              csharp_base_type = "DateTimeOffset"
-    elif target_type_uri == OSLC.Resource or target_type_uri == OSLC.AnyResource or isinstance(target_type_uri, URIRef):
+    elif target_type_uri == OSLC.Resource or target_type_uri == OSLC.AnyResource or target_type_uri:
         # Could be a URI link or potentially a nested resource type
         # Often represented as URI in C# OSLC libs
         csharp_base_type = "Uri" # System.Uri
@@ -299,7 +333,7 @@ def map_rdf_type_to_csharp_type(g, prop_uri):
 
 
 # --- Main Execution Logic ---
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(
         description="Generate C# classes from an OSLC Shapes TTL file using Jinja2."
     )
@@ -320,36 +354,132 @@ def main():
         default="Generated.Oslc.Shapes",
         help="The C# namespace for the generated classes (default: Generated.Oslc.Shapes)."
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Only re-render shapes whose fingerprint changed since the last run (tracked in {MANIFEST_FILENAME}) and delete files of removed shapes."
+    )
+    parser.add_argument(
+        "--only-diff",
+        type=str,
+        metavar="DIFF_JSON",
+        help="Only render the shapes listed under \"regenerate\" in a JSON report of oslc_shape_diff.py whose new "
+             "version is this shapes file, and delete the files of the classes it lists as removed. The other "
+             f"shapes keep their files and {MANIFEST_FILENAME} entries."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for extracting, rendering and writing shapes (0: one per CPU, default: 1)."
+    )
+    parser.add_argument(
+        "--metadata",
+        dest="features",
+        action="append_const",
+        const="metadata",
+        help="Also emit a static OslcPropertyMetadata table per class (property URIs, occurs, value types, "
+             "representations, read-only flags and typed accessors) and register it with OslcResourceMetadata."
+    )
+    parser.add_argument(
+        "--share-properties",
+        action="store_true",
+        help="Declare properties that several shapes have with identical constraints once, in generated abstract "
+             "base records, and report how many declarations that saved."
+    )
+    parser.add_argument(
+        "--template",
+        type=str,
+        default=DEFAULT_TEMPLATE,
+        help="Jinja template file to render each shape with; it may include or extend the other templates in its "
+             "directory. Compiled templates are cached in the templates folder of --cache-dir "
+             f"(default: {os.path.relpath(DEFAULT_TEMPLATE, os.path.dirname(TEMPLATE_DIR))})."
+    )
+    add_cache_arguments(parser)
+    add_timing_arguments(parser)
+    add_watch_arguments(parser)
+    return parser
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
+    if args.only_diff and args.share_properties:
+        parser.error("--only-diff cannot be combined with --share-properties, which depends on all shapes")
+    if args.only_diff and args.watch:
+        parser.error("--only-diff cannot be combined with --watch")
+
+    with timings_from_args(args, "oslc_shapes_gen") as timings:
+        generate(args, timings)
+    if args.watch:
+        try:
+            watch(args)
+        except KeyboardInterrupt:
+            pass
 
+
+def watch(args):
+    """
+    Runs generate() again in this process whenever the shapes file or the template changes.
+    The compiled template and the description cache are kept, and the runs are
+    incremental, so only shapes whose fingerprint changed are rendered again.
+    """
+    args.incremental = True
+    print(f"\nWatching {args.filepath} and {args.template}; press Ctrl+C to stop.")
+    for _ in poll_changes([args.filepath, args.template], args.poll_interval):
+        started = time.perf_counter()
+        try:
+            generate(args, DISABLED)
+        except SystemExit:
+            continue  # generate() has already reported why; keep watching
+        print(f"Regenerated in {time.perf_counter() - started:.2f} s")
+
+
+def generate(args, timings):
+    # subject_digest() is keyed on the index; a new run parses a new one, and watch() and
+    # the benchmarks call this repeatedly, so the previous run's index is released here
+    subject_digest.cache_clear()
     source_location = args.filepath
     output_dir = args.output_dir
     csharp_namespace = args.csharp_namespace
-    source_format = 'turtle'
+    # Optional template sections, each rendered when its name is set
+    features = tuple(sorted(set(args.features or ())))
+    try:
+        template = TemplateSource(
+            args.template, None if args.no_cache else os.path.join(args.cache_dir, "templates")
+        )
+    except OSError as e:
+        print(f"Error reading template '{args.template}': {e}", file=sys.stderr)
+        sys.exit(1)
 
     # --- Load RDF Graph ---
-    g = Graph()
+    # N-Triples files are streamed by rdf_index; anything else is parsed as Turtle by rdflib
     print(f"Attempting to load RDF data from: {source_location}")
     try:
-        g.parse(source=source_location, format=source_format)
-        print(f"Successfully parsed {len(g)} triples.")
+        cache = cache_from_args(args)
+        with timings.phase("parse"):
+            g = load_compact_index(
+                [source_location],
+                predicates=SHAPE_PREDICATES,
+                default_format="turtle",
+                cache=cache,
+                jobs=args.parse_jobs,
+            )
+        print(f"Successfully parsed {g.triples_read} triples.")
+        timings.count("triples", g.triples_read)
+        timings.count("indexed_triples", len(g))
+        if cache is not None:
+            timings.cache("parse", cache.hits, cache.misses)
     except FileNotFoundError:
         print(f"Error: File not found at '{source_location}'", file=sys.stderr)
         sys.exit(1)
-    except rdflib.exceptions.ParserError as pe:
+    except RdfSyntaxError as pe:
         print(f"Error parsing RDF file: {pe}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"An unexpected error occurred during parsing: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # --- Prepare Jinja Environment ---
-    # Using inline template string
-    template = Template(CSHARP_TEMPLATE_STR)
-    # If using a file:
-    # jinja_env = Environment(loader=FileSystemLoader('.'), trim_blocks=True, lstrip_blocks=True)
-    # template = jinja_env.get_template('csharp_class.jinja') # Assuming template file exists
-
     # --- Ensure output directory exists ---
     try:
         os.makedirs(output_dir, exist_ok=True)
@@ -358,118 +488,849 @@ def main():
         print(f"Error creating output directory '{output_dir}': {e}", file=sys.stderr)
         sys.exit(1)
 
+    # --- Load the manifest of the previous run (incremental and --only-diff modes) ---
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    only = load_shape_diff(args.only_diff, source_location) if args.only_diff else None
+    previous_shapes = load_manifest(manifest_path) if args.incremental or only is not None else {}
+    manifest_shapes = {}
+
     # --- Process Shapes ---
+    # All subjects of type oslc:ResourceShape, read once together with their properties
+    with timings.phase("model"):
+        model = ShapeModel.from_index(g)
+    timings.count("shapes", len(model.shapes))
+    timings.count("properties", model.property_node_count())
+    shapes = model.shapes
+    render_previous = previous_shapes
+    if only is not None:
+        # Shapes the diff lists are always rendered; the others keep their previous entries,
+        # which are found under their old IRIs if the manifest is from the diff's old version
+        shapes = [shape for shape in model.shapes if str(shape.node) in only.shapes]
+        render_previous = {}
+        carried = {only.rename(uri): entry for uri, entry in previous_shapes.items()}
+        for shape in model.shapes:
+            if str(shape.node) not in only.shapes and str(shape.node) in carried:
+                manifest_shapes[str(shape.node)] = carried[str(shape.node)]
+        print(f"Rendering the {len(shapes)} of {len(model.shapes)} shapes listed in {args.only_diff}.")
+    sharing = None
+    if args.share_properties:
+        with timings.phase("share"):
+            sharing = analyze_shared_properties(g, model, csharp_namespace, timings)
+        timings.count("shared_bases", len(sharing.bases))
+        timings.count("declarations_saved", sharing.declarations_before - sharing.declarations_after)
+        print(f"Shared properties: {len(sharing.bases)} base records, "
+              f"{sharing.declarations_before} -> {sharing.declarations_after} property declarations "
+              f"({sharing.declarations_before - sharing.declarations_after} saved).")
+        for base in sharing.bases:
+            manifest_shapes[f"shared:{base.class_name}"] = render_base(base, output_dir, features, timings, template)
+    if args.jobs != 1 and len(shapes) > 1:
+        results = process_shapes_in_parallel(
+            g, model, shapes, output_dir, csharp_namespace, render_previous, args.jobs or os.cpu_count(), timings,
+            features, sharing, template,
+        )
+    else:
+        results = (
+            process_shape(
+                g, model, shape, output_dir, csharp_namespace, render_previous.get(str(shape.node)), timings, features,
+                sharing, template,
+            )
+            for shape in shapes
+        )
+
     shapes_processed = 0
-    # Find all subjects that are of type oslc:ResourceShape
-    for shape_uri in g.subjects(predicate=RDF.type, object=OSLC.ResourceShape):
-        if not isinstance(shape_uri, URIRef):
-            print(f"Skipping non-URI shape identifier: {shape_uri}", file=sys.stderr)
-            continue
+    shapes_unchanged = 0
+    for shape, (status, manifest_entry) in zip(shapes, results):
+        if manifest_entry is not None:
+            manifest_shapes[str(shape.node)] = manifest_entry
+        if status == "generated":
+            shapes_processed += 1
+        elif status == "unchanged":
+            shapes_unchanged += 1
+
+    # --- Remove files of shapes that are gone (incremental and --only-diff modes) ---
+    shapes_removed = 0
+    current_files = {entry["file"] for entry in manifest_shapes.values()}
+    previous_files = {entry["file"] for entry in previous_shapes.values()}
+    if only is not None:
+        previous_files.update(only.removed_files)
+    for stale_file in sorted(previous_files - current_files):
+        stale_path = os.path.join(output_dir, stale_file)
+        try:
+            os.remove(stale_path)
+            print(f"Removed stale file: {stale_path}")
+            shapes_removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing stale file '{stale_path}': {e}", file=sys.stderr)
+
+    # Only runs that read the manifest keep it, so a plain run leaves nothing but the C# files
+    if args.incremental or only is not None:
+        with timings.phase("write_manifest"):
+            write_if_changed(manifest_path, json.dumps(
+                {"version": MANIFEST_VERSION, "shapes": dict(sorted(manifest_shapes.items()))},
+                indent=2,
+            ) + "\n")
+
+    timings.count("generated", shapes_processed)
+    timings.count("unchanged", shapes_unchanged)
+    timings.count("removed", shapes_removed)
+    if args.jobs == 1 or len(shapes) <= 1:
+        # Parallel runs merge the worker caches' statistics instead
+        description_cache = clean_description.cache_info()
+        timings.cache("descriptions", description_cache.hits, description_cache.misses)
+
+    if args.incremental or only is not None:
+        print(f"\nFinished processing. Generated {shapes_processed} C# files "
+              f"({shapes_unchanged} unchanged, {shapes_removed} removed).")
+    else:
+        print(f"\nFinished processing. Generated {shapes_processed} C# files.")
+
+
+def process_shape(g, model, shape, output_dir, csharp_namespace, previous, timings=DISABLED, features=(),
+                  sharing=None, template=None):
+    """
+    Checks, extracts, renders and writes one ShapeRecord of the model.
+
+    Returns a (status, manifest_entry) pair, where status is one of "skipped",
+    "unchanged", "generated" or "failed".
+    """
+    status, manifest_entry, class_name, fingerprint = check_shape(
+        g, shape, output_dir, csharp_namespace, previous, timings, features, sharing, template
+    )
+    if status != "pending":
+        return status, manifest_entry
+    return render_shape(
+        model, shape, class_name, fingerprint, output_dir, csharp_namespace, timings, features, sharing, template
+    )
+
+
+def check_shape(g, shape, output_dir, csharp_namespace, previous, timings=DISABLED, features=(), sharing=None,
+                template=None):
+    """
+    Derives the class name of a shape and decides whether it has to be rendered.
+
+    Returns (status, manifest_entry, class_name, fingerprint), where status is
+    "pending" if the shape has to be rendered, else "skipped" or "unchanged".
+    """
+    shape_uri = shape.node
+    if not isinstance(shape_uri, IRI):
+        print(f"Skipping non-URI shape identifier: {shape_uri}", file=sys.stderr)
+        return "skipped", None, None, None
+
+    if not get_local_name(str(shape_uri)):
+        print(f"Skipping shape with unparseable URI: {shape_uri}", file=sys.stderr)
+        return "skipped", None, None, None
+
+    class_name = shape_class_name(shape_uri)
+    if not class_name:
+         print(f"Skipping shape {shape_uri} due to empty derived class name.", file=sys.stderr)
+         return "skipped", None, None, None
+
+    output_filename = os.path.join(output_dir, f"{class_name}.cs")
+    with timings.phase("fingerprint"):
+        fingerprint = fingerprint_shape(g, shape_uri, class_name, csharp_namespace, features, sharing, template)
+    if (
+        previous is not None
+        and previous["fingerprint"] == fingerprint
+        and previous["file"] == f"{class_name}.cs"
+        and os.path.exists(output_filename)
+    ):
+        print(f"\nUnchanged Shape: {shape_uri} -> Class: {class_name}")
+        return "unchanged", previous, class_name, fingerprint
+
+    return "pending", None, class_name, fingerprint
+
+
+def render_shape(model, shape, class_name, fingerprint, output_dir, csharp_namespace, timings=DISABLED,
+                 features=(), sharing=None, template=None):
+    """Extracts, renders and writes a shape that check_shape() reported as "pending"."""
+    shape_uri = shape.node
+    output_filename = os.path.join(output_dir, f"{class_name}.cs")
+    print(f"\nProcessing Shape: {shape_uri} -> Class: {class_name}")
+    with timings.phase("extract"):
+        shape_data = extract_shape(model, shape, class_name, csharp_namespace, timings)
+    if sharing is not None:
+        sharing.apply(shape_data)
+
+    # --- Generate C# file for this shape ---
+    if not shape_data.properties:
+        print(f"  Shape {shape_uri} has no valid properties defined. Skipping file generation.")
+        return "skipped", None
+
+    try:
+        with timings.phase("compile_template"):
+            compiled = compile_template(template)
+        with timings.phase("render"):
+            written = write_stream_if_changed(
+                output_filename, compiled.generate(shape=shape_data, **dict.fromkeys(features, True))
+            )
+        if written:
+            print(f"  Successfully generated: {output_filename}")
+        else:
+            print(f"  Output is up to date: {output_filename}")
+        return "generated", {"file": f"{class_name}.cs", "fingerprint": fingerprint}
+    except Exception as e:
+        print(f"  Error generating or writing file for shape {shape_uri}: {e}", file=sys.stderr)
+        return "failed", None
+
+
+class TemplateSource:
+    """
+    The template file shapes are rendered with, its version (which goes into
+    every shape fingerprint) and the directory its compiled code is cached in.
+    Plain data, so that it can be sent to worker processes.
+    """
+
+    def __init__(self, path=DEFAULT_TEMPLATE, bytecode_dir=None):
+        self.path = os.path.abspath(path)
+        self.bytecode_dir = bytecode_dir and os.path.abspath(bytecode_dir)
+        self.version = template_version(self.path)
+
+    def compile(self):
+        return template_environment(os.path.dirname(self.path), self.bytecode_dir).get_template(
+            os.path.basename(self.path)
+        )
+
 
-        shape_local_name = get_local_name(str(shape_uri))
-        if not shape_local_name:
-            print(f"Skipping shape with unparseable URI: {shape_uri}", file=sys.stderr)
+@functools.cache
+def default_template():
+    return TemplateSource()
+
+
+def template_version(path):
+    """
+    Hashes the template together with the other templates in its directory,
+    which it may include or extend.
+    """
+    directory, name = os.path.split(path)
+    names = {name} | {other for other in os.listdir(directory) if other.endswith(".jinja")}
+    digest = hashlib.sha256()
+    for other in sorted(names):
+        with open(os.path.join(directory, other), "rb") as f:
+            content = f.read()
+        digest.update(f"{other}\0{len(content)}\0".encode())
+        digest.update(content)
+    return f"{GENERATOR_VERSION}-{digest.hexdigest()[:16]}"
+
+
+@functools.cache
+def template_environment(directory, bytecode_dir=None):
+    """
+    Creates the Jinja environment on first use, so runs that render nothing never
+    import jinja2. With a bytecode_dir, compiled templates are stored there keyed
+    by their source, and later runs load them instead of compiling again. The
+    environment reloads a template whose file changed (e.g. in --watch mode).
+    """
+    import jinja2
+    bytecode_cache = None
+    if bytecode_dir is not None:
+        os.makedirs(bytecode_dir, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_dir)
+    return jinja2.Environment(loader=jinja2.FileSystemLoader(directory), bytecode_cache=bytecode_cache)
+
+
+def compile_template(template=None):
+    """Compiled template to render shapes with (the default one unless given a TemplateSource)."""
+    return (template or default_template()).compile()
+
+
+def captured(function, *args):
+    """Calls function(*args) and returns its result with the stdout and stderr it printed."""
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        result = function(*args)
+    return result, out.getvalue(), err.getvalue()
+
+
+# --- Parallel generation ---
+# Shapes are checked against the manifest here, and only the ones that have to
+# be rendered are sent to the pool, so no-op runs never start it. Each worker
+# decodes one read-only snapshot of the index and rebuilds the shape model when
+# it starts, so tasks only carry a shape position, class name and fingerprint.
+# Worker timings are sent back with every result.
+_worker = {}
+
+
+def process_shapes_in_parallel(g, model, shapes, output_dir, csharp_namespace, previous_shapes, jobs,
+                               timings=DISABLED, features=(), sharing=None, template=None):
+    """
+    Runs process_shape() for each of the model's shapes in shapes, rendering on a
+    process pool, and yields the results in that order. Log output is captured per
+    shape and replayed here, so the log reads the same as a sequential run.
+    """
+    checks = [
+        captured(
+            check_shape, g, shape, output_dir, csharp_namespace, previous_shapes.get(str(shape.node)), timings, features,
+            sharing, template,
+        )
+        for shape in shapes
+    ]
+    # Workers rebuild the whole model, so tasks refer to shapes by their position in it
+    positions = {shape.node: position for position, shape in enumerate(model.shapes)}
+    tasks = [
+        (positions[shape.node], class_name, fingerprint)
+        for shape, ((status, _, class_name, fingerprint), _, _) in zip(shapes, checks)
+        if status == "pending"
+    ]
+
+    with contextlib.ExitStack() as stack:
+        rendered = iter(())
+        if tasks:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=min(jobs, len(tasks)),
+                initializer=_init_worker,
+                initargs=(encode_index(g), output_dir, csharp_namespace, timings.enabled, features, sharing, template),
+            ))
+            rendered = executor.map(_render_shape_task, tasks)
+
+        for (status, manifest_entry, _, _), out, err in checks:
+            sys.stdout.write(out)
+            sys.stderr.write(err)
+            if status == "pending":
+                (status, manifest_entry), out, err, worker_timings = next(rendered)
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                timings.merge(worker_timings)
+            yield status, manifest_entry
+
+
+def _init_worker(snapshot, output_dir, csharp_namespace, timings_enabled, features, sharing, template):
+    _worker["timings"] = Timings("oslc_shapes_gen worker", enabled=timings_enabled)
+    with _worker["timings"].phase("worker_init"):
+        _worker["model"] = ShapeModel.from_index(decode_index(snapshot, CompactIndexBuilder(SHAPE_PREDICATES)).build())
+    _worker["output_dir"] = output_dir
+    _worker["csharp_namespace"] = csharp_namespace
+    _worker["features"] = features
+    _worker["sharing"] = sharing
+    _worker["template"] = template
+
+
+def _render_shape_task(task):
+    position, class_name, fingerprint = task
+    timings = _worker["timings"]
+    cache_before = clean_description.cache_info()
+    result, out, err = captured(
+        render_shape,
+        _worker["model"],
+        _worker["model"].shapes[position],
+        class_name,
+        fingerprint,
+        _worker["output_dir"],
+        _worker["csharp_namespace"],
+        timings,
+        _worker["features"],
+        _worker["sharing"],
+        _worker["template"],
+    )
+    cache_after = clean_description.cache_info()
+    timings.cache("descriptions", cache_after.hits - cache_before.hits, cache_after.misses - cache_before.misses)
+    return result, out, err, timings.drain()
+
+
+class ShapeData:
+    """
+    Template data for one generated C# record. declared_properties are the ones
+    the record declares itself, which leaves out those of shared base records.
+    """
+    __slots__ = (
+        "uri", "class_name", "csharp_namespace", "title", "description", "describes", "properties",
+        "declared_properties", "base_class", "is_base", "shared_by",
+    )
+
+    def __init__(self, *, uri, class_name, csharp_namespace, title, description, describes, properties,
+                 base_class=DEFAULT_BASE_CLASS, is_base=False, shared_by=()):
+        self.uri = uri
+        self.class_name = class_name
+        self.csharp_namespace = csharp_namespace
+        self.title = title
+        self.description = description
+        self.describes = describes
+        self.properties = properties
+        self.declared_properties = properties
+        self.base_class = base_class
+        self.is_base = is_base
+        self.shared_by = shared_by
+
+
+class PropertyData:
+    """Template data for one C# property of a generated record."""
+    __slots__ = (
+        "uri", "name", "csharp_name", "description", "title", "occurs", "property_definition",
+        "value_type_enum", "range", "representation", "read_only", "csharp_type",
+    )
+
+    def __init__(self, *, uri, name, csharp_name, description, title, occurs, property_definition,
+                 value_type_enum, range, representation, read_only, csharp_type):
+        self.uri = uri
+        self.name = name
+        self.csharp_name = csharp_name
+        self.description = description
+        self.title = title
+        self.occurs = occurs
+        self.property_definition = property_definition
+        self.value_type_enum = value_type_enum
+        self.range = range
+        self.representation = representation
+        self.read_only = read_only # Literal text or False
+        self.csharp_type = csharp_type
+
+
+def extract_shape(model, shape, class_name, csharp_namespace, timings=DISABLED):
+    """Collects the template data for one oslc:ResourceShape from its model records."""
+    with timings.phase("clean"):
+        # Use cleaned values for attributes needing plain text
+        shape_title = clean_description(shape.title) or class_name # Use class name as fallback
+        shape_desc = clean_description(shape.description) # This might not be used directly in shape attributes often
+    shape_data = ShapeData(
+        uri=str(shape.node),
+        class_name=class_name,
+        csharp_namespace=csharp_namespace,
+        title=shape_title,
+        description=shape_desc,
+        describes=shape.describes,
+        properties=[],
+    )
+
+    # All property nodes linked by oslc:property, in input order
+    for prop in model.shape_properties(shape):
+        prop_uri = prop.node
+        if not isinstance(prop_uri, IRI):
+            print(f"  Skipping non-URI property link: {prop_uri}", file=sys.stderr)
             continue
 
-        # Derive C# class name from shape's local name
-        class_name = to_pascal_case(shape_local_name.replace("Shape", "")) # Remove "Shape" suffix common convention
-        if not class_name:
-             print(f"Skipping shape {shape_uri} due to empty derived class name.", file=sys.stderr)
-             continue
-
-        print(f"\nProcessing Shape: {shape_uri} -> Class: {class_name}")
-        raw_shape_title = get_literal_value(g, shape_uri, DCTERMS.title)
-        cleaned_shape_title = clean_description(raw_shape_title) or class_name # Use class name as fallback
-
-        raw_shape_desc = get_literal_value(g, shape_uri, DCTERMS.description)
-        cleaned_shape_desc = clean_description(raw_shape_desc)
-
-        shape_data = {
-            "uri": str(shape_uri),
-            "class_name": class_name,
-            "csharp_namespace": csharp_namespace,
-            # Use cleaned values for attributes needing plain text
-            "title": cleaned_shape_title,
-            "description": cleaned_shape_desc, # This might not be used directly in shape attributes often
-            "describes": get_uri_value(g, shape_uri, OSLC.describes),
-            "properties": [],
-            "oslc_ns": str(OSLC),
-            "dcterms_ns": str(DCTERMS),
-        }
-
-
-        # Find all property URIs linked by oslc:property
-        for prop_uri in g.objects(subject=shape_uri, predicate=OSLC.property):
-            if not isinstance(prop_uri, URIRef):
-                print(f"  Skipping non-URI property link: {prop_uri}", file=sys.stderr)
-                continue
-
-            # Verify the linked resource is actually an oslc:Property
-            if not (prop_uri, RDF.type, OSLC.Property) in g:
-                print(f"  Warning: Resource {prop_uri} linked by oslc:property is not explicitly typed as oslc:Property.", file=sys.stderr)
-                # Continue processing it anyway, assuming it has the needed attributes
-
-            prop_name = get_literal_value(g, prop_uri, OSLC.name)
+        # Verify the linked resource is actually an oslc:Property
+        if not prop.typed:
+            print(f"  Warning: Resource {prop_uri} linked by oslc:property is not explicitly typed as oslc:Property.", file=sys.stderr)
+            # Continue processing it anyway, assuming it has the needed attributes
+
+        prop_name = prop.name
+        if not prop_name:
+            prop_local_name = get_local_name(str(prop_uri))
+            print(f"  Warning: Property {prop_uri} missing oslc:name. Using local name '{prop_local_name}' as fallback.", file=sys.stderr)
+            prop_name = prop_local_name # Use fragment/local name as fallback
             if not prop_name:
-                prop_local_name = get_local_name(str(prop_uri))
-                print(f"  Warning: Property {prop_uri} missing oslc:name. Using local name '{prop_local_name}' as fallback.", file=sys.stderr)
-                prop_name = prop_local_name # Use fragment/local name as fallback
-                if not prop_name:
-                    print(f"  Skipping property {prop_uri} with no usable name.", file=sys.stderr)
-                    continue # Skip property if no name available
-
-            prop_csharp_name = to_pascal_case(prop_name)
-            if not prop_csharp_name:
-                print(f"  Skipping property {prop_uri} due to empty derived C# name from '{prop_name}'.", file=sys.stderr)
-                continue
-
- # *** Apply cleaning to description ***
-            raw_prop_desc = get_literal_value(g, prop_uri, DCTERMS.description)
-            cleaned_prop_desc = clean_description(raw_prop_desc)
-
-            raw_prop_title = get_literal_value(g, prop_uri, DCTERMS.title)
-            cleaned_prop_title = clean_description(raw_prop_title)
-
-
-            prop_data = {
-                "uri": str(prop_uri),
-                "name": prop_name,
-                "csharp_name": prop_csharp_name,
-                # Store both raw (if needed for comments) and cleaned versions
-                "original_description": raw_prop_desc,
-                "description": cleaned_prop_desc, # Use cleaned version for attribute
-                "title": cleaned_prop_title, # Clean title too
-                "occurs": map_oslc_occurs_to_csharp(get_uri_value(g, prop_uri, OSLC.occurs)),
-                "property_definition": get_uri_value(g, prop_uri, OSLC.propertyDefinition),
-                "value_type": get_uri_value(g, prop_uri, OSLC.valueType),
-                "value_type_enum": map_oslc_value_type_to_csharp_enum(get_uri_value(g, prop_uri, OSLC.valueType)),
-                "range": get_uri_value(g, prop_uri, OSLC.range),
-                "representation": map_oslc_representation_to_csharp(get_uri_value(g, prop_uri, OSLC.representation)),
-                "read_only": get_literal_value(g, prop_uri, OSLC.readOnly) or False,
-                "csharp_type": map_rdf_type_to_csharp_type(g, prop_uri)
-            }
-
-            print(f"  Found Property: {prop_name} -> C#: {prop_csharp_name} (Type: {prop_data['csharp_type']})")
-            shape_data["properties"].append(prop_data)
-
-
-        # --- Generate C# file for this shape ---
-        if not shape_data["properties"]:
-            print(f"  Shape {shape_uri} has no valid properties defined. Skipping file generation.")
+                print(f"  Skipping property {prop_uri} with no usable name.", file=sys.stderr)
+                continue # Skip property if no name available
+
+        if prop.property_definition and not prop.property_definition.endswith(prop_name):
+            print(f"  Warning: Property definition {prop.property_definition} does not end with oslc:name '{prop_name}'. "
+                  "OSLC4Net rejects the property when it is serialized, and --metadata leaves it out.", file=sys.stderr)
+
+        prop_csharp_name = to_pascal_case(prop_name)
+        if not prop_csharp_name:
+            print(f"  Skipping property {prop_uri} due to empty derived C# name from '{prop_name}'.", file=sys.stderr)
+            continue
+
+        # *** Apply cleaning to description and title ***
+        with timings.phase("clean"):
+            cleaned_prop_desc = clean_description(prop.description)
+            cleaned_prop_title = clean_description(prop.title)
+
+        prop_data = PropertyData(
+            uri=str(prop_uri),
+            name=prop_name,
+            csharp_name=prop_csharp_name,
+            description=cleaned_prop_desc,
+            title=cleaned_prop_title,
+            occurs=map_oslc_occurs_to_csharp(prop),
+            property_definition=prop.property_definition,
+            value_type_enum=map_oslc_value_type_to_csharp_enum(prop),
+            range=prop.range,
+            representation=map_oslc_representation_to_csharp(prop),
+            read_only=prop.read_only or False,
+            csharp_type=map_rdf_type_to_csharp_type(prop),
+        )
+
+        print(f"  Found Property: {prop_name} -> C#: {prop_csharp_name} (Type: {prop_data.csharp_type})")
+        shape_data.properties.append(prop_data)
+
+    return shape_data
+
+
+# --- Shared property analysis (--share-properties) ---
+# Shapes of domains like KerML repeat the same inherited properties with the same
+# constraints. A property is shared when it renders to the same declaration in
+# several shapes. Every distinct set of shapes sharing properties is a candidate
+# base record; candidates are accepted greedily by the number of declarations
+# they save, as long as the accepted sets stay nested or disjoint, so they form
+# a single-inheritance tree. Each shared property is then declared in the
+# largest accepted bases whose shapes all have it, and in the shapes that no
+# such base covers. Properties whose constraints differ stay in each shape.
+
+class SharingPlan:
+    """
+    Abstract base records for shared properties (parents first), the base record
+    of each shape class and the property signatures it inherits from its bases.
+    """
+    __slots__ = ("bases", "base_of", "inherited", "declarations_before", "declarations_after")
+
+    def __init__(self, bases, base_of, inherited, declarations_before, declarations_after):
+        self.bases = bases
+        self.base_of = base_of
+        self.inherited = inherited
+        self.declarations_before = declarations_before
+        self.declarations_after = declarations_after
+
+    def apply(self, shape_data):
+        """Sets the base class and declared properties of an extracted shape."""
+        shape_data.base_class = self.base_of.get(shape_data.class_name, DEFAULT_BASE_CLASS)
+        inherited = self.inherited.get(shape_data.class_name)
+        if inherited:
+            shape_data.declared_properties = [
+                prop for prop in shape_data.properties if property_signature(prop) not in inherited
+            ]
+
+    def digest(self, class_name):
+        """What the rendered file of a shape class depends on in this plan."""
+        inherited = sorted(repr(signature) for signature in self.inherited.get(class_name, ()))
+        return f"{self.base_of.get(class_name, DEFAULT_BASE_CLASS)}\0{inherited}"
+
+
+def property_signature(prop):
+    """Everything the declaration of a property renders from (all of PropertyData but the node)."""
+    return (
+        prop.name, prop.csharp_name, prop.description, prop.title, prop.occurs, prop.property_definition,
+        prop.value_type_enum, prop.range, prop.representation, prop.read_only, prop.csharp_type,
+    )
+
+
+def analyze_shared_properties(g, model, csharp_namespace, timings=DISABLED):
+    """Extracts every shape that would be generated (quietly) and plans its shared properties."""
+    shapes = []
+    for shape in model.shapes:
+        (status, _, class_name, _), _, _ = captured(check_shape, g, shape, "", csharp_namespace, None)
+        if status != "pending":
             continue
+        shape_data, _, _ = captured(extract_shape, model, shape, class_name, csharp_namespace, timings)
+        if shape_data.properties:
+            shapes.append(shape_data)
+    return plan_shared_properties(shapes, csharp_namespace)
+
+
+def plan_shared_properties(shapes, csharp_namespace):
+    """Builds the SharingPlan for a list of extracted ShapeData, in input order."""
+    position = {shape.class_name: index for index, shape in enumerate(shapes)}
+
+    # Shapes having each property signature; names declared twice in one shape are never shared
+    sharing = {}
+    for shape in shapes:
+        name_counts = collections.Counter(prop.csharp_name for prop in shape.properties)
+        for prop in shape.properties:
+            if name_counts[prop.csharp_name] == 1:
+                sharing.setdefault(property_signature(prop), set()).add(shape.class_name)
+    patterns = {}
+    for signature, class_names in sharing.items():
+        if len(class_names) > 1:
+            patterns.setdefault(frozenset(class_names), []).append(signature)
+
+    def in_order(class_names):
+        return sorted(class_names, key=position.__getitem__)
+
+    accepted = []
+    for group in sorted(patterns, key=lambda group: (
+        -(len(group) - 1) * len(patterns[group]), -len(group), [position[name] for name in in_order(group)]
+    )):
+        if all(group <= other or other <= group or not group & other for other in accepted):
+            accepted.append(group)
+    accepted.sort(key=len, reverse=True) # Parents before children
+
+    # Each shared signature goes to the largest accepted groups whose shapes all have it
+    placements = {}
+    inherited = {}
+    for signature, class_names in sharing.items():
+        candidates = [group for group in accepted if group <= class_names]
+        placements[signature] = [
+            group for group in candidates if not any(group < other for other in candidates)
+        ]
+        for group in placements[signature]:
+            for class_name in group:
+                inherited.setdefault(class_name, set()).add(signature)
+
+    # Base record names come from their smallest shape, made unique against all classes
+    taken = set(position)
+    names = {}
+    for group in accepted:
+        smallest = min(in_order(group), key=lambda name: len(shapes[position[name]].properties))
+        name = f"{smallest}Base"
+        suffix = 2
+        while name in taken:
+            name = f"{smallest}Base{suffix}"
+            suffix += 1
+        taken.add(name)
+        names[group] = name
+
+    def parent_of(group):
+        parents = [other for other in accepted if group < other]
+        return names[min(parents, key=len)] if parents else DEFAULT_BASE_CLASS
+
+    bases = {
+        group: ShapeData(
+            uri=None,
+            class_name=names[group],
+            csharp_namespace=csharp_namespace,
+            title=None,
+            description=None,
+            describes=None,
+            properties=[],
+            base_class=parent_of(group),
+            is_base=True,
+            shared_by=in_order(group),
+        )
+        for group in accepted
+    }
+    # Base properties in the order of the first shape declaring them
+    placed = set()
+    for shape in shapes:
+        for prop in shape.properties:
+            signature = property_signature(prop)
+            for group in placements.get(signature, ()):
+                if shape.class_name in group and (group, signature) not in placed:
+                    placed.add((group, signature))
+                    bases[group].properties.append(prop)
+
+    base_of = {}
+    for group in accepted:
+        for class_name in group:
+            base_of[class_name] = names[group] # Groups run from large to small, so the smallest wins
+
+    declarations_before = sum(len(shape.properties) for shape in shapes)
+    declarations_after = sum(len(base.properties) for base in bases.values()) + sum(
+        len([prop for prop in shape.properties if property_signature(prop) not in inherited.get(shape.class_name, ())])
+        for shape in shapes
+    )
+    return SharingPlan(
+        [bases[group] for group in accepted],
+        base_of,
+        {class_name: frozenset(signatures) for class_name, signatures in inherited.items()},
+        declarations_before,
+        declarations_after,
+    )
+
+
+def render_base(base, output_dir, features=(), timings=DISABLED, template=None):
+    """Renders and writes one abstract base record of a SharingPlan; returns its manifest entry."""
+    output_filename = os.path.join(output_dir, f"{base.class_name}.cs")
+    with timings.phase("compile_template"):
+        compiled = compile_template(template)
+    digest = hashlib.sha256()
+    with timings.phase("render"):
+        written = write_stream_if_changed(
+            output_filename, compiled.generate(shape=base, **dict.fromkeys(features, True)), digest
+        )
+    if written:
+        print(f"  Successfully generated shared base record: {output_filename}")
+    else:
+        print(f"  Shared base record is up to date: {output_filename}")
+    return {"file": f"{base.class_name}.cs", "fingerprint": digest.hexdigest()}
+
 
-        output_filename = os.path.join(output_dir, f"{class_name}.cs")
+def fingerprint_shape(g, shape_uri, class_name, csharp_namespace, features=(), sharing=None, template=None):
+    """
+    Hashes everything the rendered file of a shape depends on: the shape's own
+    triples, the triples of its oslc:property nodes (in input order), the target
+    names, the template version, the optional template sections and, with
+    --share-properties, the shape's base record and the properties it inherits.
+    """
+    digest = hashlib.sha256()
+    template_version = (template or default_template()).version
+    digest.update(f"{template_version}\0{csharp_namespace}\0{class_name}\0".encode())
+    for feature in features:
+        digest.update(f"{feature}\0".encode())
+    if sharing is not None:
+        digest.update(f"shared\0{sharing.digest(class_name)}\0".encode())
+    digest.update(subject_digest(g, shape_uri))
+    for prop_uri in g.objects(shape_uri, OSLC.property):
+        digest.update(subject_digest(g, prop_uri))
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=16384)
+def subject_digest(g, subject):
+    """
+    Hash of the triples of one subject. Cached because shapes share property nodes;
+    generate() clears the cache, so it holds the index of one run at most.
+    """
+    return hashlib.sha256("".join(
+        f"{subject}\0{predicate}\0{obj!r}\n" for predicate, obj in g.predicate_objects(subject)
+    ).encode()).digest()
+
+
+def load_manifest(manifest_path):
+    """Reads the shape fingerprints recorded by the previous run, if they are still usable."""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("shapes", {})
+
+
+class ShapeDiffSelection:
+    """What a JSON report of oslc_shape_diff.py asks to regenerate, and the IRI renames it was made with."""
+    __slots__ = ("shapes", "removed_files", "renames")
+
+    def __init__(self, shapes, removed_files, renames):
+        self.shapes = shapes
+        self.removed_files = removed_files
+        self.renames = sorted(renames, key=lambda rename: len(rename[0]), reverse=True)
+
+    def rename(self, iri):
+        """The IRI a shape of the report's old version has in the new one."""
+        for old, new in self.renames:
+            if iri.startswith(old):
+                return new + iri[len(old):]
+        return iri
+
+
+def load_shape_diff(diff_path, shapes_path):
+    """
+    Reads the shapes and removed classes to regenerate from a JSON report of
+    oslc_shape_diff.py, after checking that its new version is the shapes file
+    being generated from. Exits with an error message otherwise.
+    """
+    try:
+        with open(diff_path, encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading shape diff '{diff_path}': {e}", file=sys.stderr)
+        sys.exit(1)
+    if not isinstance(report, dict) or report.get("format") != SHAPE_DIFF_FORMAT:
+        print(f"Error: '{diff_path}' is not a JSON report of oslc_shape_diff.py", file=sys.stderr)
+        sys.exit(1)
+    if report.get("version") != SHAPE_DIFF_VERSION:
+        print(f"Error: '{diff_path}' has unsupported version {report.get('version')!r}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        with open(shapes_path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError as e:
+        print(f"Error reading '{shapes_path}': {e}", file=sys.stderr)
+        sys.exit(1)
+    if report["new"]["shapes_sha256"] != digest:
+        print(f"Error: '{diff_path}' was not made against the current content of '{shapes_path}'", file=sys.stderr)
+        sys.exit(1)
+    regenerate = report["regenerate"]
+    return ShapeDiffSelection(
+        frozenset(regenerate["shapes"]),
+        [f"{class_name}.cs" for class_name in regenerate["removed_classes"]],
+        [(rename["old"], rename["new"]) for rename in report["renames"]],
+    )
+
+
+def write_if_changed(path, content):
+    """Writes the file only if its content differs, so unchanged files keep their mtime."""
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    write_atomic(path, content)
+    return True
+
+
+def write_stream_if_changed(path, chunks, digest=None):
+    """
+    Streams rendered chunks to path, comparing them with the existing file on the
+    way. Writing only starts at the first difference, into a temporary file that
+    then replaces path, so unchanged files are only read and keep their mtime.
+    Returns whether the file was written; the content is also fed to digest
+    (a hashlib object), if given.
+    """
+    chunks = iter(chunks)
+    with contextlib.ExitStack() as stack:
         try:
-            rendered_code = template.render(shape=shape_data)
-            with open(output_filename, "w", encoding="utf-8") as f:
-                f.write(rendered_code)
-            print(f"  Successfully generated: {output_filename}")
-            shapes_processed += 1
-        except Exception as e:
-            print(f"  Error generating or writing file for shape {shape_uri}: {e}", file=sys.stderr)
+            existing = stack.enter_context(open(path, "rb"))
+        except OSError:
+            existing = None
+        matched = 0 # Length of the prefix that equals the existing file
+        output = None
+        temp_path = None
+
+        def start_writing():
+            import tempfile # Only needed when something is written
+            nonlocal output, temp_path
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-", suffix=".cs")
+            output = stack.enter_context(open(fd, "wb"))
+            if matched:
+                existing.seek(0)
+                for block in iter(lambda: existing.read(min(COPY_BLOCK_SIZE, matched - output.tell())), b""):
+                    output.write(block)
+
+        try:
+            # Jinja yields many short strings, so they are encoded, hashed and
+            # compared or written in batches of WRITE_BATCH_CHUNKS
+            while batch := list(itertools.islice(chunks, WRITE_BATCH_CHUNKS)):
+                data = "".join(batch).encode("utf-8")
+                if digest is not None:
+                    digest.update(data)
+                if output is None and existing is not None and existing.read(len(data)) == data:
+                    matched += len(data)
+                    continue
+                if output is None:
+                    start_writing()
+                output.write(data)
+            if output is None:
+                if existing is not None and not existing.read(1):
+                    return False
+                start_writing()
+            output.close()
+            copy_target_mode(temp_path, path)
+            os.replace(temp_path, path)
+            return True
+        except BaseException:
+            if temp_path is not None:
+                if output is not None:
+                    output.close()
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            raise
+
+
+def write_atomic(path, content):
+    """Writes through a temporary file in the same directory and renames it into place."""
+    import tempfile # Only needed when something is written
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".cs")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        copy_target_mode(temp_path, path)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def copy_target_mode(temp_path, path):
+    """
+    mkstemp creates files readable only by their owner and os.replace keeps that,
+    so the temporary file gets the mode of the file it replaces, or the mode a
+    plain open() would give a new file.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = 0o666 & ~current_umask()
+    os.chmod(temp_path, mode)
+
 
+@functools.cache
+def current_umask():
+    """Reads the process umask, which can only be done by setting it."""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
 
-    print(f"\nFinished processing. Generated {shapes_processed} C# files.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,880 @@
+"""Lightweight RDF loading for the OSLC4Net code generation scripts.
+
+The generators only read a handful of predicates from the shapes and vocabulary
+files. For N-Triples input, ``load_index`` streams the file once and keeps only
+those triples in a small subject/predicate index. Other RDF formats are parsed
+with rdflib and copied into the same index, so the generators see one term model
+regardless of the input format.
+
+``load_compact_index`` returns the same triples as a ``CompactIndex``, which
+interns every term once and keeps the triples in integer ``array`` columns.
+
+Parsed files can be kept in a ``ParseCache`` so that unchanged inputs are not
+parsed again on the next run. With ``jobs``, large N-Triples inputs are split
+into line-aligned byte ranges that worker processes parse in parallel; every
+range of a file keeps that file's blank node scope, and the per-range indexes
+are merged in input order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import marshal
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import TypeVar
+
+
+class Namespace(str):
+    """URI prefix that builds ``IRI`` terms by attribute or item access."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> IRI:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return IRI(self + name)
+
+    def __getitem__(self, name: str) -> IRI:  # type: ignore[override]
+        return IRI(self + name)
+
+    @property
+    def title(self) -> IRI:  # type: ignore[override]
+        # str.title would otherwise shadow dcterms:title
+        return IRI(self + "title")
+
+
+class IRI(str):
+    """An IRI term. Compares and hashes like its plain string value."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"IRI({str.__repr__(self)})"
+
+
+class BNode(str):
+    """A blank node term, stored as ``_:<scope>.<label>``."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"BNode({str.__repr__(self)})"
+
+
+class Literal:
+    """A literal term with an optional datatype IRI or language tag."""
+
+    __slots__ = ("lexical", "datatype", "language")
+
+    def __init__(self, lexical: str, datatype: str | None = None, language: str | None = None):
+        self.lexical = lexical
+        self.datatype = datatype
+        self.language = language
+
+    def __str__(self) -> str:
+        return self.lexical
+
+    def __repr__(self) -> str:
+        return f"Literal({self.lexical!r}, datatype={self.datatype!r}, language={self.language!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, Literal)
+            and self.lexical == other.lexical
+            and self.datatype == other.datatype
+            and self.language == other.language
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.lexical, self.datatype, self.language))
+
+    def to_text(self) -> str:
+        """Render the value the way ``str(rdflib.Literal(...).toPython())`` does."""
+        if self.datatype == XSD_BOOLEAN:
+            return "True" if self.lexical.lower() in ("1", "true") else "False"
+        if self.datatype in INTEGER_DATATYPES:
+            try:
+                return str(int(self.lexical))
+            except ValueError:
+                return self.lexical
+        return self.lexical
+
+
+Term = IRI | BNode | Literal
+
+RDF = Namespace("http://www.w3.org/1999/02/22-rdf-syntax-ns#")
+RDFS = Namespace("http://www.w3.org/2000/01/rdf-schema#")
+OWL = Namespace("http://www.w3.org/2002/07/owl#")
+XSD = Namespace("http://www.w3.org/2001/XMLSchema#")
+DCTERMS = Namespace("http://purl.org/dc/terms/")
+VANN = Namespace("http://purl.org/vocab/vann/")
+
+RDF_TYPE = RDF.type
+XSD_BOOLEAN = XSD.boolean
+INTEGER_DATATYPES = frozenset(
+    XSD + name
+    for name in (
+        "byte",
+        "int",
+        "integer",
+        "long",
+        "negativeInteger",
+        "nonNegativeInteger",
+        "nonPositiveInteger",
+        "positiveInteger",
+        "short",
+        "unsignedByte",
+        "unsignedInt",
+        "unsignedLong",
+        "unsignedShort",
+    )
+)
+
+
+class RdfSyntaxError(ValueError):
+    """Raised when an input file cannot be parsed."""
+
+
+class TripleSink:
+    """What the readers fill: a predicate filter, ``add()`` and a count of triples read.
+
+    ``reverse_predicates`` are the predicates whose ``subjects()`` lookups should
+    not scan the whole index (typically ``rdf:type``).
+    """
+
+    def __init__(
+        self,
+        predicates: Iterable[str] | None = None,
+        reverse_predicates: Iterable[str] = (RDF_TYPE,),
+    ):
+        self.predicates = frozenset(predicates) if predicates is not None else None
+        self.reverse_predicates = frozenset(reverse_predicates)
+        self.triples_read = 0
+
+    def wants(self, predicate: str) -> bool:
+        return self.predicates is None or predicate in self.predicates
+
+    def add(self, subject: Term, predicate: str, obj: Term) -> None:
+        raise NotImplementedError
+
+    def update(self, other: TripleIndex | CompactIndex) -> None:
+        """Add the triples of ``other``, in its order, and its count of triples read."""
+        add = self.add
+        for subject, predicate, obj in other:
+            add(subject, predicate, obj)
+        self.triples_read += other.triples_read
+
+
+class TripleIndex(TripleSink):
+    """Read-only view over the triples a generator asked for.
+
+    Triples are indexed by subject and predicate. Predicates listed in
+    ``reverse_predicates`` are also indexed by object, so ``subjects()`` lookups
+    on them do not scan the whole index. Iteration order follows input order,
+    and duplicate triples are dropped.
+    """
+
+    def __init__(
+        self,
+        predicates: Iterable[str] | None = None,
+        reverse_predicates: Iterable[str] = (RDF_TYPE,),
+    ):
+        super().__init__(predicates, reverse_predicates)
+        self._spo: dict[Term, dict[str, dict[Term, None]]] = {}
+        self._pos: dict[str, dict[Term, dict[Term, None]]] = {}
+        self._count = 0
+
+    def add(self, subject: Term, predicate: str, obj: Term) -> None:
+        objects = self._spo.setdefault(subject, {}).setdefault(predicate, {})
+        if obj in objects:
+            return
+
+        objects[obj] = None
+        self._count += 1
+        if predicate in self.reverse_predicates:
+            self._pos.setdefault(predicate, {}).setdefault(obj, {})[subject] = None
+
+    def objects(self, subject: Term, predicate: str) -> Iterator[Term]:
+        return iter(self._spo.get(subject, {}).get(predicate, ()))
+
+    def subjects(self, predicate: str, object: Term) -> Iterator[Term]:  # noqa: A002 - mirrors rdflib
+        if predicate in self.reverse_predicates:
+            return iter(self._pos.get(predicate, {}).get(object, ()))
+
+        return (
+            subject
+            for subject, predicates in self._spo.items()
+            if object in predicates.get(predicate, ())
+        )
+
+    def predicate_objects(self, subject: Term) -> Iterator[tuple[str, Term]]:
+        for predicate, objects in self._spo.get(subject, {}).items():
+            for obj in objects:
+                yield predicate, obj
+
+    def predicate_map(self, subject: Term) -> Mapping[str, Collection[Term]]:
+        """All objects of ``subject`` grouped by predicate. Treat the result as read-only."""
+        return self._spo.get(subject, {})
+
+    def value(self, subject: Term, predicate: str) -> Term | None:
+        return next(self.objects(subject, predicate), None)
+
+    def __contains__(self, triple: tuple[Term, str, Term]) -> bool:
+        subject, predicate, obj = triple
+        return obj in self._spo.get(subject, {}).get(predicate, ())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[tuple[Term, str, Term]]:
+        for subject, predicates in self._spo.items():
+            for predicate, objects in predicates.items():
+                for obj in objects:
+                    yield subject, predicate, obj
+
+
+class CompactIndexBuilder(TripleSink):
+    """Collects triples as interned term IDs; ``build()`` turns them into a ``CompactIndex``."""
+
+    def __init__(
+        self,
+        predicates: Iterable[str] | None = None,
+        reverse_predicates: Iterable[str] = (RDF_TYPE,),
+    ):
+        super().__init__(predicates, reverse_predicates)
+        self._ids: dict[Term, int] = {}
+        self._column = array("I")
+
+    def add(self, subject: Term, predicate: str, obj: Term) -> None:
+        ids = self._ids
+        append = self._column.append
+        append(ids.setdefault(subject, len(ids)))
+        append(ids.setdefault(predicate, len(ids)))  # type: ignore[arg-type]
+        append(ids.setdefault(obj, len(ids)))
+
+    def build(self) -> CompactIndex:
+        """Drop duplicate triples and sort the rest into the column layout of ``CompactIndex``.
+
+        The builder cannot be used afterwards. Sort keys are packed into single
+        ints whose low digits are the row they belong to, so no key tuples or key
+        functions are needed.
+        """
+        column, ids = self._column, self._ids
+        self._column = array("I")
+        term_count, row_count = len(ids), len(column) // 3
+        seen: set[int] = set()
+        subject_ranks: dict[int, int] = {}
+        first_positions: dict[int, int] = {}
+        keys: list[int] = []
+        for position, subject, predicate, obj in zip(range(row_count), column[0::3], column[1::3], column[2::3]):
+            pair = subject * term_count + predicate
+            triple = pair * term_count + obj
+            if triple in seen:
+                continue
+            seen.add(triple)
+            rank = subject_ranks.setdefault(subject, len(subject_ranks))
+            first = first_positions.setdefault(pair, position)
+            # Same order as TripleIndex: subjects, then their predicates, by first appearance
+            keys.append((rank * row_count + first) * row_count + position)
+        del seen, first_positions
+
+        keys.sort()
+        positions = array("I", [key % row_count for key in keys])
+        del keys
+
+        # Renumber so that subject IDs are their ranks and the subject column is sorted
+        old_terms = list(ids)
+        renumbered = array("I", bytes(4 * term_count))
+        terms: list[Term] = [old_terms[old_id] for old_id in subject_ranks]
+        for new_id, old_id in enumerate(subject_ranks):
+            renumbered[old_id] = new_id
+        for old_id, term in enumerate(old_terms):
+            if old_id not in subject_ranks:
+                renumbered[old_id] = len(terms)
+                terms.append(term)
+        del old_terms
+        for term, old_id in ids.items():
+            ids[term] = renumbered[old_id]
+
+        subjects = array("I", [renumbered[column[3 * position]] for position in positions])
+        predicates = array("I", [renumbered[column[3 * position + 1]] for position in positions])
+        objects = array("I", [renumbered[column[3 * position + 2]] for position in positions])
+        del column
+
+        # Like TripleIndex, subjects() follows input order on reverse predicates and subject order on the rest
+        reverse_ids = {ids[predicate] for predicate in self.reverse_predicates if predicate in ids}
+        rows = len(positions)
+        object_keys = [
+            ((predicate * term_count + obj) * row_count + (position if predicate in reverse_ids else row)) * rows + row
+            for row, (predicate, obj, position) in enumerate(zip(predicates, objects, positions))
+        ]
+        object_keys.sort()
+        by_object = array("I", [key % rows for key in object_keys]) if rows else array("I")
+
+        index = CompactIndex(
+            self.predicates,
+            self.reverse_predicates,
+            terms,
+            ids,
+            len(subject_ranks),
+            (subjects, predicates, objects, by_object),
+        )
+        index.triples_read = self.triples_read
+        return index
+
+
+class CompactIndex:
+    """Read-only triple store with interned term IDs in ``array`` columns.
+
+    Every distinct term is stored once; triples are three columns of term IDs,
+    grouped by subject, so they take a fraction of the memory of a
+    ``TripleIndex`` and the garbage collector never walks them. Subject lookups
+    binary-search the subject column, and ``subjects()`` binary-searches a row
+    permutation sorted by predicate and object. Results and iteration order are
+    those of a ``TripleIndex`` holding the same triples.
+    """
+
+    __slots__ = (
+        "predicates",
+        "reverse_predicates",
+        "triples_read",
+        "_terms",
+        "_ids",
+        "_subject_count",
+        "_subjects",
+        "_predicates",
+        "_objects",
+        "_by_object",
+    )
+
+    def __init__(
+        self,
+        predicates: frozenset[str] | None,
+        reverse_predicates: frozenset[str],
+        terms: list[Term],
+        ids: dict[Term, int],
+        subject_count: int,
+        columns: tuple[array, array, array, array],
+    ):
+        self.predicates = predicates
+        self.reverse_predicates = reverse_predicates
+        self.triples_read = 0
+        self._terms = terms
+        self._ids = ids
+        self._subject_count = subject_count
+        self._subjects, self._predicates, self._objects, self._by_object = columns
+
+    def _rows(self, subject: Term) -> range:
+        subject_id = self._ids.get(subject)
+        if subject_id is None or subject_id >= self._subject_count:
+            return range(0)
+        start = bisect_left(self._subjects, subject_id)
+        return range(start, bisect_right(self._subjects, subject_id, start))
+
+    def objects(self, subject: Term, predicate: str) -> Iterator[Term]:
+        predicate_id = self._ids.get(predicate)
+        terms, predicates, objects = self._terms, self._predicates, self._objects
+        return (terms[objects[row]] for row in self._rows(subject) if predicates[row] == predicate_id)
+
+    def subjects(self, predicate: str, object: Term) -> Iterator[Term]:  # noqa: A002 - mirrors rdflib
+        key = (self._ids.get(predicate), self._ids.get(object))
+        if None in key:
+            return iter(())
+
+        predicates, objects, by_object = self._predicates, self._objects, self._by_object
+        start = bisect_left(by_object, key, key=lambda row: (predicates[row], objects[row]))
+        end = bisect_right(by_object, key, start, key=lambda row: (predicates[row], objects[row]))
+        return (self._terms[self._subjects[row]] for row in by_object[start:end])
+
+    def predicate_objects(self, subject: Term) -> Iterator[tuple[str, Term]]:
+        terms = self._terms
+        for row in self._rows(subject):
+            yield terms[self._predicates[row]], terms[self._objects[row]]  # type: ignore[misc]
+
+    def predicate_map(self, subject: Term) -> Mapping[str, Collection[Term]]:
+        """All objects of ``subject`` grouped by predicate; a new dict on every call."""
+        result: dict[str, list[Term]] = {}
+        for predicate, obj in self.predicate_objects(subject):
+            result.setdefault(predicate, []).append(obj)
+        return result
+
+    def value(self, subject: Term, predicate: str) -> Term | None:
+        return next(self.objects(subject, predicate), None)
+
+    def __contains__(self, triple: tuple[Term, str, Term]) -> bool:
+        subject, predicate, obj = triple
+        predicate_id, object_id = self._ids.get(predicate), self._ids.get(obj)
+        return any(
+            self._predicates[row] == predicate_id and self._objects[row] == object_id for row in self._rows(subject)
+        )
+
+    def __len__(self) -> int:
+        return len(self._subjects)
+
+    def __iter__(self) -> Iterator[tuple[Term, str, Term]]:
+        terms = self._terms
+        for subject, predicate, obj in zip(self._subjects, self._predicates, self._objects):
+            yield terms[subject], terms[predicate], terms[obj]  # type: ignore[misc]
+
+
+def guess_format(path: Path | str, default: str | None = "nt") -> str | None:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".nt":
+        return "nt"
+    if suffix in {".ttl", ".turtle"}:
+        return "turtle"
+    if suffix == ".rdf":
+        return "xml"
+    return default
+
+
+def load_index(
+    paths: Iterable[Path | str],
+    *,
+    predicates: Iterable[str] | None = None,
+    default_format: str | None = "nt",
+    cache: ParseCache | None = None,
+    jobs: int = 1,
+) -> TripleIndex:
+    """Load ``paths`` into one ``TripleIndex``, keeping only ``predicates`` if given.
+
+    ``.nt`` files take the streaming fast path; anything else goes through rdflib.
+    Files whose format cannot be guessed use ``default_format`` (``None`` lets
+    rdflib decide). Blank node labels are scoped to the file they appear in.
+
+    With ``jobs`` other than 1 (0: one per CPU), the N-Triples files that are not
+    in ``cache`` are parsed by that many worker processes if together they are at
+    least ``PARALLEL_MIN_BYTES``. The result is the same as a sequential load.
+    """
+    return _load_into(TripleIndex(predicates), paths, default_format, cache, jobs)
+
+
+def load_compact_index(
+    paths: Iterable[Path | str],
+    *,
+    predicates: Iterable[str] | None = None,
+    default_format: str | None = "nt",
+    cache: ParseCache | None = None,
+    jobs: int = 1,
+) -> CompactIndex:
+    """Like ``load_index``, but return a ``CompactIndex``; no ``TripleIndex`` of all inputs is built."""
+    return _load_into(CompactIndexBuilder(predicates), paths, default_format, cache, jobs).build()
+
+
+_Sink = TypeVar("_Sink", bound=TripleSink)
+
+
+def _load_into(
+    index: _Sink, paths: Iterable[Path | str], default_format: str | None, cache: ParseCache | None, jobs: int
+) -> _Sink:
+    sources = [(str(scope), path, guess_format(path, default_format)) for scope, path in enumerate(paths)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1:
+        _load_in_parallel(sources, index, cache, jobs)
+        return index
+
+    for scope, path, source_format in sources:
+        if cache is None:
+            read_file(path, source_format, index, scope=scope)
+        else:
+            cache.load(path, source_format, index, scope=scope)
+
+    return index
+
+
+# Below this many bytes of N-Triples to parse, starting worker processes costs more than it saves.
+PARALLEL_MIN_BYTES = 1024 * 1024
+# Smallest byte range handed to one worker.
+MIN_CHUNK_BYTES = 256 * 1024
+
+
+def _load_in_parallel(
+    sources: list[tuple[str, Path | str, str | None]], index: TripleSink, cache: ParseCache | None, jobs: int
+) -> None:
+    # N-Triples files without a cache entry are split across the workers up front; everything
+    # is then added to index in input order, as _load_into does. Only files whose triples are
+    # stored in the cache are collected in a part of their own first.
+    entries: dict[str, Path] = {}
+    pending: list[tuple[str, Path | str]] = []
+    for scope, path, source_format in sources:
+        if cache is not None:
+            entry = entries[scope] = cache.entry(path, source_format, index.predicates)
+            if entry.is_file():
+                continue
+        if source_format == "nt":
+            pending.append((scope, path))
+
+    chunk_counts: dict[str, int] = {}
+    chunks: Iterator[bytes] = iter(())
+    with contextlib.ExitStack() as stack:
+        total_bytes = sum(os.path.getsize(path) for _, path in pending)
+        if pending and total_bytes >= PARALLEL_MIN_BYTES:
+            from concurrent.futures import ProcessPoolExecutor
+
+            chunk_bytes = max(MIN_CHUNK_BYTES, -(-total_bytes // jobs))
+            tasks = []
+            for scope, path in pending:
+                ranges = line_ranges(path, chunk_bytes)
+                chunk_counts[scope] = len(ranges)
+                tasks.extend(
+                    (str(path), start, end, scope, index.predicates, index.reverse_predicates) for start, end in ranges
+                )
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=min(jobs, len(tasks))))
+            chunks = executor.map(_read_ntriples_range, tasks)
+
+        for scope, path, source_format in sources:
+            # Chunks arrive in task order, so each file takes its own even if it is not used
+            parsed = [next(chunks) for _ in range(chunk_counts.get(scope, 0))]
+            entry = entries.get(scope)
+            if entry is not None and cache.try_load(entry, index, scope=scope):  # type: ignore[union-attr]
+                continue
+
+            part = index if entry is None else TripleIndex(index.predicates, index.reverse_predicates)
+            if parsed:
+                for data in parsed:
+                    decode_index(data, part, scope=scope)
+            elif source_format == "nt":
+                read_ntriples(path, part, scope=scope)
+            else:
+                read_file(path, source_format, part, scope=scope)
+            if entry is not None:
+                cache.store(entry, part, scope=scope)  # type: ignore[union-attr, arg-type]
+                index.update(part)
+
+
+def line_ranges(path: Path | str, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split ``path`` into byte ranges of about ``chunk_bytes`` that start and end at line breaks."""
+    size = os.path.getsize(path)
+    if size <= chunk_bytes:
+        return [(0, size)]
+
+    import mmap
+
+    ranges = []
+    with open(path, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            newline = data.find(b"\n", min(start + chunk_bytes, size) - 1)
+            end = size if newline < 0 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _read_ntriples_range(task: tuple[str, int, int, str, frozenset[str] | None, frozenset[str]]) -> bytes:
+    """Worker: parse one byte range of an N-Triples file and return it encoded for ``decode_index``."""
+    import mmap
+
+    path, start, end, scope, predicates, reverse_predicates = task
+    part = TripleIndex(predicates, reverse_predicates)
+    if end > start:
+        with open(path, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+
+            def location(line_number: int) -> str:
+                # Lines before the range are counted only when an error is reported
+                preceding = data[:start].count(b"\n")
+                return f"{path}:{preceding + line_number}"
+
+            _read_ntriples_lines(data[start:end].decode("utf-8").split("\n"), part, scope=scope, location=location)
+    return encode_index(part, scope=scope)
+
+
+def read_file(path: Path | str, source_format: str | None, index: TripleSink, *, scope: str) -> None:
+    if source_format == "nt":
+        read_ntriples(path, index, scope=scope)
+    else:
+        read_with_rdflib(path, source_format, index, scope=scope)
+
+
+_TRIPLE = re.compile(
+    r"[ \t]*(?:<([^>]*)>|_:(\S*[^\s.]))"
+    r"[ \t]*<([^>]*)>[ \t]*"
+    r"(?:<([^>]*)>|_:(\S*[^\s.])|\"((?:[^\"\\]|\\.)*)\"(?:@([A-Za-z0-9-]+)|\^\^<([^>]*)>)?)"
+    r"[ \t]*\.\s*(?:#.*)?$"
+)
+_ESCAPE = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))")
+_ECHAR = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f", '"': '"', "'": "'", "\\": "\\"}
+
+
+def read_ntriples(path: Path | str, index: TripleSink, *, scope: str = "0") -> None:
+    """Stream an N-Triples file into ``index``, one line at a time."""
+    with open(path, encoding="utf-8") as source:
+        _read_ntriples_lines(source, index, scope=scope, location=lambda line_number: f"{path}:{line_number}")
+
+
+def _read_ntriples_lines(
+    lines: Iterable[str], index: TripleSink, *, scope: str, location: Callable[[int], str]
+) -> None:
+    iris: dict[str, IRI] = {}
+    wants = index.wants
+    add = index.add
+    match = _TRIPLE.match
+
+    def iri(value: str) -> IRI:
+        term = iris.get(value)
+        if term is None:
+            term = iris[value] = IRI(_unescape(value) if "\\" in value else value)
+        return term
+
+    for line_number, line in enumerate(lines, start=1):
+        m = match(line)
+        if m is None:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            raise RdfSyntaxError(f"{location(line_number)}: invalid N-Triples statement: {stripped}")
+
+        index.triples_read += 1
+        s_iri, s_blank, predicate, o_iri, o_blank, lexical, language, datatype = m.groups()
+        predicate = iri(predicate)
+        if not wants(predicate):
+            continue
+
+        subject = iri(s_iri) if s_iri is not None else BNode(f"_:{scope}.{s_blank}")
+        if o_iri is not None:
+            obj: Term = iri(o_iri)
+        elif o_blank is not None:
+            obj = BNode(f"_:{scope}.{o_blank}")
+        else:
+            obj = Literal(
+                _unescape(lexical) if "\\" in lexical else lexical,
+                iri(datatype) if datatype is not None else None,
+                language,
+            )
+        add(subject, predicate, obj)
+
+
+def read_with_rdflib(
+    path: Path | str, source_format: str | None, index: TripleSink, *, scope: str = "0"
+) -> None:
+    """Parse ``path`` with rdflib and copy the wanted triples into ``index``."""
+    import rdflib
+    from rdflib.exceptions import ParserError
+
+    class IndexSink(rdflib.Graph):
+        # Receives triples from the parser in document order instead of storing them
+        def add(self, triple):  # type: ignore[no-untyped-def, override]
+            subject, predicate, obj = triple
+            index.triples_read += 1
+            if index.wants(str(predicate)):
+                index.add(_from_rdflib(subject, scope), IRI(predicate), _from_rdflib(obj, scope))
+            return self
+
+    sink = IndexSink()
+    try:
+        sink.parse(source=str(path), format=source_format)
+    except ParserError as error:
+        raise RdfSyntaxError(f"{path}: {error}") from error
+
+    # Some parsers (JSON-LD) write to the store directly instead of calling add()
+    for triple in rdflib.Graph.__iter__(sink):
+        IndexSink.add(sink, triple)
+
+
+def _from_rdflib(term: object, scope: str) -> Term:
+    import rdflib
+
+    if isinstance(term, rdflib.Literal):
+        return Literal(
+            str(term),
+            IRI(term.datatype) if term.datatype is not None else None,
+            term.language,
+        )
+    if isinstance(term, rdflib.BNode):
+        return BNode(f"_:{scope}.{term}")
+    return IRI(term)
+
+
+def _unescape(value: str) -> str:
+    def replace(match: re.Match[str]) -> str:
+        short, long, char = match.groups()
+        if short or long:
+            return chr(int(short or long, 16))
+        return _ECHAR.get(char, "\\" + char)
+
+    return _ESCAPE.sub(replace, value)
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "oslc4net" / "codegen"
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# Bump whenever the readers or the entry layout change, so stale entries are never reused.
+CACHE_VERSION = 1
+
+_IRI_TERM, _BLANK_TERM, _LITERAL_TERM = 0, 1, 2
+
+
+class ParseCache:
+    """On-disk cache of parsed input files.
+
+    Entries are keyed by the SHA-256 of the file content, the parser format, the
+    predicate filter and ``CACHE_VERSION``. Each entry is a marshal-encoded term
+    table plus an integer triple column. Once the directory grows past
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: Path | str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_SIZE):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, content: bytes, source_format: str | None, predicates: frozenset[str] | None) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}\0{source_format}\0".encode())
+        digest.update("\0".join(sorted(predicates)).encode() if predicates is not None else b"*")
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(content).digest())
+        return digest.hexdigest()
+
+    def entry(self, path: Path | str, source_format: str | None, predicates: frozenset[str] | None) -> Path:
+        return self.directory / f"{self.key(Path(path).read_bytes(), source_format, predicates)}.bin"
+
+    def load(self, path: Path | str, source_format: str | None, index: TripleSink, *, scope: str) -> None:
+        """Add the triples of ``path`` to ``index``, parsing the file only on a cache miss."""
+        entry = self.entry(path, source_format, index.predicates)
+        if self.try_load(entry, index, scope=scope):
+            return
+
+        part = TripleIndex(index.predicates, index.reverse_predicates)
+        read_file(path, source_format, part, scope=scope)
+        self.store(entry, part, scope=scope)
+        index.update(part)
+
+    def try_load(self, entry: Path, index: TripleSink, *, scope: str) -> bool:
+        """Add the triples cached in ``entry`` to ``index``; ``False`` (a miss) if there are none."""
+        try:
+            data = entry.read_bytes()
+        except OSError:
+            data = None
+
+        if data is not None:
+            try:
+                decode_index(data, index, scope=scope)
+            except (EOFError, TypeError, ValueError):
+                pass  # Corrupt or foreign entry: parse again and overwrite it
+            else:
+                self.hits += 1
+                _touch(entry)
+                return True
+
+        self.misses += 1
+        return False
+
+    def store(self, entry: Path, index: TripleIndex | CompactIndex, *, scope: str) -> None:
+        self._store(entry, encode_index(index, scope=scope))
+
+    def _store(self, entry: Path, data: bytes) -> None:
+        import tempfile  # only cache misses write, so hits skip the import
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as temp:
+                temp.write(data)
+            os.replace(temp_name, entry)
+            self._evict()
+        except OSError:
+            pass  # The cache is an optimization; a read-only or full disk must not fail generation
+
+    def _evict(self) -> None:
+        entries = []
+        for candidate in self.directory.glob("*.bin"):
+            try:
+                stat = candidate.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, candidate))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, candidate in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                candidate.unlink()
+            except OSError:
+                continue
+            total -= size
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("parsing")
+    group.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory for cached parse results (default: {DEFAULT_CACHE_DIR}).",
+    )
+    group.add_argument("--no-cache", action="store_true", help="Always parse the input files.")
+    group.add_argument(
+        "--parse-jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse large N-Triples inputs in N worker processes (0: one per CPU; default: 1).",
+    )
+
+
+def cache_from_args(args: argparse.Namespace) -> ParseCache | None:
+    return None if args.no_cache else ParseCache(args.cache_dir)
+
+
+def encode_index(index: TripleIndex | CompactIndex, *, scope: str | None = None) -> bytes:
+    """Serialize ``index`` as a marshal-encoded term table and integer triple column.
+
+    With ``scope``, blank node labels are stored without that file scope so that
+    ``decode_index`` can re-scope them.
+    """
+    blank_prefix = f"_:{scope}." if scope is not None else ""
+    term_ids: dict[tuple, int] = {}
+    column = array("I")
+    for triple in index:
+        for term in triple:
+            if isinstance(term, Literal):
+                key: tuple = (_LITERAL_TERM, term.lexical, term.datatype and str(term.datatype), term.language)
+            elif isinstance(term, BNode):
+                key = (_BLANK_TERM, term[len(blank_prefix) :])
+            else:
+                key = (_IRI_TERM, str(term))
+            column.append(term_ids.setdefault(key, len(term_ids)))
+
+    return marshal.dumps((CACHE_VERSION, list(term_ids), column.tobytes(), index.triples_read))
+
+
+def decode_index(data: bytes, index: _Sink, *, scope: str | None = None) -> _Sink:
+    """Add the triples serialized by ``encode_index`` to ``index`` and return it."""
+    blank_prefix = f"_:{scope}." if scope is not None else ""
+    version, keys, column_bytes, triples_read = marshal.loads(data)
+    if version != CACHE_VERSION:
+        raise ValueError(f"unsupported cache entry version {version}")
+
+    terms: list[Term] = []
+    for key in keys:
+        if key[0] == _IRI_TERM:
+            terms.append(IRI(key[1]))
+        elif key[0] == _BLANK_TERM:
+            terms.append(BNode(blank_prefix + key[1]))
+        else:
+            terms.append(Literal(key[1], IRI(key[2]) if key[2] is not None else None, key[3]))
+
+    column = array("I")
+    column.frombytes(column_bytes)
+    add = index.add
+    for position in range(0, len(column), 3):
+        add(terms[column[position]], terms[column[position + 1]], terms[column[position + 2]])
+    index.triples_read += triples_read
+    return index
+
+
+def _touch(entry: Path) -> None:
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
@@ -0,0 +1,86 @@
+"""Compact shape IR read by the OSLC4Net.CodeGen source generator.
+
+The Roslyn generator otherwise tokenizes the ``.nt`` AdditionalFiles on every
+compilation. ``oslc_domain_seed_gen.py --ir FILE`` writes the triples it reads
+as a pre-resolved, interned table instead, so the generator does one linear
+read with no unescaping and no per-triple hashing of duplicate keys.
+
+Format (``oslc4net-ir`` version 1), UTF-8 text with ``\\n`` line ends::
+
+    oslc4net-ir 1 <string count> <group count>
+    <string>                      (string count lines)
+    <subject> <predicate> <object> [<object> ...]   (group count lines)
+
+Every IRI, blank node label, literal value and language tag is stored once in
+the string table, sorted ordinally; ``\\``, newline and carriage return are
+escaped as ``\\\\``, ``\\n`` and ``\\r``. A group holds all objects of one
+subject and predicate in input order; groups are sorted by subject, then
+predicate. Terms reference the table by index: ``<n>`` is an IRI, ``_<n>`` a
+blank node, ``"<n>`` a literal and ``"<n>@<m>`` a literal with language
+``<m>``. Literal datatypes are dropped, as the generator does not use them.
+"""
+
+from __future__ import annotations
+
+from rdf_index import DCTERMS, RDF_TYPE, RDFS, VANN, BNode, CompactIndex, Literal, Term, TripleIndex
+from shape_model import OSLC
+
+IR_MAGIC = "oslc4net-ir"
+IR_VERSION = 1
+
+# Everything OslcDomainGenerator reads from the shapes and vocabulary files
+IR_PREDICATES = (
+    RDF_TYPE,
+    RDFS.isDefinedBy,
+    RDFS.subClassOf,
+    VANN.preferredNamespacePrefix,
+    DCTERMS.title,
+    DCTERMS.description,
+    OSLC.describes,
+    OSLC.property,
+    OSLC.name,
+    OSLC.propertyDefinition,
+    OSLC.occurs,
+    OSLC.readOnly,
+    OSLC.representation,
+    OSLC.valueType,
+    OSLC.range,
+)
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r"})
+
+
+def encode_ir(index: TripleIndex | CompactIndex) -> str:
+    """Render the triples of ``index`` in the IR format described above."""
+    groups: dict[tuple[Term, str], list[Term]] = {}
+    strings: set[str] = set()
+    for subject, predicate, obj in index:
+        groups.setdefault((subject, predicate), []).append(obj)
+        strings.add(subject)
+        strings.add(predicate)
+        if isinstance(obj, Literal):
+            strings.add(obj.lexical)
+            if obj.language:
+                strings.add(obj.language)
+        else:
+            strings.add(obj)
+
+    table = sorted(strings)
+    ids = {value: position for position, value in enumerate(table)}
+
+    def term(value: Term) -> str:
+        if isinstance(value, Literal):
+            if value.language:
+                return f'"{ids[value.lexical]}@{ids[value.language]}'
+            return f'"{ids[value.lexical]}'
+        if isinstance(value, BNode):
+            return f"_{ids[value]}"
+        return str(ids[value])
+
+    lines = [f"{IR_MAGIC} {IR_VERSION} {len(table)} {len(groups)}"]
+    lines.extend(value.translate(_ESCAPES) for value in table)
+    for (subject, predicate), objects in sorted(groups.items(), key=lambda item: (ids[item[0][0]], ids[item[0][1]])):
+        lines.append(f"{term(subject)} {ids[predicate]} {' '.join(term(obj) for obj in objects)}")
+
+    lines.append("")
+    return "\n".join(lines)
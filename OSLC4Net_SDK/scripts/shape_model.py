@@ -0,0 +1,140 @@
+"""Pre-indexed view of the OSLC resource shapes in a ``TripleIndex`` or ``CompactIndex``.
+
+``ShapeModel.from_index`` reads each shape exactly once, and each property node
+a shape links with ``oslc:property`` the first time it is asked for. The values
+the generators use are kept in small ``__slots__`` records, so code that walks
+shapes does not go back to the graph for every attribute, and runs that only
+look at the shapes never build property records.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+
+from rdf_index import DCTERMS, IRI, RDF, RDF_TYPE, CompactIndex, Literal, Namespace, Term, TripleIndex
+
+OSLC = Namespace("http://open-services.net/ns/core#")
+
+# Everything ShapeModel reads; pass these to load_index() to keep the index small.
+SHAPE_PREDICATES = (
+    RDF_TYPE,
+    DCTERMS.title,
+    DCTERMS.description,
+    OSLC.describes,
+    OSLC.property,
+    OSLC.name,
+    OSLC.occurs,
+    OSLC.propertyDefinition,
+    OSLC.valueType,
+    OSLC.range,
+    OSLC.representation,
+    OSLC.readOnly,
+)
+
+
+class PropertyRecord:
+    """The values of one ``oslc:Property`` node.
+
+    Literal-valued fields hold the text of the first value (IRIs are accepted as
+    text too). IRI-valued fields hold the first value if it is an IRI, else ``None``.
+    """
+
+    __slots__ = (
+        "node",
+        "typed",
+        "name",
+        "title",
+        "description",
+        "occurs",
+        "property_definition",
+        "value_type",
+        "range",
+        "representation",
+        "read_only",
+    )
+
+    def __init__(self, node: Term, predicates: Mapping[str, Iterable[Term]]):
+        self.node = node
+        self.typed: bool = OSLC.Property in predicates.get(RDF_TYPE, ())
+        self.name = literal_text(first(predicates, OSLC.name))
+        self.title = literal_text(first(predicates, DCTERMS.title))
+        self.description = literal_text(first(predicates, DCTERMS.description))
+        self.occurs = iri_text(first(predicates, OSLC.occurs))
+        self.property_definition = iri_text(first(predicates, OSLC.propertyDefinition))
+        self.value_type = iri_text(first(predicates, OSLC.valueType))
+        self.range = iri_text(first(predicates, OSLC.range))
+        self.representation = iri_text(first(predicates, OSLC.representation))
+        self.read_only = literal_text(first(predicates, OSLC.readOnly))
+
+    def __repr__(self) -> str:
+        return f"PropertyRecord({self.node!r}, name={self.name!r})"
+
+
+class ShapeRecord:
+    """The values of one ``oslc:ResourceShape`` and its property links in input order."""
+
+    __slots__ = ("node", "title", "description", "describes", "property_nodes")
+
+    def __init__(self, node: Term, predicates: Mapping[str, Iterable[Term]]):
+        self.node = node
+        self.title = literal_text(first(predicates, DCTERMS.title))
+        self.description = literal_text(first(predicates, DCTERMS.description))
+        self.describes = iri_text(first(predicates, OSLC.describes))
+        self.property_nodes: tuple[Term, ...] = tuple(predicates.get(OSLC.property, ()))
+
+    def __repr__(self) -> str:
+        return f"ShapeRecord({self.node!r}, properties={len(self.property_nodes)})"
+
+
+class ShapeModel:
+    """All resource shapes of an index, in input order, and the properties they use.
+
+    ``properties`` holds the property records built so far, by node.
+    """
+
+    __slots__ = ("index", "shapes", "properties")
+
+    def __init__(self, index: TripleIndex | CompactIndex, shapes: list[ShapeRecord]):
+        self.index = index
+        self.shapes = shapes
+        self.properties: dict[Term, PropertyRecord] = {}
+
+    @classmethod
+    def from_index(cls, index: TripleIndex | CompactIndex) -> ShapeModel:
+        shapes = [
+            ShapeRecord(node, index.predicate_map(node))
+            for node in index.subjects(RDF_TYPE, OSLC.ResourceShape)
+        ]
+        return cls(index, shapes)
+
+    def property_record(self, node: Term) -> PropertyRecord:
+        record = self.properties.get(node)
+        if record is None:
+            record = self.properties[node] = PropertyRecord(node, self.index.predicate_map(node))
+        return record
+
+    def shape_properties(self, shape: ShapeRecord) -> list[PropertyRecord]:
+        return [self.property_record(node) for node in shape.property_nodes]
+
+    def property_node_count(self) -> int:
+        """Number of distinct nodes linked by the shapes' ``oslc:property``."""
+        return len({node for shape in self.shapes for node in shape.property_nodes})
+
+
+def first(predicates: Mapping[str, Iterable[Term]], predicate: str) -> Term | None:
+    return next(iter(predicates.get(predicate, ())), None)
+
+
+def literal_text(value: Term | None) -> str | None:
+    """Text of a literal or IRI value; ``rdf:XMLLiteral`` content is kept verbatim."""
+    if isinstance(value, Literal):
+        if value.datatype == RDF.XMLLiteral:
+            return value.lexical
+        return value.to_text()
+    if isinstance(value, IRI):
+        return str(value)
+    return None
+
+
+def iri_text(value: Term | None) -> str | None:
+    return str(value) if isinstance(value, IRI) else None
@@ -0,0 +1,366 @@
+"""Tests of the N-Triples reader, the parallel parse, the parse cache and CompactIndex in rdf_index.
+
+Run with ``python -m pytest OSLC4Net_SDK/scripts``; needs pytest and rdflib.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+import rdflib
+
+import rdf_index
+from rdf_index import (
+    RDF_TYPE,
+    BNode,
+    IRI,
+    Literal,
+    ParseCache,
+    TripleIndex,
+    decode_index,
+    encode_index,
+    line_ranges,
+    load_compact_index,
+    load_index,
+)
+
+SDK_DIR = Path(__file__).resolve().parent.parent
+NT_FILES = sorted(
+    [*SDK_DIR.glob("OSLC4Net.Domains.*/Resources/*.nt"), *SDK_DIR.glob("Tests/*/Resources/*.nt")],
+    key=lambda path: path.relative_to(SDK_DIR).as_posix(),
+)
+SHAPES_FILES = [path for path in NT_FILES if path.name.endswith("shapes.nt")]
+
+# Escapes of every kind, and text that looks like the end of a statement, inside one literal
+ESCAPED_LITERAL = r'"quote \" backslash \\ tab \t newline \n e-acute é smile \U0001F600 . # not a comment"'
+
+
+def file_id(path: Path) -> str:
+    return path.relative_to(SDK_DIR).as_posix()
+
+
+def rdflib_triples(path: Path) -> set[tuple]:
+    """The triples of ``path`` as parsed by rdflib, with blank nodes under their labels in the file.
+
+    Literals keep their lexical form as written; rdflib would otherwise canonicalize XML literals.
+    """
+    labels: dict = {}
+    graph = rdflib.Graph()
+    normalize, rdflib.NORMALIZE_LITERALS = rdflib.NORMALIZE_LITERALS, False
+    try:
+        graph.parse(path, format="nt", bnode_context=labels)
+    finally:
+        rdflib.NORMALIZE_LITERALS = normalize
+    blank_labels = {node: label for label, node in labels.items()}
+
+    def term(node) -> tuple:
+        if isinstance(node, rdflib.Literal):
+            return ("literal", str(node), node.datatype and str(node.datatype), node.language)
+        if isinstance(node, rdflib.BNode):
+            return ("blank", blank_labels[node])
+        return ("iri", str(node))
+
+    return {(term(s), term(p), term(o)) for s, p, o in graph}
+
+
+def index_triples(index, scope: str = "0") -> set[tuple]:
+    """The triples of a ``TripleIndex`` or ``CompactIndex`` in the form of ``rdflib_triples``."""
+    prefix = f"_:{scope}."
+
+    def term(node) -> tuple:
+        if isinstance(node, Literal):
+            return ("literal", node.lexical, node.datatype and str(node.datatype), node.language)
+        if isinstance(node, BNode):
+            assert node.startswith(prefix)
+            return ("blank", node[len(prefix) :])
+        assert isinstance(node, IRI)
+        return ("iri", str(node))
+
+    return {(term(s), term(p), term(o)) for s, p, o in index}
+
+
+def write_escaped_file(path: Path, lines_before: int = 50) -> int:
+    """Write an N-Triples file with ``ESCAPED_LITERAL``; returns the offset of the middle of that literal."""
+    head = "".join(
+        f"<http://example.test/s{n}> <http://example.test/p> \"value {n}\" .\n" for n in range(lines_before)
+    )
+    statement = f"<http://example.test/escaped> <http://example.test/p> {ESCAPED_LITERAL}@en .\n"
+    tail = "".join(f"_:b{n} <http://example.test/p> <http://example.test/o{n}> .\n" for n in range(lines_before))
+    path.write_text(head + statement + tail, encoding="utf-8")
+    return len(head.encode()) + len(statement.encode()) // 2
+
+
+@pytest.mark.parametrize("path", NT_FILES, ids=file_id)
+def test_ntriples_reader_matches_rdflib(path: Path) -> None:
+    index = load_index([path])
+
+    assert index_triples(index) == rdflib_triples(path)
+    statements = [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()[:1] not in ("", "#")]
+    assert index.triples_read == len(statements)
+
+
+def test_escaped_literal_matches_rdflib(tmp_path: Path) -> None:
+    path = tmp_path / "escaped.nt"
+    write_escaped_file(path)
+
+    index = load_index([path])
+
+    assert index_triples(index) == rdflib_triples(path)
+    (literal,) = index.objects(IRI("http://example.test/escaped"), "http://example.test/p")
+    assert literal == Literal(
+        'quote " backslash \\ tab \t newline \n e-acute é smile \U0001f600 . # not a comment', None, "en"
+    )
+
+
+def test_line_ranges_end_at_line_breaks(tmp_path: Path) -> None:
+    path = tmp_path / "escaped.nt"
+    middle = write_escaped_file(path)
+    data = path.read_bytes()
+
+    ranges = line_ranges(path, middle)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(data[end - 1 : end] == b"\n" for _, end in ranges)
+    # The first range was due to end inside the escaped literal, so it takes the rest of that line
+    assert data[: ranges[0][1]].endswith(f"{ESCAPED_LITERAL}@en .\n".encode())
+
+
+def test_parallel_parse_splits_chunks_inside_escaped_literal(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "escaped.nt"
+    middle = write_escaped_file(path)
+    monkeypatch.setattr(rdf_index, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(rdf_index, "MIN_CHUNK_BYTES", middle)
+
+    index = load_index([path], jobs=64)
+
+    assert index_triples(index) == rdflib_triples(path)
+    assert index.triples_read == load_index([path]).triples_read
+
+
+@pytest.mark.parametrize("path", SHAPES_FILES, ids=file_id)
+def test_parallel_parse_matches_sequential(path: Path, monkeypatch) -> None:
+    vocab = path.with_name("vocab.nt")
+    paths = [path, vocab] if vocab.exists() else [path]
+    monkeypatch.setattr(rdf_index, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(rdf_index, "MIN_CHUNK_BYTES", 4096)
+
+    sequential = load_index(paths)
+    parallel = load_index(paths, jobs=4)
+
+    assert list(parallel) == list(sequential)
+    assert parallel.triples_read == sequential.triples_read
+
+
+def test_parallel_parse_through_cache_matches_sequential(tmp_path: Path, monkeypatch) -> None:
+    paths = [SDK_DIR / "OSLC4Net.Domains.QualityManagement/Resources/shapes.nt", tmp_path / "escaped.nt"]
+    write_escaped_file(paths[1])
+    monkeypatch.setattr(rdf_index, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(rdf_index, "MIN_CHUNK_BYTES", 4096)
+    cache = ParseCache(tmp_path / "cache")
+    sequential = load_index(paths)
+
+    # Everything is parsed in the workers and stored, then everything comes from the cache
+    for expected_misses, expected_hits in ((2, 0), (2, 2)):
+        parallel = load_index(paths, cache=cache, jobs=4)
+        assert list(parallel) == list(sequential)
+        assert (cache.misses, cache.hits) == (expected_misses, expected_hits)
+
+
+def test_cache_hit_returns_parsed_triples(tmp_path: Path) -> None:
+    path = SDK_DIR / "OSLC4Net.Domains.ConfigurationManagement/Resources/shapes.nt"
+    cache = ParseCache(tmp_path)
+
+    parsed = load_index([path], cache=cache)
+    cached = load_index([path], cache=cache)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert list(cached) == list(parsed)
+    assert cached.triples_read == parsed.triples_read
+
+
+def test_cache_entry_is_invalidated_by_content_change(tmp_path: Path) -> None:
+    path = tmp_path / "escaped.nt"
+    write_escaped_file(path)
+    cache = ParseCache(tmp_path / "cache")
+    load_index([path], cache=cache)
+
+    with open(path, "a", encoding="utf-8") as source:
+        source.write('<http://example.test/added> <http://example.test/p> "added" .\n')
+    index = load_index([path], cache=cache)
+
+    assert (cache.misses, cache.hits) == (2, 0)
+    assert index_triples(index) == rdflib_triples(path)
+
+
+def test_cache_entry_is_invalidated_by_predicate_change(tmp_path: Path) -> None:
+    path = SDK_DIR / "OSLC4Net.Domains.ChangeManagement/Resources/vocab.nt"
+    cache = ParseCache(tmp_path)
+    label = "http://www.w3.org/2000/01/rdf-schema#label"
+    load_index([path], cache=cache)
+
+    filtered = load_index([path], predicates=[label], cache=cache)
+    again = load_index([path], predicates=[label], cache=cache)
+
+    assert (cache.misses, cache.hits) == (2, 1)
+    assert list(filtered) == list(again) == list(load_index([path], predicates=[label]))
+    assert {predicate for _, predicate, _ in filtered} == {label}
+    assert cache.entry(path, "nt", frozenset([label])) != cache.entry(path, "nt", None)
+
+
+def test_corrupt_cache_entry_is_parsed_again(tmp_path: Path) -> None:
+    path = SDK_DIR / "OSLC4Net.Domains.Automation/Resources/vocab.nt"
+    cache = ParseCache(tmp_path)
+    entry = cache.entry(path, "nt", None)
+    entry.write_bytes(b"not an index")
+
+    index = load_index([path], cache=cache)
+
+    assert (cache.misses, cache.hits) == (1, 0)
+    assert list(index) == list(load_index([path]))
+    load_index([path], cache=cache)
+    assert cache.hits == 1
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    paths = [
+        SDK_DIR / "OSLC4Net.Domains.ChangeManagement/Resources/vocab.nt",
+        SDK_DIR / "OSLC4Net.Domains.RequirementsManagement/Resources/vocab.nt",
+        SDK_DIR / "OSLC4Net.Domains.Automation/Resources/vocab.nt",
+    ]
+    sizes = [len(encode_index(load_index([path]), scope="0")) for path in paths]
+    # Room for the two newest entries only, so storing the third evicts the first
+    cache = ParseCache(tmp_path, max_bytes=sizes[1] + sizes[2])
+    entries = [cache.entry(path, "nt", None) for path in paths]
+    for age, path in enumerate(paths[:2]):
+        load_index([path], cache=cache)
+        os.utime(entries[age], (1000 + age, 1000 + age))
+
+    load_index([paths[2]], cache=cache)
+
+    assert [entry.exists() for entry in entries] == [False, True, True]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_triple_index_filters_predicates() -> None:
+    path = SDK_DIR / "Tests/OSLC4Net.CodeGen.Tests/Resources/multiplicity-vocab.nt"
+    label = "http://www.w3.org/2000/01/rdf-schema#label"
+
+    index = load_index([path], predicates=[label])
+
+    expected = {triple for triple in rdflib_triples(path) if triple[1] == ("iri", label)}
+    assert index_triples(index) == expected
+    assert isinstance(index, TripleIndex)
+
+
+@pytest.mark.parametrize("path", NT_FILES, ids=file_id)
+def test_compact_index_matches_rdflib_and_triple_index(path: Path) -> None:
+    compact = load_compact_index([path])
+    index = load_index([path])
+
+    assert index_triples(compact) == rdflib_triples(path)
+    assert list(compact) == list(index)
+    assert (len(compact), compact.triples_read) == (len(index), index.triples_read)
+
+
+@pytest.mark.parametrize("path", SHAPES_FILES, ids=file_id)
+def test_compact_index_lookups_match_triple_index(path: Path) -> None:
+    compact = load_compact_index([path])
+    index = load_index([path])
+
+    for subject in dict.fromkeys(subject for subject, _, _ in index):
+        assert list(compact.predicate_objects(subject)) == list(index.predicate_objects(subject))
+        assert compact.predicate_map(subject) == {
+            predicate: list(objects) for predicate, objects in index.predicate_map(subject).items()
+        }
+        for predicate in index.predicate_map(subject):
+            assert list(compact.objects(subject, predicate)) == list(index.objects(subject, predicate))
+            assert compact.value(subject, predicate) == index.value(subject, predicate)
+
+    # Reverse predicates (rdf:type) keep input order, the others subject order; both equal TripleIndex
+    for predicate, obj in dict.fromkeys((predicate, obj) for _, predicate, obj in index):
+        assert list(compact.subjects(predicate, obj)) == list(index.subjects(predicate, obj))
+
+    for triple in index:
+        assert triple in compact
+
+
+def test_compact_index_lookups_of_absent_terms() -> None:
+    path = SDK_DIR / "OSLC4Net.Domains.ChangeManagement/Resources/shapes.nt"
+    compact = load_compact_index([path])
+    subject, predicate, obj = next(iter(compact))
+    unknown = IRI("http://example.test/unknown")
+    # An object of some triple is a known term, but not a subject
+    object_only = next(obj for _, _, obj in compact if not list(compact.predicate_objects(obj)))
+
+    assert list(compact.objects(unknown, predicate)) == []
+    assert list(compact.objects(subject, unknown)) == []
+    assert list(compact.objects(object_only, predicate)) == []
+    assert compact.value(unknown, predicate) is None
+    assert compact.predicate_map(unknown) == {}
+    assert list(compact.subjects(predicate, unknown)) == []
+    assert list(compact.subjects(unknown, obj)) == []
+    assert (subject, predicate, unknown) not in compact
+    assert (subject, RDF_TYPE, Literal("not a type")) not in compact
+
+
+def test_compact_index_subjects_order(tmp_path: Path) -> None:
+    path = tmp_path / "order.nt"
+    # s1 is seen first, but its value triple comes after the one of s2
+    path.write_text(
+        "<http://example.test/s1> <http://example.test/title> \"first\" .\n"
+        "<http://example.test/s2> <http://example.test/value> <http://example.test/o> .\n"
+        f"<http://example.test/s2> <{RDF_TYPE}> <http://example.test/T> .\n"
+        "<http://example.test/s1> <http://example.test/value> <http://example.test/o> .\n"
+        f"<http://example.test/s1> <{RDF_TYPE}> <http://example.test/T> .\n",
+        encoding="utf-8",
+    )
+    compact = load_compact_index([path])
+    s1, s2 = IRI("http://example.test/s1"), IRI("http://example.test/s2")
+
+    # Subject order on other predicates, input order on reverse predicates, as in TripleIndex
+    assert list(compact.subjects("http://example.test/value", IRI("http://example.test/o"))) == [s1, s2]
+    assert list(compact.subjects(RDF_TYPE, IRI("http://example.test/T"))) == [s2, s1]
+    index = load_index([path])
+    for predicate, obj in [("http://example.test/value", "http://example.test/o"), (RDF_TYPE, "http://example.test/T")]:
+        assert list(compact.subjects(predicate, IRI(obj))) == list(index.subjects(predicate, IRI(obj)))
+
+
+def test_compact_index_drops_duplicates_and_filters_predicates() -> None:
+    vocab = SDK_DIR / "OSLC4Net.Domains.RequirementsManagement/Resources/vocab.nt"
+    shapes = SDK_DIR / "OSLC4Net.Domains.QualityManagement/Resources/shapes.nt"
+    paths = [vocab, shapes, vocab, shapes]
+    predicates = [RDF_TYPE, "http://open-services.net/ns/core#property", "http://purl.org/dc/terms/title"]
+
+    compact = load_compact_index(paths, predicates=predicates)
+    index = load_index(paths, predicates=predicates)
+
+    # IRI triples of the second copies are duplicates; blank nodes are scoped to their file and are not
+    assert list(compact) == list(index)
+    assert len(compact) < sum(len(load_index([path], predicates=predicates)) for path in paths)
+    assert {predicate for _, predicate, _ in compact} <= set(predicates)
+    for predicate, obj in dict.fromkeys((predicate, obj) for _, predicate, obj in index):
+        assert list(compact.subjects(predicate, obj)) == list(index.subjects(predicate, obj))
+
+
+def test_parallel_parse_into_compact_index_matches_sequential(monkeypatch) -> None:
+    paths = [
+        SDK_DIR / "OSLC4Net.Domains.KerML/Resources/shapes.nt",
+        SDK_DIR / "OSLC4Net.Domains.KerML/Resources/vocab.nt",
+    ]
+    monkeypatch.setattr(rdf_index, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(rdf_index, "MIN_CHUNK_BYTES", 64 * 1024)
+
+    assert list(load_compact_index(paths, jobs=4)) == list(load_compact_index(paths))
+
+
+def test_compact_index_survives_encoding() -> None:
+    path = SDK_DIR / "OSLC4Net.Domains.ConfigurationManagement/Resources/shapes.nt"
+    compact = load_compact_index([path])
+
+    decoded = decode_index(encode_index(compact, scope="0"), TripleIndex(), scope="0")
+
+    assert list(decoded) == list(compact)
+    assert decoded.triples_read == compact.triples_read
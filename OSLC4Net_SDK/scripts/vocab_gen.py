@@ -4,13 +4,23 @@
 # dependencies = ["rdflib==7.*"]
 # ///
 
-import rdflib
 import argparse  # Import the argparse library
 import sys       # To exit gracefully on error
-from rdflib import Graph, URIRef, Namespace
-from rdflib.namespace import RDF, OWL
+from codegen_timings import DISABLED, add_timing_arguments, timings_from_args
+from rdf_index import IRI, RDF, RDFS, OWL, VANN, RdfSyntaxError, add_cache_arguments, cache_from_args, load_compact_index
 import re
 
+DEFAULT_NAMESPACE = 'http://purl.org/dc/terms/'
+
+# Only rdf:type is read from the vocabulary file
+VOCAB_PREDICATES = (RDF.type,)
+# In multi-namespace mode we also want the preferred prefix of each ontology
+MULTI_VOCAB_PREDICATES = (RDF.type, VANN.preferredNamespacePrefix)
+
+# The RDF/OWL types that signify a property or a class
+PROPERTY_TYPES = (RDF.Property, OWL.ObjectProperty, OWL.DatatypeProperty)
+CLASS_TYPES = (RDFS.Class, OWL.Class)
+
 def to_pascal_case(input_str: str) -> str:
     """
     Converts a snake_case or camelCase string to PascalCase.
@@ -53,63 +63,16 @@ def to_pascal_case(input_str: str) -> str:
 
     return "".join(pascal_components)
 
-# --- 1. Set up Argument Parser ---
-parser = argparse.ArgumentParser(
-    description="Read a local TTL file and print properties within a specified namespace."
-)
-# Add a positional argument for the filepath (required)
-parser.add_argument(
-    "filepath",
-    type=str,
-    help="Path to the local TTL file (e.g., dcterms.ttl)"
-)
-# Add an optional argument for the namespace
-parser.add_argument(
-    "-ns", "--namespace",
-    type=str,
-    # Set the default namespace value
-    default='http://purl.org/dc/terms/',
-    help="The target namespace URI prefix (default: http://purl.org/dc/terms/)"
-)
-# Parse the command-line arguments provided by the user
-args = parser.parse_args()
-
-# --- 2. Use the arguments ---
-source_location = args.filepath
-target_namespace_str = args.namespace # Use the namespace from args
-# Ensure the namespace ends with a common separator if it doesn't
-# (This helps catch cases where user might forget '#' or '/')
-# Although for the specific task of startswith and slicing, it might not be strictly necessary,
-# it's good practice for consistency if you were doing more complex URI manipulation.
-# Let's keep it simple based on the original request for now.
-
-# We assume the file is in Turtle format, common for .ttl extensions
-# source_format = 'turtle'
-
-# Create an RDF graph
-g = Graph()
-
-print(f"Attempting to load RDF data from local file: {source_location}")
-print(f"Filtering for properties in namespace: {target_namespace_str}")
-
-try:
-    # --- 3. Parse the RDF data from the specified local file ---
-   #  g.parse(source=source_location, format=source_format)
-    g.parse(source=source_location)
-    print(f"Successfully parsed data. Found {len(g)} triples.")
-
-    # Define the RDF/OWL types that signify a property
-    property_types = [RDF.Property, OWL.ObjectProperty, OWL.DatatypeProperty]
-
+def find_properties(g, target_namespace_str):
+    """Returns the sorted local names of the properties declared in the target namespace."""
     # Use a set to store unique property local names to avoid duplicates
     found_properties = set()
 
-    # --- 4. Find properties using RDF.type ---
     # Iterate through each property type and find subjects of that type
-    for prop_type in property_types:
+    for prop_type in PROPERTY_TYPES:
         for subject_uri in g.subjects(predicate=RDF.type, object=prop_type):
             # Ensure we are dealing with a URIRef
-            if isinstance(subject_uri, URIRef):
+            if isinstance(subject_uri, IRI):
                 subject_str = str(subject_uri)
                 # Check if the URI starts with the TARGET namespace from args
                 if subject_str.startswith(target_namespace_str):
@@ -118,46 +81,381 @@ try:
                     # Add the local name to our set
                     found_properties.add(local_name)
 
-    # --- 5. Print the results ---
-    print(f"\nProperties found in namespace '{target_namespace_str}':")
-    if found_properties:
-        # Sort the list for predictable output
-        sorted_properties = sorted(list(found_properties))
-        print("""
+    # Sort the list for predictable output
+    return sorted(found_properties)
+
+
+def render_properties(sorted_properties):
+    """
+    Renders the nested P (URI constants) and Q (QName) classes for the given local names,
+    followed by the QName lookup tables.
+    """
+    lines = ["""
         public static class P
         {
-        """)
-        for prop_name in sorted_properties:
-            print(f"    public const string {to_pascal_case(prop_name)} = NS + \"{prop_name}\";")
+        """]
+    for prop_name in sorted_properties:
+        lines.append(f"    public const string {to_pascal_case(prop_name)} = NS + \"{prop_name}\";")
 
-        print("""
+    lines.append("""
         }
         """)
 
-        print("""
+    lines.append("""
         public static class Q
         {
         """)
-        for prop_name in sorted_properties:
-            print(f"    public static QName {to_pascal_case(prop_name)} => QNameFor(\"{prop_name}\");")
+    for prop_name in sorted_properties:
+        lines.append(f"    public static readonly QName {to_pascal_case(prop_name)} = QNameFor(\"{prop_name}\");")
 
-        print("""
+    lines.append("""
 
         }
         """)
+    lines.append(render_lookup_tables(
+        [(prop_name, f"Q.{to_pascal_case(prop_name)}") for prop_name in sorted_properties],
+        indent="    ",
+    ))
+    return "\n".join(lines) + "\n"
+
+
+FROZEN = "global::System.Collections.Frozen"
+
+
+def render_lookup_tables(terms, indent):
+    """
+    Renders the QNamesByUri and QNamesByLocalName tables for (local name, QName expression) pairs.
+
+    Both are FrozenDictionary instances built once when the class is initialized and
+    share the same QName instances, so resolving a URI or local name at runtime is a
+    single allocation-free lookup. Type names are fully qualified so the output does
+    not need extra usings.
+    """
+    lines = [
+        f"{indent}public static readonly {FROZEN}.FrozenDictionary<string, QName> QNamesByUri =",
+        f"{indent}    {FROZEN}.FrozenDictionary.ToFrozenDictionary(",
+        f"{indent}        new Dictionary<string, QName>(StringComparer.Ordinal)",
+        f"{indent}        {{",
+    ]
+    for local_name, qname in terms:
+        lines.append(f"{indent}            [NS + \"{local_name}\"] = {qname},")
+    lines.extend([
+        f"{indent}        }},",
+        f"{indent}        StringComparer.Ordinal);",
+        "",
+        f"{indent}public static readonly {FROZEN}.FrozenDictionary<string, QName> QNamesByLocalName =",
+        f"{indent}    {FROZEN}.FrozenDictionary.ToFrozenDictionary(",
+        f"{indent}        QNamesByUri.Values,",
+        f"{indent}        static qname => qname.LocalPart,",
+        f"{indent}        StringComparer.Ordinal);",
+    ])
+    return "\n".join(lines)
+
+
+class NamespaceIndex:
+    """
+    Finds the longest known namespace a URI starts with.
+
+    Namespaces are bucketed by length, so a lookup is one slice and one set
+    probe per distinct namespace length (longest first), instead of a
+    startswith() call per namespace.
+    """
+
+    def __init__(self, namespaces=()):
+        self._by_length = {}
+        self._lengths = []
+        for namespace in namespaces:
+            self.add(namespace)
+
+    def add(self, namespace):
+        bucket = self._by_length.get(len(namespace))
+        if bucket is None:
+            bucket = self._by_length[len(namespace)] = set()
+            self._lengths = sorted(self._by_length, reverse=True)
+        bucket.add(namespace)
+
+    def match(self, uri):
+        """Returns the longest namespace that is a proper prefix of uri, or None."""
+        for length in self._lengths:
+            if length < len(uri) and uri[:length] in self._by_length[length]:
+                return uri[:length]
+        return None
+
+    def __contains__(self, namespace):
+        return namespace in self._by_length.get(len(namespace), ())
+
+    def __iter__(self):
+        for length in self._lengths:
+            yield from self._by_length[length]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._by_length.values())
+
+
+class VocabularyTerms:
+    """The classes and properties found for one namespace."""
+
+    __slots__ = ("namespace", "prefix", "classes", "properties")
+
+    def __init__(self, namespace, prefix):
+        self.namespace = namespace
+        self.prefix = prefix
+        self.classes = set()
+        self.properties = set()
+
+
+def split_namespace(uri):
+    """Splits a URI after its last '#' or '/' (http://example.com/ns#Term -> http://example.com/ns#)."""
+    return uri[:max(uri.rfind('#'), uri.rfind('/')) + 1]
+
+
+def find_terms(g, namespaces=(), discover=True):
+    """
+    Groups the classes and properties of g by namespace in one pass over the typed subjects.
+
+    Each subject is assigned to the longest matching namespace among the given
+    ones and the owl:Ontology subjects of g. With discover=True, subjects that
+    match none of them start a new namespace (the URI up to its last '#' or '/');
+    otherwise they are skipped. Returns the VocabularyTerms by namespace, sorted
+    by namespace.
+    """
+    index = NamespaceIndex(namespaces)
+    if discover:
+        for ontology in g.subjects(RDF.type, OWL.Ontology):
+            if isinstance(ontology, IRI):
+                index.add(str(ontology))
+
+    vocabularies = {}
+    for kinds, types in (("classes", CLASS_TYPES), ("properties", PROPERTY_TYPES)):
+        for term_type in types:
+            for subject in g.subjects(RDF.type, term_type):
+                if not isinstance(subject, IRI):
+                    continue
+                namespace = index.match(subject)
+                if namespace is None:
+                    if not discover:
+                        continue
+                    namespace = split_namespace(subject)
+                    if not namespace or namespace == subject:
+                        continue
+                    index.add(namespace)
+                vocabulary = vocabularies.get(namespace)
+                if vocabulary is None:
+                    vocabulary = vocabularies[namespace] = VocabularyTerms(namespace, preferred_prefix(g, namespace))
+                getattr(vocabulary, kinds).add(subject[len(namespace):])
+
+    return dict(sorted(vocabularies.items()))
+
+
+def preferred_prefix(g, namespace):
+    """vann:preferredNamespacePrefix of the namespace, else its last path segment in lower case."""
+    prefix = g.value(IRI(namespace), VANN.preferredNamespacePrefix)
+    if prefix is not None:
+        return str(prefix)
+    segment = namespace.rstrip('#/').rsplit('/', 1)[-1]
+    return re.sub(r'\W', '_', segment).lower() or "ns"
+
+
+def vocabulary_class_name(prefix):
+    """C# class name for a prefix, following the existing constants (oslc_rm -> RM, dcterms -> DCTERMS)."""
+    name = re.sub(r'\W', '_', prefix.removeprefix("oslc_")).upper()
+    return name if name[:1].isalpha() else "NS_" + name
+
+
+def render_vocabulary(vocabulary):
+    """Renders a constants class (NS, Prefix, class constants, QNameFor, P, Q and lookup tables) for one namespace."""
+    lines = [
+        f"        public static class {vocabulary_class_name(vocabulary.prefix)}",
+        "        {",
+        f"            public const string NS = \"{vocabulary.namespace}\";",
+        f"            public const string Prefix = \"{vocabulary.prefix}\";",
+        "",
+    ]
+    if vocabulary.classes:
+        for class_name in sorted(vocabulary.classes):
+            lines.append(f"            public const string {to_pascal_case(class_name)} = NS + \"{class_name}\";")
+        lines.append("")
+
+    lines.append("""            public static QName QNameFor(string localResource)
+            {
+                return new QName(NS, localResource, Prefix);
+            }""")
+
+    if vocabulary.properties:
+        sorted_properties = sorted(vocabulary.properties)
+        lines.append("")
+        lines.append("            public static class P")
+        lines.append("            {")
+        for prop_name in sorted_properties:
+            lines.append(f"                public const string {to_pascal_case(prop_name)} = NS + \"{prop_name}\";")
+        lines.append("            }")
+        lines.append("")
+        lines.append("            public static class Q")
+        lines.append("            {")
+        for prop_name in sorted_properties:
+            lines.append(f"                public static readonly QName {to_pascal_case(prop_name)} = QNameFor(\"{prop_name}\");")
+        lines.append("            }")
+
+    # Classes have no Q member, so their QName is built once inside the table
+    terms = [(class_name, f"QNameFor(\"{class_name}\")") for class_name in sorted(vocabulary.classes)]
+    terms.extend((prop_name, f"Q.{to_pascal_case(prop_name)}") for prop_name in sorted(vocabulary.properties))
+    if terms:
+        lines.append("")
+        lines.append(render_lookup_tables(terms, indent="            "))
+
+    lines.append("        }")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    # --- 1. Set up Argument Parser ---
+    parser = argparse.ArgumentParser(
+        description="Read a local TTL file and print properties within a specified namespace."
+    )
+    # Add a positional argument for the filepath (required)
+    parser.add_argument(
+        "filepath",
+        type=str,
+        help="Path to the local TTL file (e.g., dcterms.ttl)"
+    )
+    # Add an optional argument for the namespace
+    parser.add_argument(
+        "-ns", "--namespace",
+        type=str,
+        action="append",
+        help="The target namespace URI prefix (default: http://purl.org/dc/terms/). "
+             "Repeat it to emit a constants class per namespace from a single scan."
+    )
+    parser.add_argument(
+        "--all-namespaces",
+        action="store_true",
+        help="Emit a constants class (classes, P and Q) for every namespace in the file from a single scan. "
+             "Terms are assigned to the longest matching --namespace or owl:Ontology URI, "
+             "otherwise to the URI up to its last '#' or '/'."
+    )
+    add_cache_arguments(parser)
+    add_timing_arguments(parser)
+    # Parse the command-line arguments provided by the user
+    args = parser.parse_args()
+
+    with timings_from_args(args, "vocab_gen") as timings:
+        generate(args, timings)
+
+
+def generate(args, timings=DISABLED):
+    # --- 2. Use the arguments ---
+    namespaces = args.namespace or [DEFAULT_NAMESPACE]
+    if args.all_namespaces or len(namespaces) > 1:
+        generate_namespaces(args, timings)
+        return
+
+    source_location = args.filepath
+    target_namespace_str = namespaces[0] # Use the namespace from args
+
+    print(f"Attempting to load RDF data from local file: {source_location}")
+    print(f"Filtering for properties in namespace: {target_namespace_str}")
+
+    try:
+        # --- 3. Parse the RDF data from the specified local file ---
+        # Only rdf:type is needed; rdflib guesses the format of non-N-Triples files
+        cache = cache_from_args(args)
+        with timings.phase("parse"):
+            g = load_compact_index(
+                [source_location],
+                predicates=VOCAB_PREDICATES,
+                default_format=None,
+                cache=cache,
+                jobs=args.parse_jobs,
+            )
+        print(f"Successfully parsed data. Found {g.triples_read} triples.")
+        timings.count("triples", g.triples_read)
+        timings.count("indexed_triples", len(g))
+        if cache is not None:
+            timings.cache("parse", cache.hits, cache.misses)
+
+        # --- 4. Find properties using RDF.type ---
+        with timings.phase("extract"):
+            sorted_properties = find_properties(g, target_namespace_str)
+        timings.count("properties", len(sorted_properties))
+
+        # --- 5. Print the results ---
+        print(f"\nProperties found in namespace '{target_namespace_str}':")
+        if sorted_properties:
+            with timings.phase("render"):
+                rendered = render_properties(sorted_properties)
+            with timings.phase("write"):
+                print(rendered, end="")
+        else:
+            print("No properties found matching the criteria in the loaded data.")
+
+    # --- 6. Handle potential errors ---
+    except FileNotFoundError:
+        print(f"Error: Local file '{source_location}' not found.", file=sys.stderr)
+        print("Please ensure the file path is correct.", file=sys.stderr)
+        sys.exit(1) # Exit with a non-zero status code indicates an error
+    except RdfSyntaxError as pe:
+        print(f"Error parsing RDF data from '{source_location}': {pe}", file=sys.stderr)
+        print("Ensure the file is a valid RDF file.", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        # Catch other potential errors
+        print(f"An unexpected error occurred while processing '{source_location}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def generate_namespaces(args, timings=DISABLED):
+    """Multi-namespace mode: one parse, one pass over the typed subjects, one class per namespace."""
+    source_location = args.filepath
+
+    print(f"Attempting to load RDF data from local file: {source_location}")
+    if args.all_namespaces:
+        print("Collecting classes and properties in all namespaces")
     else:
-        print("No properties found matching the criteria in the loaded data.")
-
-# --- 6. Handle potential errors ---
-except FileNotFoundError:
-    print(f"Error: Local file '{source_location}' not found.", file=sys.stderr)
-    print("Please ensure the file path is correct.", file=sys.stderr)
-    sys.exit(1) # Exit with a non-zero status code indicates an error
-except rdflib.exceptions.ParserError as pe:
-    print(f"Error parsing RDF data from '{source_location}': {pe}", file=sys.stderr)
-    print(f"Ensure the file is a valid '{source_format}' file.", file=sys.stderr)
-    sys.exit(1)
-except Exception as e:
-    # Catch other potential errors
-    print(f"An unexpected error occurred while processing '{source_location}': {e}", file=sys.stderr)
-    sys.exit(1)
+        print(f"Collecting classes and properties in namespaces: {', '.join(args.namespace)}")
+
+    try:
+        cache = cache_from_args(args)
+        with timings.phase("parse"):
+            g = load_compact_index(
+                [source_location],
+                predicates=MULTI_VOCAB_PREDICATES,
+                default_format=None,
+                cache=cache,
+                jobs=args.parse_jobs,
+            )
+        print(f"Successfully parsed data. Found {g.triples_read} triples.")
+        timings.count("triples", g.triples_read)
+        timings.count("indexed_triples", len(g))
+        if cache is not None:
+            timings.cache("parse", cache.hits, cache.misses)
+
+        with timings.phase("extract"):
+            vocabularies = find_terms(g, args.namespace or (), discover=args.all_namespaces)
+        timings.count("namespaces", len(vocabularies))
+        timings.count("classes", sum(len(v.classes) for v in vocabularies.values()))
+        timings.count("properties", sum(len(v.properties) for v in vocabularies.values()))
+
+        if vocabularies:
+            with timings.phase("render"):
+                rendered = "\n".join(render_vocabulary(v) for v in vocabularies.values())
+            with timings.phase("write"):
+                print(f"\nFound {len(vocabularies)} namespace(s):\n")
+                print(rendered, end="")
+        else:
+            print("No classes or properties found matching the criteria in the loaded data.")
+
+    except FileNotFoundError:
+        print(f"Error: Local file '{source_location}' not found.", file=sys.stderr)
+        print("Please ensure the file path is correct.", file=sys.stderr)
+        sys.exit(1)
+    except RdfSyntaxError as pe:
+        print(f"Error parsing RDF data from '{source_location}': {pe}", file=sys.stderr)
+        print("Ensure the file is a valid RDF file.", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"An unexpected error occurred while processing '{source_location}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()